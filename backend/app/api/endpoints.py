@@ -1,213 +1,453 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Request, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
+import asyncio
+import contextlib
+import hashlib
 import json
 import os
-from datetime import datetime
+from datetime import date, datetime
 from app.api import settings
-from app.services.ai_service import AIService
-import shutil
-from pypdf import PdfReader
+from app.services.ai_service import ENRICHMENT_MODES, ai_service
+from app.services.ai_health import ai_health
+from app.services.analysis_queue import DEFAULT_PROVINCE, DEFAULT_TITLE, analysis_queue, analysis_workers
+from app.services.news_repository import news_repository
+from app.services.news_query import NewsFilter, decode_cursor, encode_cursor, project, split_csv
+from app.services.related_index import related_index
+from app.services.news_search import search_news
+from app.services.news_export import EXPORT_FORMATS, chunked, csv_rows, gzipped, ndjson_rows
+from app.services.news_aggregates import news_aggregates
+from app.services.news_stream import news_stream
+from app.services.analysis_cache import analysis_cache
+from app.services.knowledge_ingest import knowledge_ingest
+from app.services.knowledge_store import knowledge_store
+from app.services.knowledge_index import estimate_tokens
+from app.services.llm_usage import llm_usage
+from app.services.provider_chain import provider_chain
+from app.services import prompts
+from app.services.weather_cache import weather_cache
+from app.services.weather_service import weather_service
+from app.core.config import (
+    BATCH_MAX_ITEMS, BATCH_ANALYSIS_CONCURRENCY, ENRICHMENT_MODE, INGEST_MODE, STREAM_HEARTBEAT_SECONDS,
+    WEATHER_PREFETCH_MAX_DAYS,
+)
 
 router = APIRouter()
 router.include_router(settings.router, prefix="/settings", tags=["settings"])
 
-ai_service = AIService()
-
-# Load dummy data
-DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "data", "dummy_dataset.json")
-KNOWLEDGE_BASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "data", "knowledge_base.txt")
-
-def get_dummy_data():
-    try:
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-
-def save_dummy_data(data):
-    with open(DATA_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
 class NewsUpload(BaseModel):
     title: Optional[str] = None
     content: str
     province: Optional[str] = None
     source_url: Optional[str] = None
+    bypass_cache: bool = False  # force a fresh AI analysis even if an identical article was analyzed before
+    enrichment: Optional[str] = None  # serial | speculative | background (default: ENRICHMENT_MODE)
+    ingest: Optional[str] = None  # sync | queued (default: INGEST_MODE)
+
+class WeatherPrefetch(BaseModel):
+    start_date: str  # YYYY-MM-DD
+    end_date: str
+    locations: Optional[List[str]] = None  # default: every known location
+
+class NewsBatchUpload(BaseModel):
+    items: List[NewsUpload]
+    concurrency: Optional[int] = None  # capped at BATCH_ANALYSIS_CONCURRENCY
+    bypass_cache: bool = False
+    enrichment: Optional[str] = None  # applies to every item
+
+INGEST_MODES = ("sync", "queued")
+
+# Keeps fire-and-forget tasks referenced until they finish
+_background_tasks = set()
+
+def build_news_record(news: NewsUpload, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Record for a new article; title/province fall back to what the analysis detected"""
+    return {
+        "title": news.title if news.title else analysis.get("generated_title", DEFAULT_TITLE),
+        "content": news.content,
+        "province": news.province if news.province else analysis.get("detected_province", DEFAULT_PROVINCE),
+        "island": "Unknown",
+        "published_at": datetime.now().isoformat(),
+        "analysis": analysis
+    }
+
+def resolve_enrichment(mode: Optional[str]) -> str:
+    mode = mode or ENRICHMENT_MODE
+    if mode not in ENRICHMENT_MODES:
+        raise HTTPException(status_code=400, detail=f"enrichment must be one of: {', '.join(ENRICHMENT_MODES)}")
+    return mode
+
+def resolve_ingest(mode: Optional[str]) -> str:
+    mode = mode or INGEST_MODE
+    if mode not in INGEST_MODES:
+        raise HTTPException(status_code=400, detail=f"ingest must be one of: {', '.join(INGEST_MODES)}")
+    return mode
 
-@router.post("/knowledge/upload")
+def schedule_enrichment(record: Dict[str, Any]):
+    """Background enrichment: look the weather up after the response and patch the stored record"""
+    async def enrich():
+        try:
+            enriched = await ai_service.enrich_analysis(record["content"], record["analysis"])
+            if enriched is None:
+                return
+            current = news_repository.get(record["id"])
+            if current is not None:
+                await run_in_threadpool(news_repository.update, {**current, "analysis": enriched})
+        except Exception as e:
+            print(f"Background enrichment failed for news {record['id']}: {e}")
+
+    task = asyncio.create_task(enrich())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+@router.post("/knowledge/upload", status_code=202)
 async def upload_knowledge_base(file: UploadFile = File(...)):
-    """Upload a PDF file to be used as knowledge base for AI analysis"""
+    """
+    Upload a PDF file to be used as knowledge base for AI analysis.
+
+    Text extraction runs in the background; poll GET /knowledge/jobs/{job_id}.
+    """
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    
+
+    temp_path = knowledge_ingest.temp_upload_path()
     try:
-        # Save uploaded file temporarily
-        temp_path = f"temp_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Extract text from PDF
-        reader = PdfReader(temp_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-            
-        # Save extracted text to knowledge base file
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(KNOWLEDGE_BASE_PATH), exist_ok=True)
-        
-        with open(KNOWLEDGE_BASE_PATH, "w", encoding="utf-8") as f:
-            f.write(text)
-            
-        # Clean up temp file
+        # Stream the upload to disk in chunks, off the event loop, hashing it on the way
+        def save_upload() -> str:
+            digest = hashlib.sha256()
+            with open(temp_path, "wb") as buffer:
+                while chunk := file.file.read(1024 * 1024):
+                    digest.update(chunk)
+                    buffer.write(chunk)
+            return digest.hexdigest()
+        doc_id = await run_in_threadpool(save_upload)
+    except Exception as e:
+        # The temp file may not exist if saving failed before it was created
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise HTTPException(status_code=500, detail=f"Failed to save PDF: {str(e)}")
+
+    document = await run_in_threadpool(knowledge_store.get, doc_id)
+    if document is not None:
+        # Same file uploaded before: nothing to extract or index
         os.remove(temp_path)
-        
         return {
-            "status": "success", 
-            "message": "Knowledge base updated successfully",
-            "chars_extracted": len(text),
-            "filename": file.filename
+            "status": "done",
+            "message": "Document is already in the knowledge base",
+            "duplicate": True,
+            "document_id": doc_id,
+            "filename": document["filename"],
+            "chars_extracted": document["chars"]
         }
-        
-    except Exception as e:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
+
+    job = knowledge_ingest.submit(temp_path, file.filename, doc_id)
+    return {
+        "message": "Knowledge base upload is being processed",
+        "duplicate": False,
+        **job
+    }
+
+@router.get("/knowledge/jobs/{job_id}")
+def get_knowledge_job(job_id: str):
+    """Progress of a knowledge base upload (queued/extracting/indexing/done/failed)"""
+    job = knowledge_ingest.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @router.get("/knowledge/status")
 def get_knowledge_status():
     """Check if knowledge base exists and get its size"""
-    if os.path.exists(KNOWLEDGE_BASE_PATH):
-        size_bytes = os.path.getsize(KNOWLEDGE_BASE_PATH)
-        # Read first few chars to verify content
-        with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
-            content = f.read(100)
-            
-        return {
-            "exists": True,
-            "size_bytes": size_bytes,
-            "preview": content + "..."
-        }
-    else:
-        return {
-            "exists": False,
-            "size_bytes": 0,
-            "preview": ""
-        }
+    stats = knowledge_store.stats()
+    documents = knowledge_store.documents()
+    preview = ""
+    if documents:
+        # Read first few chars to verify content (the document may just have been removed by another process)
+        try:
+            with open(knowledge_store.text_path(documents[0]["id"]), "r", encoding="utf-8") as f:
+                preview = f.read(100) + "..."
+        except FileNotFoundError:
+            pass
+    return {
+        "exists": stats["documents"] > 0,
+        "preview": preview,
+        **stats
+    }
+
+@router.get("/knowledge/documents")
+def list_knowledge_documents():
+    """Documents in the knowledge base, oldest first"""
+    return {
+        "documents": [
+            {key: value for key, value in document.items() if key != "page_offsets"}
+            for document in knowledge_store.documents()
+        ]
+    }
+
+@router.delete("/knowledge/documents/{document_id}")
+def delete_knowledge_document(document_id: str):
+    """Remove one document from the knowledge base (and from the retrieval index)"""
+    if not knowledge_store.remove(document_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+    return {"message": "Document deleted successfully"}
 
 @router.post("/news")
-async def upload_news(news: NewsUpload):
+async def upload_news(news: NewsUpload, response: Response):
+    """
+    Analyze and store an article. With `ingest=queued` the article is stored
+    right away with status "pending" and analyzed on the job queue (202);
+    poll GET /news/{id} until its status is "analyzed".
+    """
+    enrichment = resolve_enrichment(news.enrichment)
+    if resolve_ingest(news.ingest) == "queued":
+        record = {**build_news_record(news, {}), "status": "pending"}
+        record = await run_in_threadpool(news_repository.insert, record)
+        job = await run_in_threadpool(analysis_queue.enqueue, record["id"], {
+            "title": news.title,
+            "province": news.province,
+            "bypass_cache": news.bypass_cache,
+            "enrichment": enrichment,
+        })
+        analysis_workers.wake()
+        response.status_code = 202
+        return {"status": "pending", "id": record["id"], "job_id": job["id"]}
+
     # 1. Process with AI
-    analysis = await ai_service.analyze_news(news.content)
+    analysis = await ai_service.analyze_news(news.content, bypass_cache=news.bypass_cache, enrichment=enrichment)
+    
+    # 2-3. Auto-populate missing fields and create the new record
+    new_record = build_news_record(news, analysis)
     
-    # 2. Auto-populate fields if missing
-    final_title = news.title if news.title else analysis.get("generated_title", "Berita Tanpa Judul")
-    final_province = news.province if news.province else analysis.get("detected_province", "Indonesia")
+    # 4. Save (the repository assigns the id and serializes concurrent writers)
+    new_record = await run_in_threadpool(news_repository.insert, new_record)
 
-    # 3. Create new record
-    data = get_dummy_data()
-    new_id = max([item["id"] for item in data]) + 1 if data else 1
+    # 5. Weather enrichment after the response, if requested
+    if enrichment == "background":
+        schedule_enrichment(new_record)
     
-    new_record = {
-        "id": new_id,
-        "title": final_title,
-        "content": news.content,
-        "province": final_province,
-        "island": "Unknown",
-        "published_at": datetime.now().isoformat(),
-        "analysis": analysis
-    }
+    return {"status": "success", "id": new_record["id"], "analysis": analysis}
+
+@router.post("/news/batch")
+async def upload_news_batch(batch: NewsBatchUpload):
+    """
+    Analyze many articles concurrently and store them in one write.
+    Streams NDJSON: one "analyzed"/"error" line per article as it finishes,
+    then one "stored" line per saved record and a final "done" summary.
+    """
+    if not batch.items:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(batch.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items)")
+    
+    concurrency = min(batch.concurrency or BATCH_ANALYSIS_CONCURRENCY, BATCH_ANALYSIS_CONCURRENCY)
+    enrichment = resolve_enrichment(batch.enrichment)
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def run_batch():
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        analyses: List[Optional[Dict[str, Any]]] = [None] * len(batch.items)
+        
+        async def analyze(index: int, news: NewsUpload):
+            async with semaphore:
+                try:
+                    analyses[index] = await ai_service.analyze_news(
+                        news.content, bypass_cache=batch.bypass_cache or news.bypass_cache, enrichment=enrichment
+                    )
+                    await events.put({"event": "analyzed", "index": index})
+                except Exception as e:
+                    print(f"Batch analysis error (item {index}): {e}")
+                    await events.put({"event": "error", "index": index, "detail": str(e)})
+        
+        try:
+            await asyncio.gather(*(analyze(i, news) for i, news in enumerate(batch.items)))
+            
+            # One storage write for the whole batch, in request order
+            ready = [(i, build_news_record(batch.items[i], a)) for i, a in enumerate(analyses) if a is not None]
+            stored = await run_in_threadpool(news_repository.insert_many, [record for _, record in ready])
+            for (index, _), record in zip(ready, stored):
+                if enrichment == "background":
+                    schedule_enrichment(record)
+                await events.put({"event": "stored", "index": index, "id": record["id"],
+                                  "title": record["title"], "analysis": record["analysis"]})
+            await events.put({"event": "done", "submitted": len(batch.items), "stored": len(stored),
+                              "failed": len(batch.items) - len(stored)})
+        except Exception as e:
+            print(f"Batch ingestion failed: {e}")
+            await events.put({"event": "done", "submitted": len(batch.items), "stored": 0,
+                              "failed": len(batch.items), "detail": str(e)})
+    
+    # The batch keeps running (and gets stored) even if the client disconnects mid-stream
+    task = asyncio.create_task(run_batch())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
     
-    # 4. Save
-    data.insert(0, new_record)
-    save_dummy_data(data)
+    async def stream():
+        while True:
+            event = await events.get()
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+            if event["event"] == "done":
+                break
     
-    return {"status": "success", "id": new_id, "analysis": analysis}
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 @router.delete("/news/{news_id}")
 def delete_news(news_id: int):
     """Delete a news item by ID"""
-    data = get_dummy_data()
-    
-    # Find and remove the news item
-    original_length = len(data)
-    filtered_data = [item for item in data if item["id"] != news_id]
-    
-    if len(filtered_data) == original_length:
+    if not news_repository.delete(news_id):
         raise HTTPException(status_code=404, detail="News not found")
     
-    # Save the updated data
-    save_dummy_data(filtered_data)
-    
     return {"message": "News deleted successfully", "id": news_id}
 
 @router.get("/dashboard/stats")
 def get_dashboard_stats():
-    data = get_dummy_data()
-    total_news = len(data)
-    topics = {}
-    risk_alerts = 0
-    
-    for item in data:
-        for topic in item["analysis"]["topics"]:
-            topics[topic] = topics.get(topic, 0) + 1
-        if "Negatif" in item["analysis"].get("impact", ""):
-            risk_alerts += 1
-    
-    top_topics = [{"name": k, "count": v} for k, v in topics.items()]
-    top_topics.sort(key=lambda x: x["count"], reverse=True)
-    
-    return {
-        "total_news": total_news,
-        "top_topics": top_topics[:5],
-        "risk_alerts": risk_alerts
-    }
+    news_repository.refresh()
+    return news_aggregates.dashboard_stats()
+
+@router.get("/stream")
+async def stream_news(request: Request):
+    """
+    Server-sent events for dashboards: "news.created" / "news.updated" /
+    "news.deleted" as records are written, each with the change to the
+    dashboard aggregates (`delta`), and "resync" when the client should
+    reload from the REST endpoints. Reconnects resume from Last-Event-ID.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    client = news_stream.subscribe(int(last_event_id) if last_event_id.isdigit() else None)
+    if client is None:
+        raise HTTPException(status_code=503, detail="Too many stream clients")
+
+    async def events():
+        try:
+            yield client.ready_frame
+            while True:
+                try:
+                    yield await asyncio.wait_for(client.next_frame(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"  # keeps proxies from closing an idle connection
+        finally:
+            news_stream.unsubscribe(client)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/stream/stats")
+def get_stream_stats():
+    """Connected stream clients, events published and resyncs forced by slow clients"""
+    return news_stream.stats()
 
-@router.get("/news")
+@router.get("/news", response_class=ORJSONResponse)
 def get_news(
     limit: int = 100,
+    offset: int = 0,
     start_date: str = None,
     end_date: str = None,
     provinces: str = None,
     topics: str = None,
     min_sentiment: int = None,
     max_sentiment: int = None,
-    virality: str = None
+    virality: str = None,
+    q: str = None,
+    cursor: str = None,
+    fields: str = None
 ):
-    data = get_dummy_data()
-    filtered = data
-    
-    # Apply filters
-    if start_date:
-        filtered = [item for item in filtered if item["published_at"] >= start_date]
-    
-    if end_date:
-        filtered = [item for item in filtered if item["published_at"] <= end_date]
-    
-    if provinces:
-        province_list = [p.strip() for p in provinces.split(",")]
-        filtered = [item for item in filtered if item.get("province") in province_list]
-    
-    if topics:
-        topic_list = [t.strip() for t in topics.split(",")]
-        filtered = [item for item in filtered if any(t in item["analysis"].get("topics", []) for t in topic_list)]
-    
-    if min_sentiment is not None:
-        filtered = [item for item in filtered if item["analysis"].get("sentiment_score", 50) >= min_sentiment]
-    
-    if max_sentiment is not None:
-        filtered = [item for item in filtered if item["analysis"].get("sentiment_score", 50) <= max_sentiment]
-    
-    if virality:
-        filtered = [item for item in filtered if item["analysis"].get("virality_score", "").lower() == virality.lower()]
-    
-    return {"data": filtered[:limit], "total": len(data), "filtered": len(filtered)}
+    """
+    List news, newest first. With `q`, full-text search over title, content
+    and summary instead, best match first ("quoted phrases" must match exactly).
+
+    Pagination is by `offset`, or by `cursor` for stable pages ordered by
+    (published_at, id) descending: pass `cursor=` (empty) for the first page,
+    then the returned `next_cursor` until it is null. `fields` keeps only the
+    listed keys of each record; nested keys are dotted, e.g.
+    `fields=id,title,province,analysis.topics,analysis.sentiment_score`.
+    """
+    filters = NewsFilter(
+        start_date=start_date,
+        end_date=end_date,
+        provinces=split_csv(provinces),
+        topics=split_csv(topics),
+        min_sentiment=min_sentiment,
+        max_sentiment=max_sentiment,
+        virality=virality,
+    )
+    limit = max(limit, 0)
+    next_cursor = None
+    if cursor is not None:
+        if q and q.strip():
+            raise HTTPException(status_code=400, detail="cursor pagination is not supported with q")
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page, filtered, next_key = news_repository.query_page(filters, limit=limit, after=after)
+        next_cursor = encode_cursor(next_key) if next_key else None
+    elif q and q.strip():
+        page, filtered = search_news(q, filters, limit=limit, offset=max(offset, 0))
+    else:
+        page, filtered = news_repository.query(filters, limit=limit, offset=max(offset, 0))
+
+    field_list = split_csv(fields)
+    if field_list:
+        page = [project(record, field_list) for record in page]
+    body = {"data": page, "total": news_repository.count(), "filtered": filtered}
+    if cursor is not None:
+        body["next_cursor"] = next_cursor
+    # Records are plain JSON already; skip jsonable_encoder and serialize with orjson
+    return ORJSONResponse(body)
+
+@router.get("/news/queue")
+def get_analysis_queue_stats():
+    """
+    Queued ingestion: jobs waiting (`depth`), running, waiting for a retry
+    and failed, `lag_seconds` (age of the oldest unfinished job) and the
+    latest failures
+    """
+    return {"workers": analysis_workers.workers, **analysis_queue.stats()}
+
+@router.get("/news/export")
+def export_news(
+    request: Request,
+    format: str = "ndjson",
+    start_date: str = None,
+    end_date: str = None,
+    provinces: str = None,
+    topics: str = None,
+    min_sentiment: int = None,
+    max_sentiment: int = None,
+    virality: str = None,
+    fields: str = None
+):
+    """
+    Stream every record matching the `get_news` filters as NDJSON or CSV,
+    ordered by (published_at, id) descending. Records are read from the
+    repository in batches and written as they are encoded, so memory use does
+    not grow with the archive. Gzip-compressed if the client sends
+    `Accept-Encoding: gzip` (e.g. `curl --compressed`).
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    filters = NewsFilter(
+        start_date=start_date,
+        end_date=end_date,
+        provinces=split_csv(provinces),
+        topics=split_csv(topics),
+        min_sentiment=min_sentiment,
+        max_sentiment=max_sentiment,
+        virality=virality,
+    )
+    rows = ndjson_rows if format == "ndjson" else csv_rows
+    body = chunked(rows(news_repository.iter_query(filters), split_csv(fields)))
+    headers = {"Content-Disposition": f'attachment; filename="news-{date.today().isoformat()}.{format}"'}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzipped(body)
+        headers["Content-Encoding"] = "gzip"
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
 
 @router.get("/news/{news_id}")
 def get_news_detail(news_id: int):
-    data = get_dummy_data()
-    news = next((n for n in data if n["id"] == news_id), None)
+    news = news_repository.get(news_id)
     if not news:
         raise HTTPException(status_code=404, detail="News not found")
     return news
@@ -218,106 +458,100 @@ def get_related_news(news_id: int, limit: int = 5):
     Find related news based on similarity in topics, entities, and province.
     Returns news sorted by relevance score (highest first).
     """
-    data = get_dummy_data()
-    
     # Get the reference news
-    reference_news = next((n for n in data if n["id"] == news_id), None)
+    reference_news = news_repository.get(news_id)
     if not reference_news:
         raise HTTPException(status_code=404, detail="News not found")
     
-    # Extract reference attributes
-    ref_analysis = reference_news.get("analysis") or {}
-    ref_topics = set(ref_analysis.get("topics") or [])
-    
-    # Normalize entities (handle both string and dict formats)
-    raw_entities = ref_analysis.get("entities") or []
-    ref_entities = set()
-    for entity in raw_entities:
-        if isinstance(entity, dict):
-            ref_entities.add(entity.get("name", ""))
-        elif isinstance(entity, str):
-            ref_entities.add(entity)
-    
-    ref_province = reference_news.get("province", "")
-    ref_island = ref_analysis.get("detected_island", "")
+    # Score only the records sharing a topic/entity/province/island (weights 3/2/2/1)
+    top, related_count = related_index.related(news_id, limit)
     
     related_news = []
-    
-    for news in data:
-        if news["id"] == news_id:
-            continue  # Skip the reference news itself
-        
-        # Calculate similarity score
-        score = 0
-        
-        # Topic similarity (weight: 3)
+    for related_id, score in top:
+        news = news_repository.get(related_id)
+        if not news:
+            continue
         news_analysis = news.get("analysis") or {}
-        news_topics = set(news_analysis.get("topics") or [])
-        topic_overlap = len(ref_topics & news_topics)
-        if topic_overlap > 0:
-            score += topic_overlap * 3
-        
-        # Entity similarity (weight: 2)
-        # Normalize entities (handle both string and dict formats)
-        raw_news_entities = news_analysis.get("entities") or []
-        news_entities = set()
-        for entity in raw_news_entities:
-            if isinstance(entity, dict):
-                news_entities.add(entity.get("name", ""))
-            elif isinstance(entity, str):
-                news_entities.add(entity)
-        
-        entity_overlap = len(ref_entities & news_entities)
-        if entity_overlap > 0:
-            score += entity_overlap * 2
-        
-        # Province match (weight: 2)
-        if news.get("province", "") == ref_province and ref_province:
-            score += 2
-        
-        # Island match (weight: 1)
-        if news_analysis.get("detected_island", "") == ref_island and ref_island:
-            score += 1
-        
-        # Only include news with some similarity
-        if score > 0:
-            related_news.append({
-                "id": news["id"],
-                "title": news["title"],
-                "province": news["province"],
-                "published_at": news["published_at"],
-                "summary": news_analysis.get("summary", ""),
-                "topics": news_analysis.get("topics", []),
-                "sentiment_score": news_analysis.get("sentiment_score", 0),
-                "similarity_score": score
-            })
-    
-    # Sort by similarity score (descending) and limit results
-    related_news.sort(key=lambda x: x["similarity_score"], reverse=True)
+        related_news.append({
+            "id": news["id"],
+            "title": news["title"],
+            "province": news["province"],
+            "published_at": news["published_at"],
+            "summary": news_analysis.get("summary", ""),
+            "topics": news_analysis.get("topics", []),
+            "sentiment_score": news_analysis.get("sentiment_score", 0),
+            "similarity_score": score
+        })
     
     return {
         "reference_id": news_id,
         "reference_title": reference_news["title"],
-        "related_count": len(related_news),
-        "related_news": related_news[:limit]
+        "related_count": related_count,
+        "related_news": related_news
     }
 
 @router.get("/status/ai")
-async def check_ai_status():
-    """Check if AI service is connected and working"""
-    config = ai_service.get_config()
-    provider = config.get("provider")
-    api_key = config.get("api_key")
-    model_name = config.get("model_name")
-    
-    if not api_key:
-        return {"status": "disconnected", "message": "API Key not configured"}
-        
-    success, message = await ai_service.test_connection(provider, api_key, model_name)
-    
+async def check_ai_status(force: bool = False):
+    """
+    Whether the configured AI provider is reachable, from the background
+    health monitor's last probe (with `checked_at`). `force=true` probes now,
+    at most once per AI_HEALTH_FORCE_MIN_SECONDS.
+    """
+    return await ai_health.status(force=force)
+
+@router.get("/ai/cache")
+def get_analysis_cache_stats():
+    """Hit/miss counters and size of the AI analysis cache"""
+    return analysis_cache.stats()
+
+@router.delete("/ai/cache")
+def clear_analysis_cache():
+    """Drop every cached AI analysis"""
+    removed = analysis_cache.clear()
+    return {"message": "Analysis cache cleared", "removed": removed}
+
+@router.post("/weather/prefetch")
+async def prefetch_weather(request: WeatherPrefetch):
+    """Warm the weather cache for a date range, one archive request per location"""
+    try:
+        days = (date.fromisoformat(request.end_date) - date.fromisoformat(request.start_date)).days + 1
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    if not 1 <= days <= WEATHER_PREFETCH_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must cover 1-{WEATHER_PREFETCH_MAX_DAYS} days")
+
+    locations = request.locations or weather_service.locations()
+    fetched = await asyncio.gather(*(
+        weather_service.prefetch(location, request.start_date, request.end_date) for location in locations
+    ))
+    return {
+        "locations": len(locations),
+        "days_fetched": sum(fetched),
+        "cache": await run_in_threadpool(weather_cache.stats)
+    }
+
+@router.get("/weather/cache")
+def get_weather_cache_stats():
+    """Hit/miss counters and size of the weather cache"""
+    return weather_cache.stats()
+
+@router.get("/ai/usage")
+def get_llm_usage():
+    """Prompt/completion/cached token totals per provider and model since startup"""
     return {
-        "status": "connected" if success else "disconnected",
-        "provider": provider,
-        "model": model_name,
-        "message": message
+        "prompt_version": prompts.PROMPT_VERSION,
+        "static_prefix_tokens": {
+            "openai": estimate_tokens(prompts.OPENAI_SYSTEM_PROMPT),
+            "gemini": estimate_tokens(prompts.GEMINI_PROMPT_PREFIX)
+        },
+        **llm_usage.stats()
     }
+
+@router.get("/ai/providers")
+def get_provider_stats():
+    """
+    Per provider/model outcome counts (success, error, timeout, cancelled hedge
+    losers, calls skipped by an open circuit breaker), wins, breaker state and
+    p50/p95/p99 latency of successful calls since startup
+    """
+    return provider_chain.stats()
@@ -1,36 +1,69 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from app.services.ai_service import AIService
+from typing import List, Optional
+from app.services.ai_service import ai_service
+from app.services.ai_health import ai_health
+from app.services.client_pool import client_pool
 
 router = APIRouter()
-ai_service = AIService()
+
+class ProviderConfig(BaseModel):
+    provider: str
+    api_key: str
+    model_name: str = ""
 
 class ConfigRequest(BaseModel):
     provider: str
     api_key: str
     model_name: str = ""
+    # Tried in order when the primary provider fails or is slow; omit to keep the saved list
+    fallbacks: Optional[List[ProviderConfig]] = None
 
 class TestConnectionRequest(BaseModel):
     provider: str
     api_key: str
     model_name: str = ""
 
+def _mask(key: str) -> str:
+    return f"{key[:4]}...{key[-4:]}" if len(key) > 8 else ""
+
 @router.get("/config")
 def get_config():
     config = ai_service.get_config()
     # Mask the key for security
     key = config.get("api_key", "")
-    masked_key = f"{key[:4]}...{key[-4:]}" if len(key) > 8 else ""
     return {
         "provider": config.get("provider"), 
-        "api_key_masked": masked_key, 
+        "api_key_masked": _mask(key), 
         "has_key": bool(key),
-        "model_name": config.get("model_name", "")
+        "model_name": config.get("model_name", ""),
+        "fallbacks": [
+            {
+                "provider": fallback.get("provider"),
+                "api_key_masked": _mask(fallback.get("api_key", "")),
+                "has_key": bool(fallback.get("api_key")),
+                "model_name": fallback.get("model_name", ""),
+            }
+            for fallback in config.get("fallbacks", [])
+        ],
     }
 
 @router.post("/config")
-def save_config(req: ConfigRequest):
-    ai_service.save_config(req.provider, req.api_key, req.model_name)
+async def save_config(req: ConfigRequest):
+    fallbacks = None if req.fallbacks is None else [fallback.model_dump() for fallback in req.fallbacks]
+
+    def write():
+        previous = ai_service.get_config()
+        ai_service.save_config(req.provider, req.api_key, req.model_name, fallbacks)
+        return previous, ai_service.get_config()
+    # The file I/O runs in the threadpool; retiring clients and waking the monitor need the event loop
+    previous, current = await run_in_threadpool(write)
+    credentials = lambda config: [(provider, key) for provider, key, _ in ai_service.providers(config)]
+    if credentials(previous) != credentials(current):
+        # Credentials changed: rebuild pooled clients for the configured keys only
+        client_pool.retire_llm_clients(keep_api_keys=[key for _, key in credentials(current)])
+    ai_health.wake()
     return {"status": "success", "message": "Configuration saved"}
 
 @router.post("/test-connection")
@@ -0,0 +1,137 @@
+import os
+
+# Repository root (…/backend/app/core/config.py -> …/)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+# Directory holding the dataset, knowledge base and runtime state.
+# Override with TVRI_DATA_DIR (e.g. for benchmarks against a scratch copy).
+DATA_DIR = os.getenv("TVRI_DATA_DIR", os.path.join(BASE_DIR, "data"))
+
+NEWS_DATA_PATH = os.path.join(DATA_DIR, "dummy_dataset.json")
+KNOWLEDGE_BASE_PATH = os.path.join(DATA_DIR, "knowledge_base.txt")
+# One extracted-text file (+ retrieval index) per uploaded document, listed in manifest.json
+KNOWLEDGE_DIR = os.path.join(DATA_DIR, "knowledge")
+AI_CONFIG_PATH = os.path.join(DATA_DIR, "ai_config.json")
+NEWS_DB_PATH = os.path.join(DATA_DIR, "news.db")
+NEWS_JOURNAL_PATH = os.path.join(DATA_DIR, "news_journal.jsonl")
+NEWS_STATE_PATH = os.path.join(DATA_DIR, "news_state.json")
+
+# The AI config and knowledge-base manifest are cached in memory; this often (seconds)
+# they are checked for changes saved by another worker process (0 = on every use)
+CONFIG_RECHECK_SECONDS = float(os.getenv("CONFIG_RECHECK_SECONDS", "2"))
+
+# Fold the journal into the snapshot once it holds this many operations,
+# or half the snapshot size if that is larger (keeps writes amortized O(1)).
+NEWS_JOURNAL_COMPACT_MIN_OPS = int(os.getenv("NEWS_JOURNAL_COMPACT_MIN_OPS", "500"))
+
+# News storage engine: "json" (snapshot + journal) or "sqlite" (indexed queries).
+# Import an existing JSON dataset with `python -m app.tools.migrate_json_to_sqlite`.
+NEWS_STORAGE = os.getenv("NEWS_STORAGE", "json").lower()
+
+# Persistent cache of AI analyses keyed by normalized content/provider/model/knowledge base
+ANALYSIS_CACHE_PATH = os.path.join(DATA_DIR, "analysis_cache.db")
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+# Weather lookups: past days are cached for good, today's (still changing) values for this long
+WEATHER_CACHE_PATH = os.path.join(DATA_DIR, "weather_cache.db")
+WEATHER_TODAY_TTL_SECONDS = int(os.getenv("WEATHER_TODAY_TTL_SECONDS", "1800"))
+WEATHER_PREFETCH_MAX_DAYS = int(os.getenv("WEATHER_PREFETCH_MAX_DAYS", "366"))
+# Default weather enrichment mode for ingestion: serial | speculative | background
+ENRICHMENT_MODE = os.getenv("ENRICHMENT_MODE", "speculative")
+
+
+def _parse_rate_limits(spec: str):
+    """'openai=5:10,gemini=1' -> {"openai": (5.0, 10), "gemini": (1.0, 1)} (requests/sec : burst)"""
+    limits = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        provider, _, value = part.partition("=")
+        rate, _, burst = value.partition(":")
+        limits[provider.strip()] = (float(rate), int(burst or 1))
+    return limits
+
+
+# Per-provider LLM request rate limits, shared by single and batch ingestion
+LLM_RATE_LIMITS = _parse_rate_limits(os.getenv("LLM_RATE_LIMITS", "openai=5:10,openrouter=2:4,gemini=1:2"))
+
+
+def _parse_seconds(spec: str):
+    """'openai=30,gemini=45' -> {"openai": 30.0, "gemini": 45.0}"""
+    values = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        provider, _, value = part.partition("=")
+        values[provider.strip()] = float(value)
+    return values
+
+
+# Provider failover (app/services/provider_chain.py): timeout for one analysis call per
+# provider (others use LLM_TIMEOUT_SECONDS), consecutive failures that open a provider's
+# circuit breaker and how long it stays open, and hedging: start the next provider when
+# the current one is slower than its p95 latency (over the last LLM_LATENCY_WINDOW calls,
+# once LLM_HEDGE_MIN_SAMPLES are known). Hedged calls can cost a second request.
+LLM_PROVIDER_TIMEOUTS = _parse_seconds(os.getenv("LLM_PROVIDER_TIMEOUTS", "openai=30,openrouter=45,gemini=45"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+LLM_HEDGING = os.getenv("LLM_HEDGING", "false").lower() in ("1", "true", "yes")
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+
+# POST /news/batch: max articles per request and concurrent analyses per batch
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+BATCH_ANALYSIS_CONCURRENCY = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "8"))
+
+# POST /news ingest mode: "sync" (analyze, then respond) or "queued" (store the article as
+# pending and analyze it on the persistent job queue, app/services/analysis_queue.py)
+INGEST_MODE = os.getenv("INGEST_MODE", "sync")
+# Queue workers per process, attempts per article (the last one accepts the offline analysis),
+# first retry delay (doubling up to the max), how long a claimed job may run before another
+# worker takes it over, and how often idle workers look for jobs enqueued by other processes
+ANALYSIS_QUEUE_PATH = os.path.join(DATA_DIR, "analysis_queue.db")
+ANALYSIS_QUEUE_WORKERS = int(os.getenv("ANALYSIS_QUEUE_WORKERS", "4"))
+ANALYSIS_QUEUE_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_QUEUE_MAX_ATTEMPTS", "5"))
+ANALYSIS_QUEUE_RETRY_SECONDS = float(os.getenv("ANALYSIS_QUEUE_RETRY_SECONDS", "10"))
+ANALYSIS_QUEUE_MAX_BACKOFF_SECONDS = float(os.getenv("ANALYSIS_QUEUE_MAX_BACKOFF_SECONDS", "600"))
+ANALYSIS_QUEUE_LEASE_SECONDS = float(os.getenv("ANALYSIS_QUEUE_LEASE_SECONDS", "600"))
+ANALYSIS_QUEUE_POLL_SECONDS = float(os.getenv("ANALYSIS_QUEUE_POLL_SECONDS", "2"))
+
+# GET /stream (server-sent events): events buffered per client before it is told to resync,
+# recent events kept for reconnecting clients (Last-Event-ID), idle heartbeat interval and
+# the most clients one process serves
+STREAM_CLIENT_QUEUE_SIZE = int(os.getenv("STREAM_CLIENT_QUEUE_SIZE", "256"))
+STREAM_REPLAY_EVENTS = int(os.getenv("STREAM_REPLAY_EVENTS", "1024"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "500"))
+
+# Pooled clients (app/services/client_pool.py)
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+# Gemini SDK calls are blocking; at most this many run at once on a worker thread pool
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+
+# Background AI provider health checks (GET /status/ai): probe interval while healthy,
+# first retry after a failure (doubling up to the max), probe timeout, and the
+# minimum time between probes forced with ?force=true
+AI_HEALTH_INTERVAL_SECONDS = float(os.getenv("AI_HEALTH_INTERVAL_SECONDS", "300"))
+AI_HEALTH_RETRY_SECONDS = float(os.getenv("AI_HEALTH_RETRY_SECONDS", "30"))
+AI_HEALTH_MAX_BACKOFF_SECONDS = float(os.getenv("AI_HEALTH_MAX_BACKOFF_SECONDS", "1800"))
+AI_HEALTH_TIMEOUT_SECONDS = float(os.getenv("AI_HEALTH_TIMEOUT_SECONDS", "15"))
+AI_HEALTH_FORCE_MIN_SECONDS = float(os.getenv("AI_HEALTH_FORCE_MIN_SECONDS", "10"))
+
+# Knowledge-base retrieval: chunk size, chunks per article and prompt token budget
+KNOWLEDGE_CHUNK_CHARS = int(os.getenv("KNOWLEDGE_CHUNK_CHARS", "1200"))
+KNOWLEDGE_TOP_K = int(os.getenv("KNOWLEDGE_TOP_K", "6"))
+KNOWLEDGE_TOKEN_BUDGET = int(os.getenv("KNOWLEDGE_TOKEN_BUDGET", "1500"))
+
+# PDF knowledge-base ingestion: extraction worker processes and pages per worker task
+KNOWLEDGE_EXTRACT_WORKERS = int(os.getenv("KNOWLEDGE_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+KNOWLEDGE_PAGES_PER_TASK = int(os.getenv("KNOWLEDGE_PAGES_PER_TASK", "16"))
+
+# Keyword rules for the offline analyzer (_simulate_analysis); a copy in DATA_DIR overrides the bundled one
+_DATA_DIR_RULES = os.path.join(DATA_DIR, "analysis_rules.json")
+ANALYSIS_RULES_PATH = os.getenv("ANALYSIS_RULES_PATH", _DATA_DIR_RULES if os.path.exists(_DATA_DIR_RULES)
+                                else os.path.join(BASE_DIR, "data", "analysis_rules.json"))
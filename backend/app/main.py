@@ -1,12 +1,31 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.api import endpoints
-
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import endpoints, settings, analytics
+from app.services.ai_service import ai_service
+from app.services.ai_health import ai_health
+from app.services.analysis_queue import analysis_workers
+from app.services.news_repository import news_repository
+from app.services.client_pool import client_pool
+from app.services.knowledge_ingest import knowledge_ingest
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open pooled HTTP/LLM clients once; every request reuses their connections
+    config = ai_service.get_config()
+    client_pool.start(config.get("provider"), config.get("api_key"))
+    ai_health.start()
+    # Queued ingestion: requeue jobs a crashed process left behind, then start the workers
+    analysis_workers.start()
+    yield
+    await analysis_workers.aclose()
+    await ai_health.aclose()
+    await knowledge_ingest.aclose()
+    await client_pool.aclose()
+    # Fold the write journal into the snapshot so the next start loads one file
+    news_repository.compact()
 
-app = FastAPI(title="TVRI Index API")
+app = FastAPI(title="TVRI Index API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -0,0 +1,162 @@
+import asyncio
+import datetime
+import hashlib
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import (
+    AI_HEALTH_FORCE_MIN_SECONDS, AI_HEALTH_INTERVAL_SECONDS, AI_HEALTH_MAX_BACKOFF_SECONDS,
+    AI_HEALTH_RETRY_SECONDS, AI_HEALTH_TIMEOUT_SECONDS,
+)
+from app.services.ai_service import ai_service
+
+# (provider, model, fingerprint of the API key): results never hold the key itself
+Target = Tuple[str, str, str]
+
+
+def _fingerprint(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class AIHealthMonitor:
+    """
+    Background connectivity checks for each configured AI provider (the
+    primary and every fallback with a key, see `AIService.providers`).
+
+    A probe is one `test_connection` call (a 1-token completion). The
+    monitor probes a provider every AI_HEALTH_INTERVAL_SECONDS while it is
+    reachable; after a failure it retries after AI_HEALTH_RETRY_SECONDS,
+    doubling up to AI_HEALTH_MAX_BACKOFF_SECONDS, so an outage or a bad key
+    doesn't burn quota. The last result per provider/model/key is kept with
+    its timestamp; concurrent requests for a probe share the one in flight.
+    """
+
+    def __init__(self, service=ai_service):
+        self.service = service
+        self._results: Dict[Target, Dict[str, Any]] = {}
+        self._failures: Dict[Target, int] = {}
+        self._inflight: Dict[Target, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def _current(self) -> List[Tuple[Target, str]]:
+        """(target, api key) for each provider in the configured chain, primary first"""
+        return [
+            ((provider, model_name, _fingerprint(api_key)), api_key)
+            for provider, api_key, model_name in self.service.providers(self.service.get_config())
+        ]
+
+    def start(self):
+        """Start the probe loop (call from the app's event loop)."""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def wake(self):
+        """Probe now instead of at the next scheduled time (e.g. after the config changed)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def aclose(self):
+        tasks = [task for task in [self._task, *self._inflight.values()] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._inflight.clear()
+
+    def _next_due(self, target: Target) -> float:
+        """monotonic() time of the next scheduled probe: interval after a success, backoff after failures"""
+        result = self._results.get(target)
+        if result is None:
+            return 0.0
+        failures = self._failures.get(target, 0)
+        wait = AI_HEALTH_INTERVAL_SECONDS
+        if failures:
+            wait = min(AI_HEALTH_RETRY_SECONDS * 2 ** (failures - 1), AI_HEALTH_MAX_BACKOFF_SECONDS)
+        return result["_monotonic"] + wait
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            delay = AI_HEALTH_INTERVAL_SECONDS
+            try:
+                current = self._current()
+                targets = {target for target, _ in current}
+                # Forget providers that were removed from the config
+                for target in [target for target in self._results if target not in targets]:
+                    del self._results[target]
+                    self._failures.pop(target, None)
+                now = time.monotonic()
+                due = [self.probe(target, api_key) for target, api_key in current if self._next_due(target) <= now]
+                if due:
+                    await asyncio.gather(*due)
+                if current:
+                    delay = min(self._next_due(target) for target in targets) - time.monotonic()
+            except Exception as e:
+                print(f"AI health check error: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(delay, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def probe(self, target: Target, api_key: str) -> asyncio.Task:
+        """Probe `target` now, or join the probe already running for it."""
+        task = self._inflight.get(target)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._probe(target, api_key))
+            self._inflight[target] = task
+            task.add_done_callback(lambda _: self._inflight.pop(target, None))
+        return task
+
+    async def _probe(self, target: Target, api_key: str) -> Dict[str, Any]:
+        provider, model, _ = target
+        start = time.perf_counter()
+        try:
+            success, message = await asyncio.wait_for(
+                self.service.test_connection(provider, api_key, model, pooled=True),
+                AI_HEALTH_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            success, message = False, f"Connection test timed out after {AI_HEALTH_TIMEOUT_SECONDS:g}s"
+        self._failures[target] = 0 if success else self._failures.get(target, 0) + 1
+        result = {
+            "status": "connected" if success else "disconnected",
+            "provider": provider,
+            "model": model,
+            "message": message,
+            "checked_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "consecutive_failures": self._failures[target],
+            "_monotonic": time.monotonic(),
+        }
+        self._results[target] = result
+        self.wake()  # reschedule from this result (e.g. back off after a forced probe failed)
+        return result
+
+    async def status(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Last probe result for each provider in the current config, under
+        "providers". The top-level fields are those of the first connected
+        provider (the one analyses will use), or of the primary if none is.
+        Waits for a probe only if there is none yet or `force` is set; forced
+        probes are limited to one per AI_HEALTH_FORCE_MIN_SECONDS (within
+        that, the last result is returned).
+        """
+        current = self._current()
+        if not current:
+            return {"status": "disconnected", "message": "API Key not configured", "providers": []}
+        now = time.monotonic()
+        pending = {}
+        for target, api_key in current:
+            result = self._results.get(target)
+            if result is None or (force and now - result["_monotonic"] >= AI_HEALTH_FORCE_MIN_SECONDS):
+                pending[target] = asyncio.shield(self.probe(target, api_key))
+        if pending:
+            await asyncio.gather(*pending.values())
+        results = [{k: v for k, v in self._results[target].items() if not k.startswith("_")} for target, _ in current]
+        serving = next((result for result in results if result["status"] == "connected"), results[0])
+        return {**serving, "providers": results}
+
+
+ai_health = AIHealthMonitor()
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+from app.core.config import ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_TTL_SECONDS
+
+_WHITESPACE = re.compile(r"\s+")
+_ZERO_WIDTH = re.compile("[\u200b-\u200d\ufeff]")
+
+# How often the tracked entry count is re-read (other processes share the database)
+ENTRY_COUNT_RESYNC_SECONDS = 60
+
+
+def normalize_content(text: str) -> str:
+    """Canonical form of an article so re-submissions with cosmetic edits hash the same."""
+    text = unicodedata.normalize("NFKC", text)
+    text = _ZERO_WIDTH.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def cache_key(text: str, provider: str, model: str, knowledge_version: str, prompt_version: str) -> str:
+    content_hash = hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+    return hashlib.sha256(
+        f"{content_hash}|{provider}|{model}|{knowledge_version}|{prompt_version}".encode("utf-8")
+    ).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Persistent cache of `AIService.analyze_news` results, stored in SQLite.
+
+    Entries are keyed by `cache_key()` (normalized content hash, provider,
+    model, knowledge-base version, prompt version). They expire `ttl_seconds` after they were
+    written, and the least recently used entries are evicted once the cache
+    holds more than `max_entries`. The entry count is tracked in memory and
+    re-read every ENTRY_COUNT_RESYNC_SECONDS, so other processes' writes
+    are picked up without a COUNT(*) per insert. Hit/miss counters are kept
+    for the lifetime of the process. Calls do blocking SQLite I/O, so async
+    callers run them in a thread.
+    """
+
+    def __init__(self, path: str = ANALYSIS_CACHE_PATH, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES,
+                 ttl_seconds: int = ANALYSIS_CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = None
+        self._entries: Optional[int] = None
+        self._counted_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_access ON analysis_cache (last_access)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_analysis_cache_created_at ON analysis_cache (created_at)")
+        return self._conn
+
+    def _count(self, conn: sqlite3.Connection, now: float) -> int:
+        if self._entries is None or now - self._counted_at > ENTRY_COUNT_RESYNC_SECONDS:
+            self._entries = conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+            self._counted_at = now
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self.evictions += 1
+                if self._entries:
+                    self._entries -= 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE analysis_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any]):
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            conn = self._connection()
+            entries = self._count(conn, now)
+            exists = conn.execute("SELECT 1 FROM analysis_cache WHERE key = ?", (key,)).fetchone() is not None
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._entries = entries + (not exists)
+            self._evict(conn, now)
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypasses += 1
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        expired = max(conn.execute("DELETE FROM analysis_cache WHERE created_at < ?",
+                                   (now - self.ttl_seconds,)).rowcount, 0)
+        self._entries = max(self._entries - expired, 0)
+        overflow = self._entries - self.max_entries
+        evicted = 0
+        if overflow > 0:
+            evicted = max(conn.execute(
+                "DELETE FROM analysis_cache WHERE key IN"
+                " (SELECT key FROM analysis_cache ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            ).rowcount, 0)
+            self._entries -= evicted
+        self.evictions += expired + evicted
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = self._connection().execute("DELETE FROM analysis_cache").rowcount
+            self._entries = 0
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+            self._entries, self._counted_at = entries, time.time()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+analysis_cache = AnalysisCache()
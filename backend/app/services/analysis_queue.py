@@ -0,0 +1,325 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import (
+    ANALYSIS_QUEUE_LEASE_SECONDS, ANALYSIS_QUEUE_MAX_ATTEMPTS, ANALYSIS_QUEUE_MAX_BACKOFF_SECONDS,
+    ANALYSIS_QUEUE_PATH, ANALYSIS_QUEUE_POLL_SECONDS, ANALYSIS_QUEUE_RETRY_SECONDS, ANALYSIS_QUEUE_WORKERS,
+    ENRICHMENT_MODE,
+)
+from app.services.ai_service import ai_service
+from app.services.news_repository import news_repository
+
+# Failed jobs listed by `stats()`
+RECENT_FAILURES = 10
+
+# Stored until the analysis supplies a title/province the upload left out
+DEFAULT_TITLE = "Berita Tanpa Judul"
+DEFAULT_PROVINCE = "Indonesia"
+
+_JOB_COLUMNS = "id, news_id, payload, attempts, enqueued_at"
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return False  # a job claimed by an earlier process that had our pid (e.g. a restarted container)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class AnalysisQueue:
+    """
+    Persistent queue of article analyses for queued ingestion, stored in
+    SQLite so it survives restarts and is shared by every worker process.
+
+    A worker claims one job at a time under a lease of `lease_seconds`.
+    Jobs whose worker process died are requeued by `recover()` on the next
+    start, or taken over by any worker once the lease runs out. A failed
+    attempt is retried after `retry_seconds`, doubling up to `max_backoff`,
+    until `max_attempts`; then the job is kept as failed. Finished jobs are
+    deleted.
+    """
+
+    def __init__(self, path: str = ANALYSIS_QUEUE_PATH, max_attempts: int = ANALYSIS_QUEUE_MAX_ATTEMPTS,
+                 retry_seconds: float = ANALYSIS_QUEUE_RETRY_SECONDS,
+                 max_backoff: float = ANALYSIS_QUEUE_MAX_BACKOFF_SECONDS,
+                 lease_seconds: float = ANALYSIS_QUEUE_LEASE_SECONDS):
+        self.path = path
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_seconds = retry_seconds
+        self.max_backoff = max_backoff
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._conn = None
+        self.completed = 0
+        self.retried = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, news_id INTEGER NOT NULL, payload TEXT NOT NULL,"
+                " status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+                " enqueued_at REAL NOT NULL, available_at REAL NOT NULL,"
+                " owner TEXT, lease_until REAL, error TEXT)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_analysis_jobs_status ON analysis_jobs (status, available_at)"
+            )
+        return self._conn
+
+    @staticmethod
+    def _job(row) -> Dict[str, Any]:
+        return {"id": row[0], "news_id": row[1], "payload": json.loads(row[2]), "attempts": row[3],
+                "enqueued_at": row[4]}
+
+    def enqueue(self, news_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            job_id = self._connection().execute(
+                "INSERT INTO analysis_jobs (news_id, payload, status, enqueued_at, available_at)"
+                " VALUES (?, ?, 'queued', ?, ?)",
+                (news_id, json.dumps(payload, ensure_ascii=False), now, now),
+            ).lastrowid
+        return {"id": job_id, "news_id": news_id, "status": "queued"}
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Take the next due job (or one whose lease expired); `attempts` includes this one."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    f"SELECT {_JOB_COLUMNS} FROM analysis_jobs WHERE status = 'queued' AND available_at <= ?"
+                    " ORDER BY available_at, id LIMIT 1", (now,)
+                ).fetchone()
+                if row is None:
+                    row = conn.execute(
+                        f"SELECT {_JOB_COLUMNS} FROM analysis_jobs WHERE status = 'running' AND lease_until < ?"
+                        " ORDER BY lease_until LIMIT 1", (now,)
+                    ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE analysis_jobs SET status = 'running', attempts = attempts + 1, owner = ?,"
+                        " lease_until = ? WHERE id = ?", (self.owner, now + self.lease_seconds, row[0])
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job = self._job(row)
+        job["attempts"] += 1
+        return job
+
+    def complete(self, job_id: int):
+        with self._lock:
+            self._connection().execute("DELETE FROM analysis_jobs WHERE id = ?", (job_id,))
+            self.completed += 1
+
+    def retry(self, job: Dict[str, Any], error: str) -> bool:
+        """Schedule the next attempt after a failure; returns False (job kept as failed) when none are left."""
+        attempts = job["attempts"]
+        with self._lock:
+            conn = self._connection()
+            if attempts >= self.max_attempts:
+                conn.execute(
+                    "UPDATE analysis_jobs SET status = 'failed', owner = NULL, lease_until = NULL, error = ?"
+                    " WHERE id = ?", (error, job["id"])
+                )
+                return False
+            delay = min(self.retry_seconds * 2 ** (attempts - 1), self.max_backoff)
+            conn.execute(
+                "UPDATE analysis_jobs SET status = 'queued', available_at = ?, owner = NULL, lease_until = NULL,"
+                " error = ? WHERE id = ?", (time.time() + delay, error, job["id"])
+            )
+            self.retried += 1
+            return True
+
+    def release(self) -> int:
+        """Requeue the jobs this process is running (on shutdown), without counting the attempt."""
+        with self._lock:
+            return self._connection().execute(
+                "UPDATE analysis_jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), available_at = ?,"
+                " owner = NULL, lease_until = NULL WHERE status = 'running' AND owner = ?",
+                (time.time(), self.owner),
+            ).rowcount
+
+    def recover(self) -> int:
+        """Requeue jobs left running by a process on this host that no longer exists (crash recovery)."""
+        host = socket.gethostname()
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute("SELECT id, owner FROM analysis_jobs WHERE status = 'running'").fetchall()
+            dead = []
+            for job_id, owner in rows:
+                owner_host, _, pid = (owner or "").rpartition(":")
+                if owner_host == host and pid.isdigit() and not _process_alive(int(pid)):
+                    dead.append(job_id)
+            conn.executemany(
+                "UPDATE analysis_jobs SET status = 'queued', available_at = ?, owner = NULL, lease_until = NULL"
+                " WHERE id = ? AND status = 'running'", [(time.time(), job_id) for job_id in dead]
+            )
+        return len(dead)
+
+    def news_ids(self) -> Set[int]:
+        """News ids with a queued, running or failed job"""
+        with self._lock:
+            return {row[0] for row in self._connection().execute("SELECT news_id FROM analysis_jobs")}
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM analysis_jobs GROUP BY status").fetchall())
+            retrying = conn.execute(
+                "SELECT COUNT(*) FROM analysis_jobs WHERE status = 'queued' AND attempts > 0"
+            ).fetchone()[0]
+            oldest = conn.execute(
+                "SELECT MIN(enqueued_at) FROM analysis_jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+            failures = conn.execute(
+                "SELECT id, news_id, attempts, error FROM analysis_jobs WHERE status = 'failed'"
+                " ORDER BY id DESC LIMIT ?", (RECENT_FAILURES,)
+            ).fetchall()
+            return {
+                "depth": counts.get("queued", 0),
+                "running": counts.get("running", 0),
+                "retrying": retrying,
+                "failed": counts.get("failed", 0),
+                "completed": self.completed,
+                "retried": self.retried,
+                # age of the oldest unfinished job: how far analysis lags behind ingestion
+                "lag_seconds": round(now - oldest, 1) if oldest is not None else 0.0,
+                "max_attempts": self.max_attempts,
+                "recent_failures": [
+                    {"job_id": job_id, "news_id": news_id, "attempts": attempts, "error": error}
+                    for job_id, news_id, attempts, error in failures
+                ],
+            }
+
+
+class AnalysisWorkers:
+    """
+    Runs queued analyses on `workers` asyncio tasks per process: analyzes
+    the stored article with `AIService.analyze_news` and patches the record
+    with the result (status "analyzed"; title/province filled in from the
+    analysis unless they were given). While attempts remain, a failure of
+    every AI provider is retried instead of storing the offline analysis.
+    """
+
+    def __init__(self, queue: AnalysisQueue, service=ai_service, repository=news_repository,
+                 workers: int = ANALYSIS_QUEUE_WORKERS):
+        self.queue = queue
+        self.service = service
+        self.repository = repository
+        self.workers = max(workers, 1)
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self):
+        """Recover jobs left by a crashed process, then start the workers (call from the app's event loop)."""
+        if self._tasks:
+            return
+        recovered = self.queue.recover()
+        orphans = self._enqueue_orphans()
+        if recovered or orphans:
+            print(f"Analysis queue: requeued {recovered} interrupted job(s), {orphans} orphaned pending article(s)")
+        self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._run()) for _ in range(self.workers)]
+
+    def _enqueue_orphans(self) -> int:
+        """Queue pending articles that have no job (the process stopped between storing and enqueueing)"""
+        queued = self.queue.news_ids()
+        orphans = [record for record in self.repository.all()
+                   if record.get("status") == "pending" and record["id"] not in queued]
+        for record in orphans:
+            # A placeholder means the upload had no value, so the analysis should fill it in as usual
+            self.queue.enqueue(record["id"], {
+                "title": record.get("title") if record.get("title") != DEFAULT_TITLE else None,
+                "province": record.get("province") if record.get("province") != DEFAULT_PROVINCE else None,
+            })
+        return len(orphans)
+
+    def wake(self):
+        """A job was enqueued: let idle workers claim it now instead of at their next poll."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def aclose(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.queue.release()
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                job = await asyncio.to_thread(self.queue.claim)
+            except Exception as e:
+                print(f"Analysis queue error: {e}")
+                job = None
+            if job is not None:
+                await self._process(job)
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), ANALYSIS_QUEUE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, job: Dict[str, Any]):
+        try:
+            await self._analyze(job)
+        except Exception as e:
+            print(f"Queued analysis failed for news {job['news_id']} (attempt {job['attempts']}): {e}")
+            if not await asyncio.to_thread(self.queue.retry, job, str(e)):
+                await self._patch(job["news_id"], {"status": "failed"})
+            return
+        await asyncio.to_thread(self.queue.complete, job["id"])
+
+    async def _analyze(self, job: Dict[str, Any]):
+        record = self.repository.get(job["news_id"])
+        if record is None:
+            return  # deleted while queued
+        payload = job["payload"]
+        enrichment = payload.get("enrichment") or ENRICHMENT_MODE
+        if enrichment == "background":
+            enrichment = "serial"  # already off the request path
+        analysis = await self.service.analyze_news(
+            record["content"], bypass_cache=payload.get("bypass_cache", False), enrichment=enrichment,
+            offline_fallback=job["attempts"] >= self.queue.max_attempts,
+        )
+        changes = {"analysis": analysis, "status": "analyzed"}
+        if not payload.get("title"):
+            changes["title"] = analysis.get("generated_title", record["title"])
+        if not payload.get("province"):
+            changes["province"] = analysis.get("detected_province", record["province"])
+        await self._patch(job["news_id"], changes)
+
+    async def _patch(self, news_id: int, changes: Dict[str, Any]):
+        current = self.repository.get(news_id)
+        if current is not None:
+            await asyncio.to_thread(self.repository.update, {**current, **changes})
+
+
+analysis_queue = AnalysisQueue()
+analysis_workers = AnalysisWorkers(analysis_queue)
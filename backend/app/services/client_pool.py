@@ -0,0 +1,200 @@
+import asyncio
+import contextlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import google.generativeai as genai
+import httpx
+import openai
+
+from app.core.config import (
+    GEMINI_MAX_CONCURRENCY, HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT_SECONDS, LLM_CONNECT_TIMEOUT_SECONDS, LLM_MAX_RETRIES, LLM_TIMEOUT_SECONDS,
+)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# (provider, api_key, base_url)
+ClientKey = Tuple[str, str, Optional[str]]
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS)
+
+
+class ClientPool:
+    """
+    Long-lived, keep-alive pooled clients shared by every request.
+
+    - one `openai.AsyncOpenAI` per (provider, api_key, base_url), used for
+      OpenAI and OpenRouter
+    - one `genai.GenerativeModel` per (api_key, model), plus a bounded
+      thread pool that runs the (blocking) Gemini SDK calls off the event
+      loop. The SDK's API key is process-global (`genai.configure`), so
+      `run_gemini()` takes turns between keys: calls with the configured key
+      run side by side, and switching keys waits for them to finish
+    - one `httpx.AsyncClient` for plain HTTP APIs (weather)
+
+    Created on application startup and closed on shutdown. When the saved
+    credentials change, `retire_llm_clients()` drops clients for other keys;
+    they are closed after a grace period so in-flight calls can finish.
+    One-off calls with keys that aren't saved (connection tests) use the
+    unpooled `scratch_llm_client()` / `scratch_gemini_model()` instead.
+    """
+
+    def __init__(self):
+        self._llm_clients: Dict[ClientKey, openai.AsyncOpenAI] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._retired = []
+        self._closing = set()
+        self._gemini_models: Dict[Tuple[str, str], Any] = {}
+        self._gemini_lock = threading.Lock()
+        self._gemini_executor: Optional[ThreadPoolExecutor] = None
+        # Key passed to genai.configure(), Gemini calls running with it and callers waiting per key
+        self._gemini_turn = threading.Condition()
+        self._gemini_api_key: Optional[str] = None
+        self._gemini_calls = 0
+        self._gemini_waiting: Counter = Counter()
+
+    def llm_client(self, provider: str, api_key: str, base_url: Optional[str] = None) -> openai.AsyncOpenAI:
+        if provider == "openrouter" and base_url is None:
+            base_url = OPENROUTER_BASE_URL
+        key = (provider, api_key, base_url)
+        client = self._llm_clients.get(key)
+        if client is None:
+            client = self._new_llm_client(api_key, base_url)
+            self._llm_clients[key] = client
+        return client
+
+    @staticmethod
+    def _new_llm_client(api_key: str, base_url: Optional[str]) -> openai.AsyncOpenAI:
+        return openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+            max_retries=LLM_MAX_RETRIES,
+            http_client=openai.DefaultAsyncHttpxClient(limits=_limits()),
+        )
+
+    @contextlib.asynccontextmanager
+    async def scratch_llm_client(self, provider: str, api_key: str, base_url: Optional[str] = None):
+        """An unpooled client for a one-off call, closed on exit."""
+        if provider == "openrouter" and base_url is None:
+            base_url = OPENROUTER_BASE_URL
+        client = self._new_llm_client(api_key, base_url)
+        try:
+            yield client
+        finally:
+            await client.close()
+
+    def gemini_model(self, api_key: str, model_id: str) -> genai.GenerativeModel:
+        """Cached Gemini model for (api_key, model_id); call it through `run_gemini()` with the same key."""
+        key = (api_key, model_id)
+        model = self._gemini_models.get(key)
+        if model is None:
+            with self._gemini_lock:
+                model = self._gemini_models.setdefault(key, genai.GenerativeModel(model_id))
+        return model
+
+    @contextlib.asynccontextmanager
+    async def scratch_gemini_model(self, api_key: str, model_id: str):
+        """An unpooled Gemini model for a one-off call; call it through `run_gemini()` with `api_key`."""
+        yield genai.GenerativeModel(model_id)
+
+    async def run_gemini(self, api_key: str, fn, *args, **kwargs):
+        """Run a blocking Gemini SDK call made with `api_key` on the bounded Gemini thread pool."""
+        if self._gemini_executor is None:
+            self._gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY,
+                                                       thread_name_prefix="gemini")
+        loop = asyncio.get_running_loop()
+
+        def call():
+            with self._gemini_key(api_key):
+                return fn(*args, **kwargs)
+        return await loop.run_in_executor(self._gemini_executor, call)
+
+    @contextlib.contextmanager
+    def _gemini_key(self, api_key: str):
+        """Hold `api_key` as the configured Gemini key for the duration of one call."""
+        def my_turn():
+            if api_key == self._gemini_api_key:
+                # Let a waiting key go first, so a steady stream of calls can't starve it
+                return not any(key != api_key for key in self._gemini_waiting)
+            return not self._gemini_calls
+
+        with self._gemini_turn:
+            self._gemini_waiting[api_key] += 1
+            self._gemini_turn.wait_for(my_turn)
+            self._gemini_waiting[api_key] -= 1
+            if not self._gemini_waiting[api_key]:
+                del self._gemini_waiting[api_key]
+            if api_key != self._gemini_api_key:
+                genai.configure(api_key=api_key)
+                self._gemini_api_key = api_key
+            self._gemini_calls += 1
+            self._gemini_turn.notify_all()
+        try:
+            yield
+        finally:
+            with self._gemini_turn:
+                self._gemini_calls -= 1
+                self._gemini_turn.notify_all()
+
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+                limits=_limits(),
+            )
+        return self._http_client
+
+    def start(self, provider: Optional[str] = None, api_key: Optional[str] = None):
+        """Open the shared clients up front (and the LLM client for the saved config)."""
+        self.http_client()
+        if api_key and provider in ("openai", "openrouter"):
+            self.llm_client(provider, api_key)
+
+    def retire_llm_clients(self, keep_api_keys: Iterable[str] = (), grace_seconds: float = LLM_TIMEOUT_SECONDS):
+        """Drop pooled LLM clients that don't use one of `keep_api_keys`; close them once in-flight calls are done."""
+        keep_api_keys = set(keep_api_keys)
+        with self._gemini_lock:
+            for key in [key for key in self._gemini_models if key[0] not in keep_api_keys]:
+                del self._gemini_models[key]
+        stale = [key for key in self._llm_clients if key[1] not in keep_api_keys]
+        clients = [self._llm_clients.pop(key) for key in stale]
+        if not clients:
+            return
+        self._retired.extend(clients)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no running loop (e.g. scripts): aclose() closes them
+        task = loop.create_task(self._close_later(clients, grace_seconds))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_later(self, clients, delay: float):
+        await asyncio.sleep(delay)
+        for client in clients:
+            self._retired.remove(client)
+            await client.close()
+
+    async def aclose(self):
+        for task in list(self._closing):
+            task.cancel()
+        for client in list(self._llm_clients.values()) + self._retired:
+            await client.close()
+        self._llm_clients.clear()
+        self._retired.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        self._gemini_models.clear()
+        if self._gemini_executor is not None:
+            self._gemini_executor.shutdown(wait=False, cancel_futures=True)
+            self._gemini_executor = None
+
+
+client_pool = ClientPool()
@@ -0,0 +1,193 @@
+import json
+import math
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import KNOWLEDGE_CHUNK_CHARS, KNOWLEDGE_DIR, KNOWLEDGE_TOKEN_BUDGET, KNOWLEDGE_TOP_K
+from app.services.knowledge_store import knowledge_store
+from app.services.text_tokenizer import tokenize
+
+INDEX_FORMAT_VERSION = 1
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# (document id, chunk number within the document)
+ChunkId = Tuple[str, int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def chunk_text(text: str, chunk_chars: int = KNOWLEDGE_CHUNK_CHARS) -> List[Tuple[int, int]]:
+    """Split on line boundaries into (start, end) spans of roughly `chunk_chars` characters."""
+    spans = []
+    start = 0
+    pos = 0
+    length = len(text)
+    while pos < length:
+        newline = text.find("\n", pos)
+        pos = length if newline == -1 else newline + 1
+        if pos - start >= chunk_chars:
+            spans.append((start, pos))
+            start = pos
+    if start < length and text[start:].strip():
+        spans.append((start, length))
+    return spans
+
+
+class KnowledgeIndex:
+    """
+    BM25 index over chunks of the knowledge-base documents.
+
+    Each document is split into line-aligned chunks once; its chunk offsets
+    and term statistics are persisted next to its text (`<id>.index.json`)
+    and merged into the collection-wide postings. Registered with the
+    knowledge store, so adding or removing a document touches only that
+    document's postings. `select()` returns the chunks most relevant to an
+    article, up to a token budget, instead of the first N characters of the
+    knowledge base.
+    """
+
+    def __init__(self, index_dir: str = KNOWLEDGE_DIR):
+        self.index_dir = index_dir
+        self._lock = threading.Lock()
+        self._texts: Dict[str, str] = {}  # doc id -> text, in the order documents were added
+        self._spans: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: Dict[ChunkId, int] = {}
+        self._postings: Dict[str, Dict[ChunkId, int]] = {}
+        self._doc_postings: Dict[str, Dict[str, List[int]]] = {}  # doc id -> term -> chunks
+        self._total_len = 0
+
+    def index_path(self, doc_id: str) -> str:
+        return os.path.join(self.index_dir, f"{doc_id}.index.json")
+
+    @staticmethod
+    def _build(text: str) -> Dict[str, Any]:
+        spans = chunk_text(text)
+        lengths = []
+        postings: Dict[str, Dict[int, int]] = {}
+        for chunk, (start, end) in enumerate(spans):
+            terms = Counter(tokenize(text[start:end]))
+            lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                postings.setdefault(term, {})[chunk] = tf
+        return {"version": INDEX_FORMAT_VERSION, "chunk_chars": KNOWLEDGE_CHUNK_CHARS,
+                "spans": spans, "lengths": lengths, "postings": postings}
+
+    def _load_or_build(self, doc_id: str, text: str) -> Dict[str, Any]:
+        path = self.index_path(doc_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_FORMAT_VERSION and data.get("chunk_chars") == KNOWLEDGE_CHUNK_CHARS:
+                data["postings"] = {term: {int(k): v for k, v in chunks.items()}
+                                    for term, chunks in data["postings"].items()}
+                return data
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        data = self._build(text)
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not persist knowledge index: {e}")
+        return data
+
+    def prepare(self, document: Dict[str, Any], text: str) -> Tuple[str, Dict[str, Any]]:
+        """Chunk and term statistics for one document (loaded from its index file, or built)"""
+        return text, self._load_or_build(document["id"], text)
+
+    def add(self, document: Dict[str, Any], prepared: Tuple[str, Dict[str, Any]]):
+        doc_id = document["id"]
+        text, data = prepared
+        with self._lock:
+            self._texts[doc_id] = text
+            self._spans[doc_id] = [tuple(span) for span in data["spans"]]
+            for chunk, length in enumerate(data["lengths"]):
+                self._lengths[(doc_id, chunk)] = length
+                self._total_len += length
+            for term, chunks in data["postings"].items():
+                postings = self._postings.setdefault(term, {})
+                for chunk, tf in chunks.items():
+                    postings[(doc_id, chunk)] = tf
+            self._doc_postings[doc_id] = {term: list(chunks) for term, chunks in data["postings"].items()}
+
+    def remove(self, document: Dict[str, Any]):
+        doc_id = document["id"]
+        with self._lock:
+            if self._texts.pop(doc_id, None) is None:
+                return
+            for chunk in range(len(self._spans.pop(doc_id))):
+                self._total_len -= self._lengths.pop((doc_id, chunk))
+            for term, chunks in self._doc_postings.pop(doc_id).items():
+                postings = self._postings[term]
+                for chunk in chunks:
+                    del postings[(doc_id, chunk)]
+                if not postings:
+                    del self._postings[term]
+        if os.path.exists(self.index_path(doc_id)):
+            os.remove(self.index_path(doc_id))
+
+    def _score(self, query: str) -> Dict[ChunkId, float]:
+        postings, lengths = self._postings, self._lengths
+        n = len(lengths)
+        scores: Dict[ChunkId, float] = {}
+        if not n:
+            return scores
+        avg_len = self._total_len / n or 1.0
+        for term in set(tokenize(query)):
+            chunks = postings.get(term)
+            if not chunks:
+                continue
+            idf = math.log(1 + (n - len(chunks) + 0.5) / (len(chunks) + 0.5))
+            for chunk_id, tf in chunks.items():
+                norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[chunk_id] / avg_len))
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * norm
+        return scores
+
+    def _ranked(self, query: str, top_k: int) -> List[Tuple[ChunkId, float]]:
+        order = {doc_id: position for position, doc_id in enumerate(self._texts)}
+        scores = self._score(query)
+        return sorted(scores.items(), key=lambda kv: (-kv[1], order[kv[0][0]], kv[0][1]))[:top_k]
+
+    def search(self, query: str, top_k: int = KNOWLEDGE_TOP_K) -> List[Tuple[ChunkId, float]]:
+        """[((doc id, chunk), BM25 score), ...] best first."""
+        with self._lock:
+            return self._ranked(query, top_k)
+
+    def select(self, article: str, top_k: int = KNOWLEDGE_TOP_K,
+               token_budget: int = KNOWLEDGE_TOKEN_BUDGET) -> str:
+        """
+        Knowledge-base context for one article: the best-matching chunks that
+        fit in `token_budget`, in document order.
+        """
+        with self._lock:
+            chosen = []
+            used = 0
+            for (doc_id, chunk), _ in self._ranked(article, top_k):
+                start, end = self._spans[doc_id][chunk]
+                cost = estimate_tokens(self._texts[doc_id][start:end])
+                if used + cost > token_budget:
+                    continue
+                chosen.append((doc_id, chunk))
+                used += cost
+            order = {doc_id: position for position, doc_id in enumerate(self._texts)}
+            chosen.sort(key=lambda key: (order[key[0]], key[1]))
+            return "\n...\n".join(self._texts[doc_id][slice(*self._spans[doc_id][chunk])].strip()
+                                   for doc_id, chunk in chosen)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"documents": len(self._texts), "chunks": len(self._lengths), "terms": len(self._postings)}
+
+
+knowledge_index = KnowledgeIndex()
+knowledge_store.add_index(knowledge_index)
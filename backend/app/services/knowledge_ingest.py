@@ -0,0 +1,166 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from pypdf import PdfReader
+
+from app.core.config import KNOWLEDGE_EXTRACT_WORKERS, KNOWLEDGE_PAGES_PER_TASK
+from app.services.knowledge_store import knowledge_store
+
+# Finished jobs kept around for GET /knowledge/jobs/{id}
+MAX_FINISHED_JOBS = 50
+
+
+def count_pages(pdf_path: str) -> int:
+    return len(PdfReader(pdf_path).pages)
+
+
+def extract_pages(pdf_path: str, start: int, end: int) -> List[str]:
+    """Text of pages [start, end), each ending in a newline. Runs in a worker process."""
+    reader = PdfReader(pdf_path)
+    return [(reader.pages[i].extract_text() or "") + "\n" for i in range(start, end)]
+
+
+class KnowledgeIngest:
+    """
+    Background PDF -> knowledge-base ingestion.
+
+    `submit()` takes an uploaded PDF already saved to a temp file and returns
+    a job id right away. The job extracts text on a process pool, a range of
+    pages per task, writing the page ranges in order to a temp file in the
+    knowledge store and recording where each page starts. At most a few
+    ranges are in flight, so memory stays bounded for large documents. The
+    finished text is added to the knowledge store as a new document, which
+    indexes just that document. Jobs run one at a time.
+    """
+
+    def __init__(self, store=knowledge_store, workers: int = KNOWLEDGE_EXTRACT_WORKERS,
+                 pages_per_task: int = KNOWLEDGE_PAGES_PER_TASK):
+        self.store = store
+        self.workers = max(workers, 1)
+        self.pages_per_task = max(pages_per_task, 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tasks = set()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the API process runs threads (thread pools, SQLite)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def temp_upload_path(self) -> str:
+        """Unique temp file for an incoming upload, on the same filesystem as the knowledge store."""
+        os.makedirs(self.store.root, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="upload_", suffix=".tmp", dir=self.store.root)
+        os.close(fd)
+        return path
+
+    def submit(self, pdf_path: str, filename: str, doc_id: str) -> Dict[str, Any]:
+        """Start ingesting `pdf_path` as document `doc_id` (sha256 of the file)."""
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "document_id": doc_id,
+            "filename": filename,
+            "status": "queued",
+            "pages_total": None,
+            "pages_done": 0,
+            "chars_extracted": 0,
+            "error": None,
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        self._jobs[job["job_id"]] = job
+        self._prune()
+        task = asyncio.get_running_loop().create_task(self._run(job, pdf_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+    async def _run(self, job: Dict[str, Any], pdf_path: str):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        text_path = None
+        try:
+            async with self._lock:
+                if await asyncio.to_thread(self.store.get, job["document_id"]) is not None:
+                    # The same file was ingested by a job queued ahead of this one
+                    job["status"] = "done"
+                    return
+                job["status"] = "extracting"
+                fd, text_path = tempfile.mkstemp(prefix="extract_", suffix=".tmp", dir=self.store.root)
+                with os.fdopen(fd, "w", encoding="utf-8") as out:
+                    page_offsets = await self._extract(job, pdf_path, out)
+                    out.flush()
+                    os.fsync(out.fileno())
+                job["status"] = "indexing"
+                await asyncio.to_thread(self.store.add, job["document_id"], job["filename"], text_path,
+                                        page_offsets, job["chars_extracted"])
+                text_path = None
+                job["status"] = "done"
+        except Exception as e:
+            print(f"Knowledge base ingestion failed for {job['filename']}: {e}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = time.time()
+            for path in (pdf_path, text_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+
+    async def _extract(self, job: Dict[str, Any], pdf_path: str, out) -> List[int]:
+        """Write the PDF's text to `out`; returns the character offset where each page starts."""
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        total = await loop.run_in_executor(pool, count_pages, pdf_path)
+        job["pages_total"] = total
+        ranges = iter([(start, min(start + self.pages_per_task, total))
+                       for start in range(0, total, self.pages_per_task)])
+
+        def submit_next():
+            page_range = next(ranges, None)
+            if page_range is not None:
+                pending.append((page_range, loop.run_in_executor(pool, extract_pages, pdf_path, *page_range)))
+
+        # Keep every worker busy with one range queued behind it; write ranges in page order.
+        pending = deque()
+        for _ in range(self.workers * 2):
+            submit_next()
+        page_offsets = []
+        while pending:
+            (start, end), future = pending.popleft()
+            pages = await future
+            submit_next()
+            for page in pages:
+                page_offsets.append(job["chars_extracted"])
+                job["chars_extracted"] += len(page)
+            await asyncio.to_thread(out.write, "".join(pages))
+            job["pages_done"] += end - start
+        return page_offsets
+
+    async def aclose(self):
+        for task in list(self._tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+knowledge_ingest = KnowledgeIngest()
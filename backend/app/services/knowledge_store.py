@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import CONFIG_RECHECK_SECONDS, KNOWLEDGE_BASE_PATH, KNOWLEDGE_DIR
+
+
+class KnowledgeStore:
+    """
+    Knowledge-base documents, one per uploaded PDF.
+
+    Each document is addressed by the sha256 of the uploaded file and stored
+    as extracted text (`<id>.txt`) plus metadata in `manifest.json`:
+    filename, page count, the character offset where each page starts, and
+    when it was added. A single `knowledge_base.txt` from before the store
+    existed is imported as a document on first load.
+
+    Derived indexes (see `add_index`) are updated for the changed document
+    only: `prepare(document, text)` does the expensive work and runs without
+    the store lock, then `add(document, prepared)` and `remove(document)`
+    swap the entries in or out under it. Readers never wait for a document
+    being indexed; they see it once it has been added. The manifest is
+    re-read when another process changes it.
+    """
+
+    def __init__(self, root: str = KNOWLEDGE_DIR, legacy_path: str = KNOWLEDGE_BASE_PATH):
+        self.root = root
+        self.legacy_path = legacy_path
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self._lock = threading.RLock()
+        # Serializes refresh/add/remove, which index documents outside `_lock`
+        self._update_lock = threading.RLock()
+        self._signature = None
+        self._checked = 0.0
+        self._version: Optional[str] = None
+        self._loaded = False
+        self._documents: Dict[str, Dict[str, Any]] = {}  # id -> metadata, oldest first
+        self._indexes = []
+
+    def text_path(self, doc_id: str) -> str:
+        return os.path.join(self.root, f"{doc_id}.txt")
+
+    def add_index(self, index):
+        with self._update_lock, self._lock:
+            self._indexes.append(index)
+            if self._loaded:
+                for document in self._documents.values():
+                    index.add(document, index.prepare(document, self._read_text(document["id"])))
+
+    def _manifest_signature(self):
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self, force: bool = False):
+        """Pick up documents added or removed by another process."""
+        if not force and self._loaded and time.monotonic() - self._checked < CONFIG_RECHECK_SECONDS:
+            return
+        # Once loaded, a reader that finds an update running keeps the current documents
+        if not self._update_lock.acquire(blocking=force or not self._loaded):
+            return
+        try:
+            with self._lock:
+                self._checked = time.monotonic()
+                signature = self._manifest_signature()
+                if self._loaded and signature == self._signature:
+                    return
+                if signature is None and not self._loaded:
+                    self._import_legacy()
+                    signature = self._manifest_signature()
+                documents = self._read_manifest() if signature is not None else {}
+                added = [document for doc_id, document in documents.items() if doc_id not in self._documents]
+                indexes = list(self._indexes)
+            prepared = []
+            for document in added:
+                try:
+                    prepared.append((document, self._prepare(document, indexes)))
+                except FileNotFoundError:
+                    # Removed by another process after we read the manifest
+                    print(f"Knowledge document {document['id']} has no text file; skipping it")
+            with self._lock:
+                self._version = None
+                for doc_id in [doc_id for doc_id in self._documents if doc_id not in documents]:
+                    self._notify_remove(self._documents.pop(doc_id))
+                for document, entries in prepared:
+                    self._documents[document["id"]] = document
+                    self._notify_add(document, indexes, entries)
+                self._signature = signature
+                self._loaded = True
+        finally:
+            self._update_lock.release()
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return {document["id"]: document for document in json.load(f)["documents"]}
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            print(f"Error loading knowledge manifest: {e}")
+            return dict(self._documents)
+
+    def _write_manifest(self, documents: Optional[Dict[str, Dict[str, Any]]] = None):
+        documents = self._documents if documents is None else documents
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"documents": list(documents.values())}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self._signature = self._manifest_signature()
+
+    def _import_legacy(self):
+        if not os.path.exists(self.legacy_path):
+            return
+        with open(self.legacy_path, "rb") as f:
+            data = f.read()
+        os.makedirs(self.root, exist_ok=True)
+        doc_id = hashlib.sha256(data).hexdigest()
+        with open(self.text_path(doc_id), "wb") as f:
+            f.write(data)
+        document = self._metadata(doc_id, os.path.basename(self.legacy_path), [0], len(data.decode("utf-8")))
+        self._write_manifest({doc_id: document})
+
+    def _read_text(self, doc_id: str) -> str:
+        with open(self.text_path(doc_id), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _prepare(self, document: Dict[str, Any], indexes: List[Any]) -> List[Any]:
+        """Index entries for `document`, built without the store lock"""
+        text = self._read_text(document["id"])
+        return [index.prepare(document, text) for index in indexes]
+
+    def _notify_add(self, document: Dict[str, Any], indexes: List[Any], entries: List[Any]):
+        for index, entry in zip(indexes, entries):
+            index.add(document, entry)
+
+    def _notify_remove(self, document: Dict[str, Any]):
+        for index in self._indexes:
+            index.remove(document)
+
+    @staticmethod
+    def _metadata(doc_id: str, filename: str, page_offsets: List[int], chars: int) -> Dict[str, Any]:
+        return {
+            "id": doc_id,
+            "filename": filename,
+            "pages": len(page_offsets),
+            "page_offsets": page_offsets,
+            "chars": chars,
+            "added_at": time.time(),
+        }
+
+    def documents(self) -> List[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            return [dict(document) for document in self._documents.values()]
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            document = self._documents.get(doc_id)
+            return dict(document) if document is not None else None
+
+    def add(self, doc_id: str, filename: str, text_tmp_path: str, page_offsets: List[int], chars: int) -> Dict[str, Any]:
+        """Move an extracted-text temp file into the store and index it."""
+        with self._update_lock:
+            self.refresh(force=True)
+            with self._lock:
+                if doc_id in self._documents:
+                    os.remove(text_tmp_path)
+                    return dict(self._documents[doc_id])
+                indexes = list(self._indexes)
+            os.replace(text_tmp_path, self.text_path(doc_id))
+            document = self._metadata(doc_id, filename, page_offsets, chars)
+            entries = self._prepare(document, indexes)
+            with self._lock:
+                self._documents[doc_id] = document
+                self._version = None
+                self._write_manifest()
+                self._notify_add(document, indexes, entries)
+                return dict(document)
+
+    def remove(self, doc_id: str) -> bool:
+        with self._update_lock:
+            self.refresh(force=True)
+            with self._lock:
+                document = self._documents.pop(doc_id, None)
+                if document is None:
+                    return False
+                self._version = None
+                self._write_manifest()
+                self._notify_remove(document)
+            if os.path.exists(self.text_path(doc_id)):
+                os.remove(self.text_path(doc_id))
+            return True
+
+    def version(self) -> str:
+        """Identifies the current document set (part of the analysis cache key)."""
+        self.refresh()
+        with self._lock:
+            if self._version is None:
+                self._version = "none" if not self._documents else \
+                    hashlib.sha256("|".join(sorted(self._documents)).encode("utf-8")).hexdigest()[:16]
+            return self._version
+
+    def stats(self) -> Dict[str, Any]:
+        self.refresh()
+        with self._lock:
+            size_bytes = 0
+            for doc_id in self._documents:
+                try:
+                    size_bytes += os.path.getsize(self.text_path(doc_id))
+                except OSError:
+                    pass
+            return {
+                "documents": len(self._documents),
+                "chars": sum(document["chars"] for document in self._documents.values()),
+                "size_bytes": size_bytes,
+            }
+
+
+knowledge_store = KnowledgeStore()
@@ -0,0 +1,63 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+class LLMUsage:
+    """
+    Token accounting for analysis calls, per (provider, model).
+
+    Counts calls and prompt / completion / cached prompt tokens as reported
+    by the provider (cached tokens are the part of the prompt served from
+    the provider's prefix cache). Kept for the lifetime of the process, like
+    the analysis cache counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def record(self, provider: str, model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int],
+               cached_tokens: Optional[int] = None):
+        with self._lock:
+            totals = self._totals.setdefault((provider, model), {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+            })
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens or 0
+            totals["completion_tokens"] += completion_tokens or 0
+            totals["cached_tokens"] += cached_tokens or 0
+
+    def record_openai(self, provider: str, model: str, usage):
+        """Record a chat completion's `usage` (OpenAI / OpenRouter)."""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.record(provider, model, usage.prompt_tokens, usage.completion_tokens,
+                    getattr(details, "cached_tokens", None))
+
+    def record_gemini(self, model: str, usage_metadata):
+        """Record a Gemini response's `usage_metadata`."""
+        if usage_metadata is None:
+            return
+        self.record("gemini", model, usage_metadata.prompt_token_count, usage_metadata.candidates_token_count,
+                    getattr(usage_metadata, "cached_content_token_count", None))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = []
+            for (provider, model), totals in self._totals.items():
+                prompt = totals["prompt_tokens"]
+                models.append({
+                    "provider": provider,
+                    "model": model,
+                    **totals,
+                    "cached_ratio": round(totals["cached_tokens"] / prompt, 3) if prompt else 0.0,
+                })
+            return {"models": models}
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+
+llm_usage = LLMUsage()
@@ -0,0 +1,149 @@
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+from app.services.news_repository import news_repository
+
+
+def _sentiment_bucket(score) -> str:
+    if score >= 60:
+        return "positive"
+    if score <= 40:
+        return "negative"
+    return "neutral"
+
+
+def is_risk_alert(analysis: Dict[str, Any]) -> bool:
+    return "Negatif" in analysis.get("impact", "")
+
+
+def is_pending(record: Dict[str, Any]) -> bool:
+    """Stored by queued ingestion and still waiting for its analysis"""
+    return record.get("status") == "pending"
+
+
+class _ProvinceStats:
+    __slots__ = ("total", "sentiment_sum", "sentiments", "topics")
+
+    def __init__(self):
+        self.total = 0
+        self.sentiment_sum = 0
+        self.sentiments = {"positive": 0, "neutral": 0, "negative": 0}
+        self.topics = Counter()
+
+
+class NewsAggregates:
+    """
+    Running counters behind `/dashboard/stats` and `/analytics/geographic`.
+
+    Registered as a repository index, so every insert/delete adjusts the
+    counters by one record and both endpoints answer in
+    O(#provinces + #topics). `check_consistency()` compares the counters
+    against a full recompute. Records still pending analysis are left out
+    until the analyzed record replaces them.
+
+    Ties in the "top" orderings are broken by name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.total_news = 0
+        self.risk_alerts = 0
+        self.topics = Counter()
+        self.provinces: Dict[str, _ProvinceStats] = {}
+
+    def _apply(self, record: Dict[str, Any], sign: int):
+        if is_pending(record):
+            return
+        analysis = record["analysis"]
+        topics = analysis.get("topics", [])
+        sentiment = analysis.get("sentiment_score", 50)
+
+        self.total_news += sign
+        if is_risk_alert(analysis):
+            self.risk_alerts += sign
+        for topic in topics:
+            self.topics[topic] += sign
+            if self.topics[topic] <= 0:
+                del self.topics[topic]
+
+        province = record.get("province", "Unknown")
+        stats = self.provinces.get(province)
+        if stats is None:
+            stats = self.provinces[province] = _ProvinceStats()
+        stats.total += sign
+        stats.sentiment_sum += sign * sentiment
+        stats.sentiments[_sentiment_bucket(sentiment)] += sign
+        for topic in topics:
+            stats.topics[topic] += sign
+            if stats.topics[topic] <= 0:
+                del stats.topics[topic]
+        if stats.total <= 0:
+            del self.provinces[province]
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        with self._lock:
+            self._reset()
+            for record in records:
+                self._apply(record, 1)
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self._apply(record, 1)
+
+    def remove(self, record: Dict[str, Any]):
+        with self._lock:
+            self._apply(record, -1)
+
+    def dashboard_stats(self, top_n: int = 5) -> Dict[str, Any]:
+        with self._lock:
+            top_topics = sorted(self.topics.items(), key=lambda kv: (-kv[1], kv[0]))[:top_n]
+            return {
+                "total_news": self.total_news,
+                "top_topics": [{"name": k, "count": v} for k, v in top_topics],
+                "risk_alerts": self.risk_alerts,
+            }
+
+    def geographic(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            result = []
+            for province, stats in self.provinces.items():
+                result.append({
+                    "province": province,
+                    "total": stats.total,
+                    "sentiments": dict(stats.sentiments),
+                    "avg_sentiment": round(stats.sentiment_sum / stats.total, 1),
+                    "topics": dict(stats.topics),
+                })
+        result.sort(key=lambda x: (-x["total"], x["province"]))
+        return result
+
+    def check_consistency(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Recompute from `records` and list every counter that disagrees."""
+        expected = NewsAggregates()
+        expected.rebuild(records)
+        mismatches = []
+
+        actual_stats, expected_stats = self.dashboard_stats(top_n=None), expected.dashboard_stats(top_n=None)
+        for key in ("total_news", "risk_alerts", "top_topics"):
+            if actual_stats[key] != expected_stats[key]:
+                mismatches.append({"field": key, "actual": actual_stats[key], "expected": expected_stats[key]})
+
+        actual_geo = {p["province"]: p for p in self.geographic()}
+        expected_geo = {p["province"]: p for p in expected.geographic()}
+        for province in sorted(set(actual_geo) | set(expected_geo)):
+            if actual_geo.get(province) != expected_geo.get(province):
+                mismatches.append({
+                    "field": f"provinces.{province}",
+                    "actual": actual_geo.get(province),
+                    "expected": expected_geo.get(province),
+                })
+
+        return {"consistent": not mismatches, "mismatches": mismatches}
+
+
+news_aggregates = NewsAggregates()
+news_repository.add_index(news_aggregates)
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import orjson
+
+from app.services.news_query import project
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# CSV columns when no `fields=` are given (content and the nested analysis lists stay out)
+CSV_COLUMNS = [
+    "id", "published_at", "title", "province", "island",
+    "analysis.topics", "analysis.entities", "analysis.sentiment_score",
+    "analysis.virality_score", "analysis.impact", "analysis.summary",
+]
+
+# Bytes collected before a chunk is handed to the response (fewer, larger writes)
+CHUNK_BYTES = 64 * 1024
+
+
+def _getter(field: str) -> Callable[[Dict[str, Any]], Any]:
+    """Reads a top-level or dotted field from a record (None if missing)."""
+    names = field.split(".")
+    if len(names) == 1:
+        return lambda record: record.get(field)
+
+    def get(record):
+        value = record
+        for name in names:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(name)
+        return value
+    return get
+
+
+def _cell(value) -> str:
+    if type(value) is str:
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(item if isinstance(item, str) else json.dumps(item, ensure_ascii=False) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def ndjson_rows(records: Iterable[Dict[str, Any]], fields: Optional[List[str]] = None) -> Iterator[bytes]:
+    """One JSON object per line: whole records, or their `fields` projection."""
+    for record in records:
+        yield orjson.dumps(project(record, fields) if fields else record) + b"\n"
+
+
+def csv_rows(records: Iterable[Dict[str, Any]], fields: Optional[List[str]] = None) -> Iterator[bytes]:
+    """A header row, then one row per record; dotted fields read nested values, lists are joined with '; '."""
+    columns = fields or CSV_COLUMNS
+    getters = [_getter(column) for column in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow([_cell(get(record)) for get in getters])
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def chunked(rows: Iterable[bytes], size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Join small rows into chunks of about `size` bytes."""
+    parts = []
+    length = 0
+    for row in rows:
+        parts.append(row)
+        length += len(row)
+        if length >= size:
+            yield b"".join(parts)
+            parts = []
+            length = 0
+    if parts:
+        yield b"".join(parts)
+
+
+def gzipped(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into one gzip member as it is produced."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,128 @@
+import base64
+import bisect
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def split_csv(value: Optional[str]) -> Optional[List[str]]:
+    """'a, b,c' -> ['a', 'b', 'c']; None/'' -> None."""
+    if not value:
+        return None
+    return [part.strip() for part in value.split(",")]
+
+
+@dataclass
+class NewsFilter:
+    """The structured filters accepted by `GET /news`."""
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    provinces: Optional[List[str]] = None
+    topics: Optional[List[str]] = None
+    min_sentiment: Optional[int] = None
+    max_sentiment: Optional[int] = None
+    virality: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return (not self.start_date and not self.end_date and not self.provinces and not self.topics
+                and self.min_sentiment is None and self.max_sentiment is None and not self.virality)
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        """Evaluate every filter against one record in a single pass."""
+        if self.start_date and item["published_at"] < self.start_date:
+            return False
+        if self.end_date and item["published_at"] > self.end_date:
+            return False
+        if self.provinces and item.get("province") not in self.provinces:
+            return False
+        analysis = item["analysis"]
+        if self.topics:
+            item_topics = analysis.get("topics", [])
+            if not any(t in item_topics for t in self.topics):
+                return False
+        if self.min_sentiment is not None or self.max_sentiment is not None:
+            sentiment = analysis.get("sentiment_score", 50)
+            if self.min_sentiment is not None and sentiment < self.min_sentiment:
+                return False
+            if self.max_sentiment is not None and sentiment > self.max_sentiment:
+                return False
+        if self.virality and analysis.get("virality_score", "").lower() != self.virality.lower():
+            return False
+        return True
+
+
+# Keyset pagination position: (published_at, id) of the last record on a page
+PageKey = Tuple[str, int]
+
+
+def page_key(record: Dict[str, Any]) -> PageKey:
+    return record.get("published_at") or "", record["id"]
+
+
+def encode_cursor(key: PageKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """Inverse of `encode_cursor`; raises ValueError for anything else."""
+    try:
+        published_at, news_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (TypeError, ValueError) as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(published_at, str) or not isinstance(news_id, int):
+        raise ValueError("invalid cursor")
+    return published_at, news_id
+
+
+def project(record: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """
+    Copy of `record` with only `fields`: top-level keys or dotted paths into
+    nested objects ("analysis.topics" -> {"analysis": {"topics": [...]}}).
+    Missing fields are left out.
+    """
+    result: Dict[str, Any] = {}
+    for field in fields:
+        source, target = record, result
+        *parents, leaf = field.split(".")
+        for name in parents:
+            source = source.get(name)
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(name, {})
+        else:
+            if leaf in source:
+                target[leaf] = source[leaf]
+    return result
+
+
+class PublishedOrder:
+    """
+    Derived index for keyset pagination: (published_at, id) of every record,
+    kept sorted so a page after any cursor is found by bisection.
+    """
+
+    def __init__(self):
+        self._keys: List[PageKey] = []
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        self._keys = sorted(page_key(record) for record in records)
+
+    def add(self, record: Dict[str, Any]):
+        bisect.insort(self._keys, page_key(record))
+
+    def remove(self, record: Dict[str, Any]):
+        key = page_key(record)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def update(self, old: Dict[str, Any], new: Dict[str, Any]):
+        if page_key(old) != page_key(new):
+            self.remove(old)
+            self.add(new)
+
+    def descending(self, after: Optional[PageKey] = None) -> Iterator[PageKey]:
+        """Keys newest first, starting just past `after` (from the newest if None)."""
+        end = len(self._keys) if after is None else bisect.bisect_left(self._keys, after)
+        keys = self._keys
+        return (keys[i] for i in range(end - 1, -1, -1))
@@ -0,0 +1,267 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+from app.core.config import NEWS_JOURNAL_COMPACT_MIN_OPS
+from app.services.news_query import NewsFilter, PageKey, PublishedOrder, page_key
+from app.services.news_storage import create_storage
+
+
+class NewsRepository:
+    """
+    Process-wide, in-memory view of the news dataset.
+
+    The dataset is loaded once and kept in memory. Every read checks the
+    storage signature (mtime/size of the underlying files) and only reloads
+    when something changed on disk; writes that go through the repository
+    update the cache and the signature directly, so they never trigger a
+    reload.
+
+    Writes are appended to the storage journal and serialized by a single
+    lock, so concurrent uploads/deletes cannot lose each other's changes. Ids
+    come from a monotonic counter and are never reused.
+
+    Derived indexes (see `add_index`) are rebuilt on load and kept up to date
+    incrementally on every insert/delete.
+
+    The storage engine is pluggable (see `create_storage`): engines that
+    implement `query_ids()` get the `/news` filters pushed down to them,
+    the others are filtered in memory.
+
+    Records returned by the read methods are shared with the cache and must
+    be treated as read-only by callers.
+    """
+
+    def __init__(self, storage=None, compact_min_ops: int = NEWS_JOURNAL_COMPACT_MIN_OPS):
+        self.storage = storage or create_storage()
+        self.compact_min_ops = compact_min_ops
+        self._lock = threading.RLock()
+        # Insertion ordered: oldest first, so inserts append and deletes pop in O(1).
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._newest_first: Optional[List[Dict[str, Any]]] = None
+        self._next_id = 1
+        self._signature = None
+        self._loaded = False
+        # (published_at, id) order for keyset pages; read and written under the lock
+        self._published = PublishedOrder()
+        self._indexes = [self._published]
+
+    def add_index(self, index):
+        """
+        Register a derived index. It must implement `rebuild(records)`,
+        `add(record)` and `remove(record)`, and may implement
+        `update(old, new)` (default: remove + add); all are called with the
+        repository lock held.
+        """
+        with self._lock:
+            self._indexes.append(index)
+            if self._loaded:
+                index.rebuild(self._by_id.values())
+
+    def _refresh(self):
+        signature = self.storage.signature()
+        if self._loaded and signature == self._signature:
+            return
+        with self._lock:
+            signature = self.storage.signature()
+            if self._loaded and signature == self._signature:
+                return
+            self._by_id, self._next_id = self.storage.load()
+            self._newest_first = None
+            for index in self._indexes:
+                index.rebuild(self._by_id.values())
+            self._signature = signature
+            self._loaded = True
+
+    def _after_write(self):
+        self._newest_first = None
+        if self.storage.journal_ops >= max(self.compact_min_ops, len(self._by_id) // 2):
+            self.storage.compact(list(reversed(self._by_id.values())), self._next_id)
+        self._signature = self.storage.signature()
+
+    def refresh(self):
+        """Reload from storage if it changed on disk (the indexes follow)."""
+        self._refresh()
+
+    @contextmanager
+    def consistent_view(self):
+        """Hold off writers while reading the records and the derived indexes together."""
+        with self._lock:
+            self._refresh()
+            yield self.all()
+
+    def invalidate(self):
+        """Drop the cached copy so the next read reloads from storage."""
+        with self._lock:
+            self._loaded = False
+            self._signature = None
+
+    def all(self) -> List[Dict[str, Any]]:
+        """All records, newest first (read-only)."""
+        self._refresh()
+        records = self._newest_first
+        if records is None:
+            with self._lock:
+                records = self._newest_first
+                if records is None:
+                    records = self._newest_first = list(reversed(self._by_id.values()))
+        return records
+
+    def get(self, news_id: int) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        return self._by_id.get(news_id)
+
+    def peek(self, news_id: int) -> Optional[Dict[str, Any]]:
+        """
+        get() without checking storage for changes. For use inside
+        consistent_view() (already refreshed), e.g. from a callback that runs
+        with an index lock held, where a reload would rebuild that index.
+        """
+        return self._by_id.get(news_id)
+
+    def count(self) -> int:
+        self._refresh()
+        return len(self._by_id)
+
+    def query(self, filters: NewsFilter, limit: int, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of matching records (newest first) and the total match count."""
+        self._refresh()
+        if hasattr(self.storage, "query_ids"):
+            ids, filtered = self.storage.query_ids(filters, limit, offset)
+            return [self._by_id[i] for i in ids if i in self._by_id], filtered
+
+        records = self.all()
+        if filters.is_empty():
+            return records[offset:offset + limit], len(records)
+        page = []
+        filtered = 0
+        end = offset + limit
+        for item in records:
+            if filters.matches(item):
+                if offset <= filtered < end:
+                    page.append(item)
+                filtered += 1
+        return page, filtered
+
+    def query_page(self, filters: NewsFilter, limit: int,
+                   after: Optional[PageKey] = None) -> Tuple[List[Dict[str, Any]], int, Optional[PageKey]]:
+        """
+        Keyset pagination: up to `limit` matching records ordered by
+        (published_at, id) descending, starting after the `after` key.
+        Returns (page, total match count, key to pass as `after` for the
+        next page or None on the last page).
+        """
+        return self._page_after(filters, limit, after, count=True)
+
+    def iter_query(self, filters: NewsFilter, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Every matching record, ordered like `query_page`, fetched `batch_size`
+        at a time so the lock is never held while the caller consumes them.
+        Records written meanwhile may or may not be included; none is
+        returned twice.
+        """
+        after = None
+        while True:
+            page, _, after = self._page_after(filters, batch_size, after, count=False)
+            yield from page
+            if after is None:
+                return
+
+    def _page_after(self, filters: NewsFilter, limit: int, after: Optional[PageKey],
+                    count: bool) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[PageKey]]:
+        self._refresh()
+        filtered = None
+        if hasattr(self.storage, "query_ids_after"):
+            ids, filtered = self.storage.query_ids_after(filters, limit + 1, after, count=count)
+            page = [self._by_id[i] for i in ids if i in self._by_id]
+        else:
+            page = []
+            check = not filters.is_empty()
+            with self._lock:
+                for _, news_id in self._published.descending(after):
+                    record = self._by_id[news_id]
+                    if check and not filters.matches(record):
+                        continue
+                    page.append(record)
+                    if len(page) > limit:
+                        break
+                if count:
+                    filtered = sum(1 for r in self._by_id.values() if filters.matches(r)) if check \
+                        else len(self._by_id)
+        if len(page) > limit:
+            return page[:limit], filtered, page_key(page[limit - 1]) if limit else None
+        return page, filtered, None
+
+    def insert(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Assign the next id to `record`, append it to the journal and cache it."""
+        with self._lock:
+            self._refresh()
+            record["id"] = self._next_id
+            self.storage.append_insert(record)
+            self._next_id += 1
+            self._by_id[record["id"]] = record
+            for index in self._indexes:
+                index.add(record)
+            self._after_write()
+            return record
+
+    def insert_many(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert several records in one storage write; the last one ends up newest."""
+        with self._lock:
+            self._refresh()
+            for record in records:
+                record["id"] = self._next_id
+                self._next_id += 1
+            self.storage.insert_many(records)
+            for record in records:
+                self._by_id[record["id"]] = record
+                for index in self._indexes:
+                    index.add(record)
+            self._after_write()
+            return records
+
+    def update(self, record: Dict[str, Any]) -> bool:
+        """
+        Replace the record with `record["id"]`, keeping its position. Pass a new
+        dict: records handed out by reads are shared and must not be mutated.
+        Returns False if the record no longer exists.
+        """
+        with self._lock:
+            self._refresh()
+            old = self._by_id.get(record["id"])
+            if old is None:
+                return False
+            self.storage.append_update(record)
+            self._by_id[record["id"]] = record
+            for index in self._indexes:
+                if hasattr(index, "update"):
+                    index.update(old, record)
+                else:
+                    index.remove(old)
+                    index.add(record)
+            self._after_write()
+            return True
+
+    def delete(self, news_id: int) -> bool:
+        """Remove a record by id. Returns False if it does not exist."""
+        with self._lock:
+            self._refresh()
+            if news_id not in self._by_id:
+                return False
+            self.storage.append_delete(news_id)
+            record = self._by_id.pop(news_id)
+            for index in self._indexes:
+                index.remove(record)
+            self._after_write()
+            return True
+
+    def compact(self):
+        """Fold the journal into the snapshot now (e.g. on shutdown)."""
+        with self._lock:
+            self._refresh()
+            if self.storage.journal_ops:
+                self.storage.compact(self.all(), self._next_id)
+                self._signature = self.storage.signature()
+
+
+news_repository = NewsRepository()
@@ -0,0 +1,219 @@
+import heapq
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from app.services.news_query import NewsFilter
+from app.services.news_repository import news_repository
+from app.services.text_tokenizer import tokenize_positions
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Position gap between title, content and summary, so phrases never span two fields
+FIELD_GAP = 100
+
+
+def searchable_fields(record: Dict[str, Any]) -> Tuple[str, str, str]:
+    """(title, content, analysis.summary) of a record."""
+    analysis = record.get("analysis") or {}
+    return record.get("title") or "", record.get("content") or "", analysis.get("summary") or ""
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[Tuple[int, str]]]]:
+    """
+    'banjir "jawa barat"' -> (["banjir"], [[(0, "jawa"), (1, "barat")]]).
+    Text between double quotes is a phrase; an unterminated quote runs to the end.
+    """
+    terms = []
+    phrases = []
+    for i, part in enumerate(query.split('"')):
+        tokens = tokenize_positions(part)
+        if i % 2 == 0:
+            terms.extend(term for _, term in tokens)
+        elif len(tokens) > 1:
+            phrases.append(tokens)
+        elif tokens:
+            phrases.append([(0, tokens[0][1])])
+    return terms, phrases
+
+
+class NewsSearchIndex:
+    """
+    Positional inverted index over news title, content and summary for the
+    `q=` parameter of GET /news, maintained alongside the news repository.
+
+    term -> {id: [positions]} postings are updated on every insert/delete,
+    so searching never rescans the archive. Results are ranked with BM25;
+    quoted phrases must appear as consecutive words (stopwords in between
+    count as words, so "banjir di bandung" does not match "banjir bandung").
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, Tuple[int, ...]]] = {}
+        # id -> (insertion seq, token count, distinct terms)
+        self._docs: Dict[int, Tuple[int, int, Tuple[str, ...]]] = {}
+        self._lengths: Dict[int, int] = {}  # id -> token count, for scoring
+        self._total_len = 0
+        self._seq = 0
+
+    def _add(self, record: Dict[str, Any], seq: int = None):
+        news_id = record["id"]
+        positions: Dict[str, List[int]] = defaultdict(list)
+        base = 0
+        length = 0
+        for text in searchable_fields(record):
+            tokens = tokenize_positions(text)
+            for position, term in tokens:
+                positions[term].append(base + position)
+            length += len(tokens)
+            if tokens:
+                base += tokens[-1][0] + 1 + FIELD_GAP
+        for term, term_positions in positions.items():
+            # Tuples of ints drop out of garbage-collector tracking; lists would be rescanned forever
+            self._postings.setdefault(term, {})[news_id] = tuple(term_positions)
+        if seq is None:
+            self._seq += 1
+            seq = self._seq
+        self._docs[news_id] = (seq, length, tuple(positions))
+        self._lengths[news_id] = length
+        self._total_len += length
+
+    def _remove(self, news_id: int):
+        doc = self._docs.pop(news_id, None)
+        if doc is None:
+            return None
+        seq, length, terms = doc
+        del self._lengths[news_id]
+        self._total_len -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[news_id]
+            if not postings:
+                del self._postings[term]
+        return seq
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._lengths.clear()
+            self._total_len = 0
+            self._seq = 0
+            for record in records:
+                self._add(record)
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self._add(record)
+
+    def update(self, old: Dict[str, Any], new: Dict[str, Any]):
+        # Most edits (e.g. weather enrichment) leave the searchable text alone
+        if searchable_fields(old) == searchable_fields(new) and old["id"] in self._docs:
+            return
+        with self._lock:
+            seq = self._remove(old["id"])
+            self._add(new, seq)
+
+    def remove(self, record: Dict[str, Any]):
+        with self._lock:
+            self._remove(record["id"])
+
+    def _phrase_ids(self, phrase: List[Tuple[int, str]]) -> set:
+        postings = [self._postings.get(term) for _, term in phrase]
+        if not all(postings):
+            return set()
+        # Walk the rarest term's records, check the others at the same relative offsets
+        order = sorted(range(len(phrase)), key=lambda i: len(postings[i]))
+        matched = set()
+        for news_id in postings[order[0]]:
+            if not all(news_id in postings[i] for i in order[1:]):
+                continue
+            first = phrase[0][0]
+            offsets = [(phrase[i][0] - first, set(postings[i][news_id])) for i in range(1, len(phrase))]
+            if any(all(start + offset in positions for offset, positions in offsets)
+                   for start in postings[0][news_id]):
+                matched.add(news_id)
+        return matched
+
+    def search(self, query: str, top: int = None,
+               predicate: Callable[[int], bool] = None) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Records matching `query` (and `predicate(id)`, if given): returns the
+        best `top` (all if None) as [(id, BM25 score), ...], best first and
+        newest first within a score, plus the number of matches.
+        A record matches if it contains every quoted phrase and, if the query
+        has unquoted words, at least one of them.
+        """
+        terms, phrases = parse_query(query)
+        terms = set(terms)
+        if not terms and not phrases:
+            return [], 0
+        with self._lock:
+            n = len(self._docs)
+            if not n:
+                return [], 0
+            required = None
+            for phrase in phrases:
+                ids = self._phrase_ids(phrase)
+                required = ids if required is None else required & ids
+                if not required:
+                    return [], 0
+
+            k_base = K1 * (1 - B)
+            k_len = K1 * B / (self._total_len / n or 1)
+            lengths = self._lengths
+            scores: Dict[int, float] = {}
+            # Unquoted words decide which records match (unless there are phrases
+            # to restrict them); phrase words only add to the score.
+            for term in terms.union(term for phrase in phrases for _, term in phrase):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                if term in terms and required is None:
+                    items = postings.items()
+                else:
+                    items = ((i, postings[i]) for i in (required if required is not None else scores)
+                             if i in postings)
+                for news_id, positions in items:
+                    tf = len(positions)
+                    scores[news_id] = scores.get(news_id, 0.0) + \
+                        idf * tf * (K1 + 1) / (tf + k_base + k_len * lengths[news_id])
+            if required is not None:
+                if terms:
+                    with_term = set().union(*(self._postings.get(term, ()) for term in terms))
+                    required &= with_term
+                scores = {news_id: scores.get(news_id, 0.0) for news_id in required}
+            if predicate is not None:
+                scores = {news_id: score for news_id, score in scores.items() if predicate(news_id)}
+
+            docs = self._docs
+            key = lambda kv: (kv[1], docs[kv[0]][0])  # noqa: E731
+            if top is None:
+                return sorted(scores.items(), key=key, reverse=True), len(scores)
+            return heapq.nlargest(top, scores.items(), key=key), len(scores)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"documents": len(self._docs), "terms": len(self._postings)}
+
+
+news_search_index = NewsSearchIndex()
+news_repository.add_index(news_search_index)
+
+
+def search_news(query: str, filters: NewsFilter, limit: int,
+                offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """One page of records matching `query` and `filters` (best match first) and the total match count."""
+    # consistent_view() refreshes once up front; the predicate runs under the index lock, so it must not
+    # trigger a reload (which would rebuild this index)
+    with news_repository.consistent_view():
+        predicate = None
+        if not filters.is_empty():
+            predicate = lambda news_id: filters.matches(news_repository.peek(news_id))  # noqa: E731
+        ranked, filtered = news_search_index.search(query, top=offset + limit, predicate=predicate)
+        return [news_repository.peek(news_id) for news_id, _ in ranked[offset:]], filtered
@@ -0,0 +1,201 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    create_engine, delete, event, exists, func, insert, select, tuple_, update,
+)
+
+from app.core.config import NEWS_DB_PATH
+from app.services.news_query import NewsFilter
+
+metadata = MetaData()
+
+# `seq` preserves insertion order (the dataset is listed newest-inserted first),
+# `id` is the public news id.
+news_table = Table(
+    "news", metadata,
+    Column("seq", Integer, primary_key=True, autoincrement=True),
+    Column("id", Integer, nullable=False, unique=True),
+    Column("published_at", String, nullable=False, default=""),
+    Column("province", String),
+    Column("sentiment_score", Float, nullable=False, default=50),
+    Column("virality_score", String, nullable=False, default=""),  # lower-cased
+    Column("payload", Text, nullable=False),
+    Index("ix_news_published_at", "published_at"),
+    Index("ix_news_published_at_id", "published_at", "id"),  # keyset pagination
+    Index("ix_news_province", "province"),
+    Index("ix_news_sentiment_score", "sentiment_score"),
+    Index("ix_news_virality_score", "virality_score"),
+)
+
+news_topics_table = Table(
+    "news_topics", metadata,
+    Column("news_id", Integer, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True),
+    Column("topic", String, primary_key=True),
+    Index("ix_news_topics_topic", "topic", "news_id"),
+)
+
+meta_table = Table(
+    "storage_meta", metadata,
+    Column("key", String, primary_key=True),
+    Column("value", String, nullable=False),
+)
+
+
+def _row_for(record: Dict[str, Any]) -> Dict[str, Any]:
+    analysis = record.get("analysis") or {}
+    return {
+        "id": record["id"],
+        "published_at": record.get("published_at", ""),
+        "province": record.get("province"),
+        "sentiment_score": analysis.get("sentiment_score", 50),
+        "virality_score": (analysis.get("virality_score") or "").lower(),
+        "payload": json.dumps(record, ensure_ascii=False),
+    }
+
+
+def _topic_rows(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    topics = (record.get("analysis") or {}).get("topics") or []
+    return [{"news_id": record["id"], "topic": t} for t in dict.fromkeys(topics)]
+
+
+class SqliteStorage:
+    """
+    News storage engine backed by a local SQLite database.
+
+    Records are stored whole (as JSON) next to indexed columns for the `/news`
+    filters and a `news_topics` join table, so `query_ids()` can run the
+    filters, ordering and LIMIT/OFFSET in SQL. Implements the same interface
+    as `JournalStorage`; every write is its own transaction, so there is
+    nothing to compact.
+    """
+
+    journal_ops = 0
+
+    def __init__(self, db_path: str = NEWS_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+        event.listen(self.engine, "connect", self._on_connect)
+        metadata.create_all(self.engine)
+        # create_all skips existing tables; add indexes introduced since the database was created
+        for index in news_table.indexes:
+            index.create(self.engine, checkfirst=True)
+
+    @staticmethod
+    def _on_connect(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    def signature(self):
+        stats = []
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def load(self) -> Tuple[Dict[int, Dict[str, Any]], int]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(news_table.c.id, news_table.c.payload).order_by(news_table.c.seq))
+            records = {row.id: json.loads(row.payload) for row in rows}
+            stored = conn.execute(select(meta_table.c.value).where(meta_table.c.key == "next_id")).scalar()
+        next_id = int(stored) if stored else 1
+        if records:
+            next_id = max(next_id, max(records) + 1)
+        return records, next_id
+
+    def _write_next_id(self, conn, next_id: int):
+        conn.execute(delete(meta_table).where(meta_table.c.key == "next_id"))
+        conn.execute(insert(meta_table).values(key="next_id", value=str(next_id)))
+
+    def insert_many(self, records: Iterable[Dict[str, Any]]):
+        """Insert records in the given order (oldest first) in one transaction."""
+        records = list(records)
+        if not records:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(insert(news_table), [_row_for(r) for r in records])
+            topic_rows = [row for r in records for row in _topic_rows(r)]
+            if topic_rows:
+                conn.execute(insert(news_topics_table), topic_rows)
+            self._write_next_id(conn, max(r["id"] for r in records) + 1)
+
+    def append_insert(self, record: Dict[str, Any]):
+        self.insert_many([record])
+
+    def append_update(self, record: Dict[str, Any]):
+        """Replace a stored record (same id, same position)."""
+        row = _row_for(record)
+        with self.engine.begin() as conn:
+            conn.execute(update(news_table).where(news_table.c.id == record["id"]).values(**row))
+            conn.execute(delete(news_topics_table).where(news_topics_table.c.news_id == record["id"]))
+            topic_rows = _topic_rows(record)
+            if topic_rows:
+                conn.execute(insert(news_topics_table), topic_rows)
+
+    def append_delete(self, news_id: int):
+        with self.engine.begin() as conn:
+            conn.execute(delete(news_topics_table).where(news_topics_table.c.news_id == news_id))
+            conn.execute(delete(news_table).where(news_table.c.id == news_id))
+
+    def compact(self, records_newest_first: List[Dict[str, Any]], next_id: int):
+        with self.engine.begin() as conn:
+            self._write_next_id(conn, next_id)
+
+    @staticmethod
+    def _conditions(filters: NewsFilter) -> list:
+        n = news_table.c
+        conditions = []
+        if filters.start_date:
+            conditions.append(n.published_at >= filters.start_date)
+        if filters.end_date:
+            conditions.append(n.published_at <= filters.end_date)
+        if filters.provinces:
+            conditions.append(n.province.in_(filters.provinces))
+        if filters.topics:
+            t = news_topics_table.c
+            conditions.append(exists().where(t.news_id == n.id, t.topic.in_(filters.topics)))
+        if filters.min_sentiment is not None:
+            conditions.append(n.sentiment_score >= filters.min_sentiment)
+        if filters.max_sentiment is not None:
+            conditions.append(n.sentiment_score <= filters.max_sentiment)
+        if filters.virality:
+            conditions.append(n.virality_score == filters.virality.lower())
+        return conditions
+
+    def _page(self, page, conditions, count: bool = True) -> Tuple[List[int], Optional[int]]:
+        with self.engine.connect() as conn:
+            ids = [row.id for row in conn.execute(page)]
+            total = None
+            if count:
+                total = conn.execute(select(func.count()).select_from(news_table).where(*conditions)).scalar()
+        return ids, total
+
+    def query_ids(self, filters: NewsFilter, limit: int, offset: int = 0) -> Tuple[List[int], int]:
+        """Run the `/news` filters as one indexed query; returns (page ids, filtered count)."""
+        conditions = self._conditions(filters)
+        page = select(news_table.c.id).where(*conditions).order_by(news_table.c.seq.desc()).limit(limit).offset(offset)
+        return self._page(page, conditions)
+
+    def query_ids_after(self, filters: NewsFilter, limit: int,
+                        after: Optional[Tuple[str, int]] = None,
+                        count: bool = True) -> Tuple[List[int], Optional[int]]:
+        """
+        Keyset variant of `query_ids`: ordered by (published_at, id) descending,
+        after the `after` key. The filtered count is None unless `count`.
+        """
+        n = news_table.c
+        conditions = self._conditions(filters)
+        page = select(n.id).where(*conditions)
+        if after is not None:
+            page = page.where(tuple_(n.published_at, n.id) < tuple_(*after))
+        page = page.order_by(n.published_at.desc(), n.id.desc()).limit(limit)
+        return self._page(page, conditions, count)
@@ -0,0 +1,147 @@
+import json
+import os
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.core.config import NEWS_DATA_PATH, NEWS_JOURNAL_PATH, NEWS_STATE_PATH, NEWS_STORAGE
+
+
+class JournalStorage:
+    """
+    Snapshot + append-only journal storage for news records.
+
+    The snapshot is the familiar `dummy_dataset.json` (newest first). Every
+    write after that is one JSON line appended to the journal:
+
+        {"op": "insert", "record": {...}}
+        {"op": "update", "record": {...}}
+        {"op": "delete", "id": 42}
+
+    so a write costs O(1) regardless of archive size. `compact()` folds the
+    journal back into the snapshot and truncates it; the repository calls it
+    once the journal has grown proportionally to the snapshot, which keeps the
+    amortized cost per write constant.
+    """
+
+    def __init__(self, snapshot_path: str = NEWS_DATA_PATH, journal_path: str = NEWS_JOURNAL_PATH,
+                 state_path: str = NEWS_STATE_PATH):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.state_path = state_path
+        self.journal_ops = 0
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def signature(self):
+        """Changes whenever the snapshot or the journal changes on disk."""
+        return (self._stat(self.snapshot_path), self._stat(self.journal_path))
+
+    def load(self) -> Tuple[Dict[int, Dict[str, Any]], int]:
+        """Return records keyed by id (oldest first) and the next id to assign."""
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            snapshot = []
+
+        records = {item["id"]: item for item in reversed(snapshot)}
+        next_id = self._read_state().get("next_id", 1)
+
+        self.journal_ops = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append; everything before it is intact.
+                        print(f"Skipping corrupt journal line in {self.journal_path}")
+                        continue
+                    if entry["op"] == "insert":
+                        records[entry["record"]["id"]] = entry["record"]
+                    elif entry["op"] == "update":
+                        # Replaced in place: the record keeps its position
+                        if entry["record"]["id"] in records:
+                            records[entry["record"]["id"]] = entry["record"]
+                    elif entry["op"] == "delete":
+                        records.pop(entry["id"], None)
+                    self.journal_ops += 1
+        except FileNotFoundError:
+            pass
+
+        if records:
+            next_id = max(next_id, max(records) + 1)
+        return records, next_id
+
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _append(self, entry: Dict[str, Any]):
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_ops += 1
+
+    def append_insert(self, record: Dict[str, Any]):
+        self._append({"op": "insert", "record": record})
+
+    def insert_many(self, records: List[Dict[str, Any]]):
+        """Append several inserts (oldest first) with a single write + fsync."""
+        if not records:
+            return
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        payload = "".join(json.dumps({"op": "insert", "record": r}, ensure_ascii=False) + "\n" for r in records)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_ops += len(records)
+
+    def append_update(self, record: Dict[str, Any]):
+        self._append({"op": "update", "record": record})
+
+    def append_delete(self, news_id: int):
+        self._append({"op": "delete", "id": news_id})
+
+    def compact(self, records_newest_first: List[Dict[str, Any]], next_id: int):
+        """Write a fresh snapshot and truncate the journal."""
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        self._write_atomic(self.state_path, {"next_id": next_id}, indent=None)
+        self._write_atomic(self.snapshot_path, records_newest_first, indent=2)
+        # Only drop the journal once the snapshot that contains it is in place.
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self.journal_ops = 0
+
+    @staticmethod
+    def _write_atomic(path: str, payload: Any, indent: Optional[int]):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+def create_storage(engine: str = NEWS_STORAGE):
+    """Build the storage engine selected by the NEWS_STORAGE setting."""
+    if engine == "json":
+        return JournalStorage()
+    if engine == "sqlite":
+        from app.services.news_sqlite_storage import SqliteStorage
+        return SqliteStorage()
+    raise ValueError(f"Unknown NEWS_STORAGE engine: {engine!r} (expected 'json' or 'sqlite')")
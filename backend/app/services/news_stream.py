@@ -0,0 +1,211 @@
+import asyncio
+import collections
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+
+from app.core.config import STREAM_CLIENT_QUEUE_SIZE, STREAM_MAX_CLIENTS, STREAM_REPLAY_EVENTS
+from app.services.news_aggregates import is_pending, is_risk_alert
+from app.services.news_repository import news_repository
+from app.services.timeline_index import parse_published_at
+
+
+def _frame(event_id: int, event: str, data: Dict[str, Any]) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+def _summary(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The record as sent to clients: everything but the (long) content"""
+    return {key: value for key, value in record.items() if key != "content"}
+
+
+def stats_delta(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Change to the dashboard aggregates when `old` is replaced by `new`
+    (either may be None): total and risk-alert counts, topic and province
+    counts, and the day buckets of `/analytics/timeline`. Records pending
+    analysis count nowhere, like in `news_aggregates` and `timeline_index`.
+    Counts that don't change are left out.
+    """
+    totals = Counter()
+    topics = Counter()
+    provinces = Counter()
+    days: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"total": 0, "topics": Counter()})
+    for record, sign in ((old, -1), (new, 1)):
+        if record is None or is_pending(record):
+            continue
+        analysis = record.get("analysis") or {}
+        record_topics = analysis.get("topics", [])
+        totals["total_news"] += sign
+        if is_risk_alert(analysis):
+            totals["risk_alerts"] += sign
+        for topic in record_topics:
+            topics[topic] += sign
+        provinces[record.get("province", "Unknown")] += sign
+        ts = parse_published_at(record.get("published_at"))
+        if ts is not None:
+            bucket = days[ts.date().isoformat()]
+            bucket["total"] += sign
+            for topic in dict.fromkeys(record_topics):
+                bucket["topics"][topic] += sign
+
+    def changed(counts: Counter) -> Dict[str, int]:
+        return {key: value for key, value in counts.items() if value}
+
+    timeline = []
+    for day, bucket in sorted(days.items()):
+        bucket_topics = changed(bucket["topics"])
+        if bucket["total"] or bucket_topics:
+            timeline.append({"date": day, "total": bucket["total"], "topics": bucket_topics})
+    return {
+        "total_news": totals["total_news"],
+        "risk_alerts": totals["risk_alerts"],
+        "topics": changed(topics),
+        "provinces": changed(provinces),
+        "timeline": timeline,
+    }
+
+
+class StreamClient:
+    """One subscriber: a bounded queue of (event id, SSE frame)."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(maxsize, 1))
+        self.last_id = 0
+        self.resyncs = 0
+        self.ready_frame = ""
+
+    def offer(self, event_id: int, frame: str):
+        """Queue a frame; a client that fell `maxsize` events behind gets one "resync" event instead."""
+        try:
+            self.queue.put_nowait((event_id, frame))
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((event_id, _frame(event_id, "resync", {"reason": "client too slow"})))
+            self.resyncs += 1
+
+    async def next_frame(self) -> str:
+        """Next frame not sent yet (replayed and live events can overlap)"""
+        while True:
+            event_id, frame = await self.queue.get()
+            if event_id > self.last_id:
+                self.last_id = event_id
+                return frame
+
+
+class NewsStream:
+    """
+    Broadcasts news writes to `GET /stream` clients as server-sent events.
+
+    Registered as a repository index, so every insert, update and delete
+    publishes one event ("news.created", "news.updated", "news.deleted")
+    carrying the record (without its content) or id and the matching
+    `stats_delta`. A reload from storage (e.g. another process wrote)
+    publishes "resync": clients should re-read the REST endpoints.
+
+    Each event is serialized once and fanned out on the event loop to
+    per-client bounded queues. A client that falls STREAM_CLIENT_QUEUE_SIZE
+    events behind gets a single "resync" instead of its backlog, so a slow
+    client never holds memory or slows the writers. The last
+    STREAM_REPLAY_EVENTS events are kept so reconnecting clients resume from
+    their Last-Event-ID. Events cover the writes made by this process.
+    """
+
+    def __init__(self, client_queue_size: int = STREAM_CLIENT_QUEUE_SIZE, replay_events: int = STREAM_REPLAY_EVENTS,
+                 max_clients: int = STREAM_MAX_CLIENTS):
+        self.client_queue_size = client_queue_size
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._clients = set()
+        self._recent = collections.deque(maxlen=max(replay_events, 1))
+        # Ids start from the startup time in ms, so they keep increasing across restarts
+        self._last_id = int(time.time() * 1000)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+
+    @property
+    def last_event_id(self) -> int:
+        return self._last_id
+
+    def _publish(self, event: str, data: Dict[str, Any]):
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            frame = _frame(event_id, event, data)
+            self._recent.append((event_id, frame))
+            self.published += 1
+            loop = self._loop if self._clients else None
+        if loop is not None and not loop.is_closed():
+            # Writers run on worker threads; queues belong to the event loop
+            loop.call_soon_threadsafe(self._fanout, event_id, frame)
+
+    def _fanout(self, event_id: int, frame: str):
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.offer(event_id, frame)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Optional[StreamClient]:
+        """
+        A new client (None if STREAM_MAX_CLIENTS are connected). With
+        `last_event_id`, the events since then are replayed, or "resync" is
+        sent if they are no longer kept.
+        """
+        client = StreamClient(self.client_queue_size)
+        with self._lock:
+            if len(self._clients) >= self.max_clients:
+                return None
+            self._loop = asyncio.get_running_loop()
+            backlog = []
+            if last_event_id is not None and last_event_id != self._last_id:
+                backlog = [(event_id, frame) for event_id, frame in self._recent if event_id > last_event_id]
+                complete = (last_event_id < self._last_id and backlog and backlog[0][0] == last_event_id + 1
+                            and len(backlog) < self.client_queue_size)
+                if not complete:
+                    backlog = [(self._last_id, _frame(self._last_id, "resync", {"reason": "missed events"}))]
+            for item in backlog:
+                client.queue.put_nowait(item)
+            # Events published before this point reach the client only through the backlog
+            client.last_id = backlog[0][0] - 1 if backlog else self._last_id
+            ready = {"last_event_id": self._last_id}
+            self._clients.add(client)
+        client.ready_frame = f"retry: 3000\nevent: ready\ndata: {orjson.dumps(ready).decode()}\n\n"
+        return client
+
+    def unsubscribe(self, client: StreamClient):
+        with self._lock:
+            self._clients.discard(client)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "max_clients": self.max_clients,
+                "last_event_id": self._last_id,
+                "published": self.published,
+                "client_queue_size": self.client_queue_size,
+                "queued": sum(client.queue.qsize() for client in self._clients),
+                "resyncs": sum(client.resyncs for client in self._clients),
+            }
+
+    # Repository index hooks (called with the repository lock held)
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        self._publish("resync", {"reason": "reloaded"})
+
+    def add(self, record: Dict[str, Any]):
+        self._publish("news.created", {"record": _summary(record), "delta": stats_delta(None, record)})
+
+    def update(self, old: Dict[str, Any], new: Dict[str, Any]):
+        self._publish("news.updated", {"record": _summary(new), "delta": stats_delta(old, new)})
+
+    def remove(self, record: Dict[str, Any]):
+        self._publish("news.deleted", {"id": record["id"], "delta": stats_delta(record, None)})
+
+
+news_stream = NewsStream()
+news_repository.add_index(news_stream)
@@ -0,0 +1,127 @@
+import hashlib
+import textwrap
+from typing import Dict, List
+
+# Analysis prompts, split so every request starts with the same bytes.
+#
+# The static segments (role, output schema, RPJMN Quick Wins, RPJMD zones,
+# instructions) are assembled once at import, in a fixed order, and always
+# sent first; the per-article parts (knowledge-base excerpts, then the
+# article) come last. Providers that cache prompt prefixes (OpenAI,
+# OpenRouter, Gemini implicit caching) can then reuse the static prefix
+# across requests. PROMPT_VERSION changes whenever a static segment does.
+
+ROLE = """
+You are an expert AI Editor for TVRI Index, Indonesia's national intelligence platform for news analysis aligned with RPJMN 2025-2029.
+
+IMPORTANT: ALL OUTPUT MUST BE IN INDONESIAN LANGUAGE ONLY. DO NOT USE ENGLISH.
+"""
+
+OPENAI_OUTPUT_SPEC = """
+Analyze the news text and return a JSON object with:
+- generated_title: A catchy, journalistic title (max 80 chars).
+- detected_province: The specific Indonesian province mentioned.
+- detected_island: The island region (Sumatera/Kalimantan/Sulawesi/Maluku/Jawa/Bali-Nusa Tenggara/Papua).
+- event_date: The specific date of the event mentioned in the news (format: YYYY-MM-DD). Extract from phrases like "Jumat (21/11)", "22 November 2025", etc. If no specific date, return empty string.
+- summary: A comprehensive summary capturing key points and implications.
+- bullet_points: List of 3-5 key takeaways (TL;DR) from the news. MUST BE IN INDONESIAN.
+- topics: List of topics (Pangan, Energi, Bencana Alam, Teknologi, Politik, Ekonomi, Kesehatan, Pendidikan, Infrastruktur, Pariwisata, Maritim, Sosial).
+- entities: List of key entities (Person, Org, Location) mentioned.
+- impact: Strategic impact analysis with reasoning.
+- sentiment_score: 0 to 100 (0=Very Negative, 50=Neutral, 100=Very Positive).
+- sentiment_reasoning: A brief, specific explanation (max 15 words) of WHY this score was assigned based on the text content. MUST BE IN INDONESIAN.
+- virality_score: High/Medium/Low prediction based on public interest.
+- strategic_recommendations: List of 3-5 actionable steps for government stakeholders.
+- rpjmn_alignment: Detailed alignment to RPJMN 2025-2029 programs.
+- quick_wins_mapping: Map to relevant Quick Wins programs (see below).
+- regional_development_zone: Map to RPJMD regional development priority. Format: "[Island Name]: [Specific connection to news content based on RPJMD description]". Example: "Sumatera: Berita ini mendukung hilirisasi sawit yang merupakan prioritas wilayah ini."
+"""
+
+GEMINI_OUTPUT_SPEC = """
+Analyze the news text given at the end and return a comprehensive JSON object.
+
+Required JSON Structure:
+{
+    "generated_title": "string (max 80 chars)",
+    "detected_province": "string (specific Indonesian province)",
+    "detected_island": "string (Sumatera/Kalimantan/Sulawesi/Maluku/Jawa/Bali-Nusa Tenggara/Papua)",
+    "event_date": "YYYY-MM-DD (extract specific date from news, e.g. 'Jumat (21/11)' = '2025-11-21', empty if no date)",
+    "summary": "string (comprehensive summary)",
+    "bullet_points": ["string (key takeaway 1)", "string (key takeaway 2)"],
+    "topics": ["string (Pangan, Energi, Bencana Alam, Teknologi, Politik, Ekonomi, Kesehatan, Pendidikan, Infrastruktur, Pariwisata, Maritim, Sosial)"],
+    "entities": ["string (Person, Org, Location)"],
+    "impact": "string (strategic impact analysis with reasoning)",
+    "sentiment_score": number (0 to 100),
+    "sentiment_reasoning": "string (brief explanation of WHY this sentiment score was assigned, max 15 words, MUST BE IN INDONESIAN)",
+    "virality_score": "High/Medium/Low",
+    "strategic_recommendations": ["string (3-5 actionable steps)"],
+    "rpjmn_alignment": [{"target": "string", "relevance": "string"}],
+    "quick_wins_mapping": ["string (map to relevant Quick Wins 1-8)"],
+    "regional_development_zone": "string (Format: '[Island Name]: [Specific connection to news content based on RPJMD description]')",
+}
+"""
+
+QUICK_WINS = """
+**RPJMN 2025-2029 QUICK WINS (8 Priority Programs):**
+1. **Makan Siang & Susu Gratis**: Memberi Makan Siang dan Susu Gratis di Sekolah dan Pesantren, serta Bantuan Gizi untuk Anak Balita dan Ibu Hamil.
+2. **Kesehatan Gratis**: Menyelenggarakan Pemeriksaan Kesehatan Gratis, Menuntaskan Kasus TBC, dan Membangun Rumah Sakit Lengkap Berfungsi di Kabupaten.
+3. **Produktivitas Lahan Pertanian**: Mencetak dan Meningkatkan Produktivitas Lahan Pertanian dengan Lumbung Pangan Desa, Daerah, dan Nasional.
+4. **Sekolah Unggulan Terintegrasi**: Membangun Sekolah-Sekolah Unggul Terintegrasi di Setiap Kabupaten, dan Memperbaiki Sekolah-Sekolah yang Perlu Renovasi.
+5. **Kartu Kesejahteraan Sosial**: Melanjutkan dan Menambahkan Program Kartu-Kartu Kesejahteraan Sosial serta Kartu Usaha untuk Meningkatkan Kesejahteraan Ekonomi Rakyat.
+6. **Realisasi Gaji ASN**: Menaikkan Gaji ASN (terutama Guru, Dosen, Tenaga Kesehatan), serta Penyuluh, TNI/POLRI, dan Pegawai Negara.
+7. **Infrastruktur Desa & BLT**: Menyediakan Infrastruktur Desa dan Kelurahan, Bantuan Langsung Tunai (BLT), dan Kebutuhan Hidup Dasar untuk Mengatasi Kemiskinan Ekstrem serta Memberikan Gizi untuk Generasi Milenial, Generasi Z, Generasi Alpha, dan Lansia.
+8. **Badan Penerimaan Negara**: Mendirikan Badan Penerimaan Negara dan Meningkatkan Penerimaan Negara terhadap Produk Domestik Bruto (PDB) ke 23%.
+"""
+
+RPJMD_ZONES = """
+**RPJMD REGIONAL DEVELOPMENT ZONES (7 Pulau):**
+1. **Sumatera**: Hilirisasi industri berbasis komoditas unggulan (karet, kopi, kelapa sawit, perikanan), pengembangan KSPP Sumatera Selatan, pariwisata DPP Danau Toba.
+2. **Kalimantan**: Pengembangan IKN sebagai episentrum ekonomi baru, hilirisasi hasil tambang dan kelapa sawit (Kalimantan Selatan).
+3. **Sulawesi**: Industri hilir berbasis SDA (tambang, mineral), KSPN Danau Tondano, DPP Wakatobi.
+4. **Maluku**: Hilirisasi industri perikanan (KIPI Pulau Obi, KIPI Waai), sektor maritim, pengembangan kota.
+5. **Jawa**: Hilirisasi industri, digitalisasi, green economy, pengembangan wilayah metropolitan.
+6. **Bali-Nusa Tenggara**: Hilirisasi pertanian & perikanan, pariwisata (DPP Labuan Bajo, DPP Likupang), konektivitas (Pelabuhan Sanqgar, Mataram, Labuan Bajo).
+7. **Papua**: Hilirisasi perikanan, pertanian, kehutanan, SDM & infrastruktur, KSPP Papua Selatan.
+"""
+
+INSTRUCTIONS = """
+**Analysis Instructions:**
+- Map the news to relevant Quick Wins programs (can be multiple)
+- Identify which regional development zone is impacted
+- Provide specific RPJMN alignment with clear relevance explanation
+- Consider island-specific priorities when making recommendations
+- Use the knowledge base context, when given, for accurate analysis
+"""
+
+
+def _assemble(*segments: str) -> str:
+    return "\n".join(textwrap.dedent(segment).strip() + "\n" for segment in segments)
+
+
+OPENAI_SYSTEM_PROMPT = _assemble(ROLE, OPENAI_OUTPUT_SPEC, QUICK_WINS, RPJMD_ZONES, INSTRUCTIONS,
+                                 "Return ONLY valid JSON.")
+GEMINI_PROMPT_PREFIX = _assemble(ROLE, GEMINI_OUTPUT_SPEC, QUICK_WINS, RPJMD_ZONES, INSTRUCTIONS,
+                                 "Return ONLY the JSON object, no markdown formatting.")
+
+PROMPT_VERSION = hashlib.sha256(
+    (OPENAI_SYSTEM_PROMPT + "\0" + GEMINI_PROMPT_PREFIX).encode("utf-8")
+).hexdigest()[:12]
+
+
+def _article_block(text: str, knowledge_context: str) -> str:
+    if knowledge_context:
+        return f"**KNOWLEDGE BASE CONTEXT:**\n{knowledge_context}\n\n**NEWS TEXT:**\n{text}"
+    return f"**NEWS TEXT:**\n{text}"
+
+
+def openai_messages(text: str, knowledge_context: str) -> List[Dict[str, str]]:
+    """Chat messages: the static system prompt, then knowledge-base excerpts and the article."""
+    return [
+        {"role": "system", "content": OPENAI_SYSTEM_PROMPT},
+        {"role": "user", "content": _article_block(text, knowledge_context)},
+    ]
+
+
+def gemini_prompt(text: str, knowledge_context: str) -> str:
+    """Single Gemini prompt: the static prefix, then knowledge-base excerpts and the article."""
+    return f"{GEMINI_PROMPT_PREFIX}\n{_article_block(text, knowledge_context)}"
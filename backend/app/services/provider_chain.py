@@ -0,0 +1,235 @@
+import asyncio
+import collections
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.services.rate_limiter import AsyncRateLimiter
+from app.core.config import (
+    LLM_BREAKER_COOLDOWN_SECONDS, LLM_BREAKER_FAILURES, LLM_HEDGE_MIN_SAMPLES, LLM_HEDGING, LLM_LATENCY_WINDOW,
+)
+
+# (provider, model)
+ProviderKey = Tuple[str, str]
+
+OUTCOMES = ("success", "error", "timeout", "cancelled", "skipped")
+
+
+class ProviderCall(NamedTuple):
+    """
+    One link of the chain: `call()` returns the analysis dict, or None if the
+    provider failed. A `limiter` token is taken before the call; waiting for
+    it counts toward neither the timeout nor the latency.
+    """
+    provider: str
+    model: str
+    call: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    timeout: float
+    limiter: Optional[AsyncRateLimiter] = None
+
+    @property
+    def key(self) -> ProviderKey:
+        return self.provider, self.model
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider that keeps failing: after `failures`
+    consecutive errors or timeouts the breaker opens and calls are skipped
+    for `cooldown` seconds. Then one trial call is let through (half-open);
+    it closes the breaker on success and re-opens it on failure.
+    """
+
+    def __init__(self, failures: int = LLM_BREAKER_FAILURES, cooldown: float = LLM_BREAKER_COOLDOWN_SECONDS):
+        self.failures = max(failures, 1)
+        self.cooldown = cooldown
+        self._consecutive = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._trial or time.monotonic() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+            return False
+        self._trial = True
+        return True
+
+    def record(self, outcome: str):
+        if outcome == "success":
+            self._consecutive = 0
+            self._opened_at = None
+        elif outcome in ("error", "timeout"):
+            self._consecutive += 1
+            if self._trial or self._consecutive >= self.failures:
+                self._opened_at = time.monotonic()
+        self._trial = False
+
+
+class ProviderChain:
+    """
+    Runs an analysis against an ordered list of providers and returns the
+    first valid result.
+
+    Each call is bounded by its own timeout. Providers are tried in order:
+    the next one starts when the current one fails, or, with `hedging`,
+    when it hasn't answered within its p95 latency (over the last
+    LLM_LATENCY_WINDOW successful calls, once there are
+    LLM_HEDGE_MIN_SAMPLES of them). The hedge timer starts when a provider
+    is launched, so a call still queued on its rate limiter is hedged too.
+    The first dict returned wins and the calls still running are cancelled.
+    Providers whose circuit breaker is open are skipped. Outcomes and
+    latencies are counted per provider/model for the lifetime of the process.
+    """
+
+    def __init__(self, hedging: bool = LLM_HEDGING, breaker_failures: int = LLM_BREAKER_FAILURES,
+                 breaker_cooldown: float = LLM_BREAKER_COOLDOWN_SECONDS):
+        self.hedging = hedging
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self._lock = threading.Lock()
+        self._breakers: Dict[ProviderKey, CircuitBreaker] = {}
+        self._counts: Dict[ProviderKey, Dict[str, int]] = {}
+        self._latencies: Dict[ProviderKey, collections.deque] = {}
+
+    def _breaker(self, key: ProviderKey) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(self.breaker_failures, self.breaker_cooldown)
+        return breaker
+
+    def _count(self, key: ProviderKey, name: str):
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = dict.fromkeys(("calls", *OUTCOMES, "hedged", "wins"), 0)
+            counts[name] += 1
+
+    def _record(self, key: ProviderKey, outcome: str, latency: Optional[float] = None):
+        self._breaker(key).record(outcome)
+        self._count(key, outcome)
+        if latency is not None:
+            with self._lock:
+                window = self._latencies.get(key)
+                if window is None:
+                    window = self._latencies[key] = collections.deque(maxlen=LLM_LATENCY_WINDOW)
+                window.append(latency)
+
+    def _percentile(self, key: ProviderKey, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    def hedge_delay(self, key: ProviderKey) -> Optional[float]:
+        """Seconds to wait for `key` before starting the next provider (None: don't hedge)."""
+        if not self.hedging:
+            return None
+        return self._percentile(key, 0.95, LLM_HEDGE_MIN_SAMPLES)
+
+    async def _attempt(self, link: ProviderCall) -> Optional[Dict[str, Any]]:
+        try:
+            if link.limiter is not None:
+                await link.limiter.acquire()
+            start = time.perf_counter()
+            result = await asyncio.wait_for(link.call(), link.timeout)
+        except asyncio.CancelledError:
+            self._record(link.key, "cancelled")
+            raise
+        except asyncio.TimeoutError:
+            print(f"AI provider {link.provider} ({link.model}) timed out after {link.timeout:g}s")
+            self._record(link.key, "timeout")
+            return None
+        except Exception as e:
+            print(f"AI provider {link.provider} ({link.model}) error: {e}")
+            self._record(link.key, "error")
+            return None
+        if not isinstance(result, dict):
+            self._record(link.key, "error")
+            return None
+        self._record(link.key, "success", time.perf_counter() - start)
+        return result
+
+    async def run(self, links: List[ProviderCall]) -> Optional[Tuple[ProviderKey, Dict[str, Any]]]:
+        """((provider, model), analysis) from the first provider that succeeds, or None if all failed."""
+        loop = asyncio.get_running_loop()
+        pending = iter(links)
+        running: Dict[asyncio.Future, ProviderKey] = {}
+        hedge_at: Optional[float] = None
+
+        def launch(hedged: bool) -> Optional[float]:
+            """Start the next provider whose breaker allows a call; returns when to hedge it"""
+            for link in pending:
+                if not self._breaker(link.key).allow():
+                    self._count(link.key, "skipped")
+                    continue
+                self._count(link.key, "calls")
+                if hedged:
+                    self._count(link.key, "hedged")
+                running[asyncio.ensure_future(self._attempt(link))] = link.key
+                delay = self.hedge_delay(link.key)
+                return None if delay is None else loop.time() + delay
+            return None
+
+        try:
+            hedge_at = launch(False)
+            while running:
+                timeout = None if hedge_at is None else max(hedge_at - loop.time(), 0.0)
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The newest call is slower than its p95: race the next provider against it
+                    hedge_at = launch(True)
+                    continue
+                for task in done:
+                    key = running.pop(task)
+                    result = task.result()
+                    if result is not None:
+                        self._count(key, "wins")
+                        return key, result
+                if not running:
+                    hedge_at = launch(False)
+            return None
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.wait(running)
+
+    def stats(self) -> Dict[str, Any]:
+        providers = []
+        with self._lock:
+            keys = list(self._counts)
+        for key in keys:
+            with self._lock:
+                counts = dict(self._counts[key])
+            latency = {
+                f"p{round(q * 100)}_ms": None if value is None else round(value * 1000, 1)
+                for q in (0.5, 0.95, 0.99)
+                for value in [self._percentile(key, q)]
+            }
+            providers.append({
+                "provider": key[0],
+                "model": key[1],
+                "breaker": self._breaker(key).state,
+                **counts,
+                **latency,
+            })
+        return {"hedging": self.hedging, "providers": providers}
+
+    def reset(self):
+        with self._lock:
+            self._breakers.clear()
+            self._counts.clear()
+            self._latencies.clear()
+
+
+provider_chain = ProviderChain()
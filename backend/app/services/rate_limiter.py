@@ -0,0 +1,45 @@
+import asyncio
+import time
+from typing import Dict
+
+from app.core.config import LLM_RATE_LIMITS
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket for asyncio callers: `rate` acquisitions per second on
+    average, with bursts of up to `burst`. `acquire()` sleeps until a token
+    is available; a rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_limiters: Dict[str, AsyncRateLimiter] = {}
+
+
+def provider_limiter(provider: str) -> AsyncRateLimiter:
+    """Shared limiter for one LLM provider (rates from LLM_RATE_LIMITS)."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        rate, burst = LLM_RATE_LIMITS.get(provider, (0, 1))
+        limiter = _limiters[provider] = AsyncRateLimiter(rate, burst)
+    return limiter
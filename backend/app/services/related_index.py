@@ -0,0 +1,211 @@
+import heapq
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from app.services.news_repository import news_repository
+
+# Similarity weights used by GET /news/{id}/related
+TOPIC_WEIGHT = 3
+ENTITY_WEIGHT = 2
+PROVINCE_WEIGHT = 2
+ISLAND_WEIGHT = 1
+
+# (topics, province, island): every record in a group scores the same on these keys
+GroupKey = Tuple[FrozenSet[str], str, str]
+
+
+def normalize_entities(raw_entities) -> Set[str]:
+    """Entities come either as plain strings or as {"name": ..., "type": ...} dicts."""
+    names = set()
+    for entity in raw_entities or []:
+        if isinstance(entity, dict):
+            name = entity.get("name", "")
+        elif isinstance(entity, str):
+            name = entity
+        else:
+            continue
+        if name:
+            names.add(name)
+    return names
+
+
+class RelatedNewsIndex:
+    """
+    Inverted indexes for GET /news/{id}/related, maintained alongside the
+    news repository.
+
+    - topic / province / island: topics, provinces and islands are few and
+      broad (a topic like "Ekonomi" can cover a fifth of the archive), so
+      records are grouped by their (topics, province, island) combination
+      and indexed topic -> groups, province -> groups, island -> groups.
+      A whole group is scored at once.
+    - entity -> ids: entities are selective, so they are indexed per record.
+
+    `related()` only looks at groups and records that share at least one key
+    with the reference, and selects the top `limit` lazily (best score
+    first, newest first within a score) instead of sorting all candidates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # group -> ids in insertion order (oldest first)
+        self._groups: Dict[GroupKey, Dict[int, None]] = {}
+        self._topic_groups: Dict[str, Set[GroupKey]] = defaultdict(set)
+        self._province_groups: Dict[str, Set[GroupKey]] = defaultdict(set)
+        self._island_groups: Dict[str, Set[GroupKey]] = defaultdict(set)
+        self._entities: Dict[str, Set[int]] = defaultdict(set)
+        # id -> (insertion seq, group, entities)
+        self._features: Dict[int, Tuple[int, GroupKey, Set[str]]] = {}
+        self._seq = 0
+
+    def _add(self, record: Dict[str, Any]):
+        news_id = record["id"]
+        analysis = record.get("analysis") or {}
+        topics = frozenset(analysis.get("topics") or [])
+        province = record.get("province", "") or ""
+        island = analysis.get("detected_island", "") or ""
+        entities = normalize_entities(analysis.get("entities"))
+
+        group = (topics, province, island)
+        members = self._groups.get(group)
+        if members is None:
+            members = self._groups[group] = {}
+            for topic in topics:
+                self._topic_groups[topic].add(group)
+            if province:
+                self._province_groups[province].add(group)
+            if island:
+                self._island_groups[island].add(group)
+        members[news_id] = None
+
+        for entity in entities:
+            self._entities[entity].add(news_id)
+        self._seq += 1
+        self._features[news_id] = (self._seq, group, entities)
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        with self._lock:
+            self._groups.clear()
+            self._topic_groups.clear()
+            self._province_groups.clear()
+            self._island_groups.clear()
+            self._entities.clear()
+            self._features.clear()
+            self._seq = 0
+            for record in records:
+                self._add(record)
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self._add(record)
+
+    def update(self, old: Dict[str, Any], new: Dict[str, Any]):
+        # Edits that don't touch topics/province/island/entities (e.g. enrichment)
+        # leave the record where it is; re-adding would make it rank as newest.
+        features = self._features.get(old["id"])
+        analysis = new.get("analysis") or {}
+        group = (frozenset(analysis.get("topics") or []), new.get("province", "") or "",
+                 analysis.get("detected_island", "") or "")
+        if features is not None and features[1] == group \
+                and features[2] == normalize_entities(analysis.get("entities")):
+            return
+        self.remove(old)
+        self.add(new)
+
+    def remove(self, record: Dict[str, Any]):
+        news_id = record["id"]
+        with self._lock:
+            features = self._features.pop(news_id, None)
+            if features is None:
+                return
+            _, group, entities = features
+            members = self._groups[group]
+            del members[news_id]
+            if not members:
+                del self._groups[group]
+                topics, province, island = group
+                for topic in topics:
+                    self._discard(self._topic_groups, topic, group)
+                if province:
+                    self._discard(self._province_groups, province, group)
+                if island:
+                    self._discard(self._island_groups, island, group)
+            for entity in entities:
+                self._discard(self._entities, entity, news_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, set], key: str, value):
+        values = postings.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del postings[key]
+
+    def related(self, news_id: int, limit: int) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Return ([(id, score), ...] best first, number of records with score > 0).
+        Ties are broken newest first, matching the dataset order.
+        """
+        with self._lock:
+            features = self._features.get(news_id)
+            if features is None:
+                return [], 0
+            _, ref_group, ref_entities = features
+            ref_topics, ref_province, ref_island = ref_group
+
+            # Score every group sharing a topic/province/island with the reference
+            group_scores: Dict[GroupKey, int] = defaultdict(int)
+            for topic in ref_topics:
+                for group in self._topic_groups.get(topic, ()):
+                    group_scores[group] += TOPIC_WEIGHT
+            if ref_province:
+                for group in self._province_groups.get(ref_province, ()):
+                    group_scores[group] += PROVINCE_WEIGHT
+            if ref_island:
+                for group in self._island_groups.get(ref_island, ()):
+                    group_scores[group] += ISLAND_WEIGHT
+
+            # Records sharing entities get an exact per-record score
+            entity_hits = Counter()
+            for entity in ref_entities:
+                entity_hits.update(self._entities.get(entity, ()))
+            entity_hits.pop(news_id, None)
+            features_by_id = self._features
+            entity_scores = {}
+            related_count = sum(len(self._groups[g]) for g in group_scores)
+            for other, hits in entity_hits.items():
+                base = group_scores.get(features_by_id[other][1], 0)
+                if not base:
+                    related_count += 1
+                entity_scores[other] = base + hits * ENTITY_WEIGHT
+            if ref_group in group_scores:
+                related_count -= 1  # the reference itself
+
+            # Best records scored on group keys alone: walk score levels downwards,
+            # newest first within a level, until `limit` are found.
+            limit = max(limit, 0)
+            seq = lambda i: features_by_id[i][0]  # noqa: E731
+            levels: Dict[int, List[GroupKey]] = defaultdict(list)
+            for group, score in group_scores.items():
+                levels[score].append(group)
+            group_only = []
+            for score in sorted(levels, reverse=True):
+                if len(group_only) >= limit:
+                    break
+                newest_first = heapq.merge(*(reversed(self._groups[g]) for g in levels[score]),
+                                           key=seq, reverse=True)
+                for other in newest_first:
+                    if other == news_id or other in entity_scores:
+                        continue
+                    group_only.append((other, score))
+                    if len(group_only) >= limit:
+                        break
+
+            candidates = list(entity_scores.items()) + group_only
+            top = heapq.nlargest(limit, candidates, key=lambda kv: (kv[1], seq(kv[0])))
+            return top, related_count
+
+
+related_index = RelatedNewsIndex()
+news_repository.add_index(related_index)
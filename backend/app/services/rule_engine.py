@@ -0,0 +1,116 @@
+import json
+import re
+from typing import Any, Dict
+
+from app.core.config import ANALYSIS_RULES_PATH
+
+_DATE_SLASH = re.compile(r'(\d{1,2})/(\d{1,2})')  # DD/MM
+
+
+class RuleEngine:
+    """
+    Keyword rules for the offline analyzer, loaded from a JSON rules file.
+
+    Rules are normalized once at load time (lower-cased keyword tuples in
+    priority order), so analyzing an article lower-cases it once and runs
+    plain substring checks that stop at the first hit of each rule. On
+    CPython these C-level scans beat a single alternation regex over the
+    same keywords; see benchmarks/bench_rule_engine.py.
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.rules = rules
+        self.topics = {topic: tuple(k.lower() for k in keywords) for topic, keywords in rules["topics"].items()}
+        self.provinces = [(p, p.lower()) for p in rules["provinces"]]
+        self.entities = {k.lower(): name for k, name in rules["entities"].items()}
+        self.sentiment = [(tuple(k.lower() for k in rule["keywords"]), rule["score"]) for rule in rules["sentiment"]]
+        self.virality = [(tuple(k.lower() for k in rule["keywords"]), rule["level"]) for rule in rules["virality"]]
+        self.titles = [(tuple(k.lower() for k in rule["keywords"]), rule["template"]) for rule in rules["titles"]]
+        self.weather = tuple(k.lower() for k in rules["weather"])
+
+    @classmethod
+    def load(cls, path: str = ANALYSIS_RULES_PATH) -> "RuleEngine":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def is_weather_related(self, text: str) -> bool:
+        text_lower = text.lower()
+        return any(map(text_lower.__contains__, self.weather))
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        text_lower = text.lower()
+
+        # 1. Topic Detection
+        topics = [topic for topic, keywords in self.topics.items() if any(map(text_lower.__contains__, keywords))]
+        if not topics:
+            topics.append(self.rules["default_topic"])
+
+        # 2. Entity Extraction & Province Detection (first listed province wins)
+        entities = []
+        detected_province = self.rules["default_province"]
+        for province, province_lower in self.provinces:
+            if province_lower in text_lower:
+                detected_province = province
+                entities.append(province)
+                break
+        entities.extend(name for keyword, name in self.entities.items() if keyword in text_lower)
+
+        # 3. Event Date Extraction (Simple pattern matching)
+        event_date = ""
+        match = _DATE_SLASH.search(text)
+        if match:
+            # Construct a date (assume current year 2025)
+            day, month = match.groups()
+            event_date = f"2025-{month.zfill(2)}-{day.zfill(2)}"
+
+        # 4. Title Generation (Simple Extraction for simulation)
+        first_sentence = text.partition('.')[0]
+        generated_title = first_sentence[:80] + "..." if len(first_sentence) > 80 else first_sentence
+        for keywords, template in self.titles:
+            if any(map(text_lower.__contains__, keywords)):
+                generated_title = template.format(province=detected_province)
+                break
+
+        # 5. Premium Insights
+        sentiment_score = self.rules["default_sentiment"]
+        for keywords, score in self.sentiment:
+            if any(map(text_lower.__contains__, keywords)):
+                sentiment_score = score
+                break
+
+        virality_score = self.rules["default_virality"]
+        for keywords, level in self.virality:
+            if any(map(text_lower.__contains__, keywords)):
+                virality_score = level
+                break
+
+        strategic_recs = []
+        if sentiment_score < 40:
+            strategic_recs.append("Segera kirim bantuan logistik dan tim medis.")
+            strategic_recs.append("Koordinasi dengan BNPB untuk mitigasi lanjutan.")
+        else:
+            strategic_recs.append("Pertahankan momentum dengan dukungan kebijakan.")
+            strategic_recs.append("Publikasikan keberhasilan ini sebagai success story nasional.")
+
+        impact = "Netral"
+        if sentiment_score < 40:
+            impact = "Negatif: Risiko stabilitas daerah."
+        elif sentiment_score > 70:
+            impact = "Positif: Mendukung ketahanan nasional."
+
+        return {
+            "generated_title": generated_title,
+            "detected_province": detected_province,
+            "event_date": event_date,
+            "summary": text[:200] + "...",
+            "topics": topics,
+            "entities": entities,
+            "impact": impact,
+            "sentiment_score": sentiment_score,
+            "virality_score": virality_score,
+            "strategic_recommendations": strategic_recs,
+            "rpjmn_alignment": [{"target": "Ketahanan Nasional", "relevance": "High"}]
+        }
+
+
+rule_engine = RuleEngine.load()
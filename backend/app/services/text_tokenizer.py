@@ -0,0 +1,60 @@
+import re
+import unicodedata
+from typing import List, Tuple
+
+# Common Indonesian function words that carry no topical signal
+STOPWORDS = frozenset("""
+ada adalah agar akan aku anda antara apa apabila atas atau bagaimana bagi bahwa baik banyak begitu belum
+beberapa benar berbagai bersama besar bila bisa boleh dalam dan dapat dari demikian dengan di dia dua
+hal hampir hanya harus hingga ia ialah ini itu jadi jika juga juta kami kamu karena ke kecuali kembali
+kemudian kepada ketika kita lagi lain lalu lebih maka masih melalui memang menjadi menurut merupakan
+mereka mungkin namun oleh pada para pun saat saja sama sampai sangat satu saya sebagai sebelum sebuah
+secara sedang sehingga sejak selain selama seluruh semua sendiri seperti serta setelah sudah supaya
+tahun tanpa telah tentang terhadap termasuk tersebut tetapi tiga tidak untuk walaupun yaitu yakni yang
+""".split())
+
+_TOKEN = re.compile(r"[0-9a-z]+(?:[-'][0-9a-z]+)*")
+# The Unicode "combining diacritical marks" blocks (what NFKD splits accents into)
+_COMBINING = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+")
+
+
+def _strip_suffix(token: str) -> str:
+    # The possessive enclitic: "pembangunannya" -> "pembangunan". The -lah/-kah/-pun
+    # particles are left alone; stripping them mangles "sekolah", "langkah", "masalah".
+    if token.endswith("nya") and len(token) >= 7:
+        return token[:-3]
+    return token
+
+
+def normalize(text: str) -> str:
+    """Lower-case and drop diacritics so 'Kalimantan' and 'kalimantan' match."""
+    if text.isascii():
+        return text.lower()
+    return _COMBINING.sub("", unicodedata.normalize("NFKD", text)).lower()
+
+
+def tokenize(text: str, keep_stopwords: bool = False) -> List[str]:
+    """
+    Indonesian-aware word tokens: lower-cased, accents removed, the -nya
+    enclitic stripped, reduplications ("anak-anak") kept as one token,
+    stopwords removed unless `keep_stopwords`.
+    """
+    tokens = []
+    for token in _TOKEN.findall(normalize(text)):
+        if not keep_stopwords and token in STOPWORDS:
+            continue
+        tokens.append(_strip_suffix(token))
+    return tokens
+
+
+def tokenize_positions(text: str) -> List[Tuple[int, str]]:
+    """
+    `tokenize()` with each token's word position. Stopwords are dropped but
+    still counted, so "banjir di bandung" gives [(0, "banjir"), (2, "bandung")]
+    and phrase matching can compare relative positions.
+    """
+    tokens = []
+    for position, token in enumerate(_TOKEN.findall(normalize(text))):
+        if token not in STOPWORDS:
+            tokens.append((position, _strip_suffix(token)))
+    return tokens
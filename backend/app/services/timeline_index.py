@@ -0,0 +1,189 @@
+import threading
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.news_aggregates import is_pending
+from app.services.news_repository import news_repository
+
+GRANULARITIES = ("hour", "day", "week")
+
+
+def parse_published_at(value: str) -> Optional[datetime]:
+    """ISO timestamp -> naive local datetime (None if unparsable)."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _hour_key(ts: datetime) -> int:
+    return ts.toordinal() * 24 + ts.hour
+
+
+def _week_key(day: int) -> int:
+    """Ordinal of the Monday starting the ISO week containing `day`."""
+    return day - date.fromordinal(day).weekday()
+
+
+def _format_key(key: int, granularity: str) -> str:
+    if granularity == "hour":
+        day, hour = divmod(key, 24)
+        return f"{date.fromordinal(day).isoformat()}T{hour:02d}:00"
+    return date.fromordinal(key).isoformat()
+
+
+class TimelineIndex:
+    """
+    Hour- and day-bucketed counts (total and per topic) behind
+    `/analytics/timeline`, maintained alongside the news repository.
+
+    Timestamps are parsed once, when a record is indexed. A window query
+    adds up whole-day (or whole-hour) buckets for the interior of the
+    window. It only looks at individual records on the two edge days, where
+    the window starts or ends mid-day. The cost is O(days) whatever the
+    archive size. Records pending analysis are left out, like in
+    `news_aggregates`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._day_totals: Dict[int, int] = defaultdict(int)
+        self._day_topics: Dict[int, Counter] = defaultdict(Counter)
+        self._hour_totals: Dict[int, int] = defaultdict(int)
+        self._hour_topics: Dict[int, Counter] = defaultdict(Counter)
+        # day -> id -> (timestamp, topics), used for the partial edge days
+        self._day_members: Dict[int, Dict[int, Tuple[datetime, Tuple[str, ...]]]] = defaultdict(dict)
+        self._record_day: Dict[int, int] = {}
+
+    @staticmethod
+    def _bump(totals: Dict[int, int], topic_counts: Dict[int, Counter], key: int,
+              topics: Tuple[str, ...], sign: int):
+        totals[key] += sign
+        if totals[key] <= 0:
+            del totals[key]
+            topic_counts.pop(key, None)
+            return
+        counts = topic_counts[key]
+        for topic in topics:
+            counts[topic] += sign
+            if counts[topic] <= 0:
+                del counts[topic]
+
+    def _add(self, record: Dict[str, Any]):
+        if is_pending(record):
+            return
+        ts = parse_published_at(record.get("published_at"))
+        if ts is None:
+            return
+        topics = tuple(dict.fromkeys((record.get("analysis") or {}).get("topics", [])))
+        day = ts.toordinal()
+        self._bump(self._day_totals, self._day_topics, day, topics, 1)
+        self._bump(self._hour_totals, self._hour_topics, _hour_key(ts), topics, 1)
+        self._day_members[day][record["id"]] = (ts, topics)
+        self._record_day[record["id"]] = day
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        with self._lock:
+            self._reset()
+            for record in records:
+                self._add(record)
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self._add(record)
+
+    def remove(self, record: Dict[str, Any]):
+        with self._lock:
+            day = self._record_day.pop(record["id"], None)
+            if day is None:
+                return
+            members = self._day_members[day]
+            ts, topics = members.pop(record["id"])
+            if not members:
+                del self._day_members[day]
+            self._bump(self._day_totals, self._day_topics, day, topics, -1)
+            self._bump(self._hour_totals, self._hour_topics, _hour_key(ts), topics, -1)
+
+    def timeline(self, start: datetime, end: datetime, granularity: str = "day",
+                 topic: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Non-empty buckets with records published in [start, end], oldest first."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+
+        buckets: Dict[int, List] = {}
+
+        def bucket_for(key: int):
+            entry = buckets.get(key)
+            if entry is None:
+                entry = buckets[key] = [0, Counter()]
+            return entry
+
+        def add_bucket(key: int, total: int, counts: Counter):
+            if topic is not None:
+                total = counts.get(topic, 0)
+                if not total:
+                    return
+                counts = {topic: total}
+            entry = bucket_for(key)
+            entry[0] += total
+            entry[1].update(counts)
+
+        def bucket_key(day: int, ts: Optional[datetime] = None, hour: Optional[int] = None) -> int:
+            if granularity == "hour":
+                return day * 24 + (ts.hour if ts is not None else hour)
+            if granularity == "week":
+                return _week_key(day)
+            return day
+
+        first, last = start.toordinal(), end.toordinal()
+        with self._lock:
+            for day in range(first, last + 1):
+                if day == first or day == last:
+                    for ts, topics in self._day_members.get(day, {}).values():
+                        if start <= ts <= end and (topic is None or topic in topics):
+                            entry = bucket_for(bucket_key(day, ts))
+                            entry[0] += 1
+                            entry[1].update((topic,) if topic is not None else topics)
+                elif day not in self._day_totals:
+                    continue
+                elif granularity == "hour":
+                    for hour in range(24):
+                        key = day * 24 + hour
+                        if key in self._hour_totals:
+                            add_bucket(key, self._hour_totals[key], self._hour_topics[key])
+                else:
+                    add_bucket(bucket_key(day), self._day_totals[day], self._day_topics[day])
+
+        return [
+            {"date": _format_key(key, granularity), "total": total, "topics": dict(counts)}
+            for key, (total, counts) in sorted(buckets.items())
+        ]
+
+
+def trend(timeline: List[Dict[str, Any]], window: int = 7) -> Dict[str, Any]:
+    """Compare the last `window` buckets with the `window` before them."""
+    prefix = [0]
+    for entry in timeline:
+        prefix.append(prefix[-1] + entry["total"])
+    n = len(timeline)
+    recent = prefix[n] - prefix[max(n - window, 0)]
+    previous = prefix[n - window] - prefix[n - 2 * window] if n >= 2 * window else recent
+
+    percentage = 0
+    if previous > 0:
+        percentage = round(((recent - previous) / previous) * 100, 1)
+    return {
+        "percentage": percentage,
+        "direction": "up" if percentage > 0 else "down" if percentage < 0 else "stable",
+    }
+
+
+timeline_index = TimelineIndex()
+news_repository.add_index(timeline_index)
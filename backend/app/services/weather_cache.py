@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import WEATHER_CACHE_PATH, WEATHER_TODAY_TTL_SECONDS
+
+
+def cache_key(lat: float, lon: float, date: str) -> Tuple[float, float, str]:
+    """(lat, lon, date) with coordinates rounded to ~10 m, so equal places share entries"""
+    return round(lat, 4), round(lon, 4), date
+
+
+class WeatherCache:
+    """
+    Persistent cache of daily weather values, keyed by `cache_key(lat, lon, date)`.
+
+    Values for past dates never change, so entries stored as `final` never
+    expire. Today's values (and any day the archive has not filled in yet)
+    are kept for `ttl_seconds`. Stored in SQLite, like the analysis cache.
+    """
+
+    def __init__(self, path: str = WEATHER_CACHE_PATH, ttl_seconds: int = WEATHER_TODAY_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS weather_cache ("
+                " lat REAL NOT NULL, lon REAL NOT NULL, date TEXT NOT NULL, value TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL, final INTEGER NOT NULL, PRIMARY KEY (lat, lon, date))"
+            )
+        return self._conn
+
+    def get(self, lat: float, lon: float, date: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, fetched_at, final FROM weather_cache WHERE lat = ? AND lon = ? AND date = ?",
+                cache_key(lat, lon, date),
+            ).fetchone()
+            if row is None or (not row[2] and time.time() - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, lat: float, lon: float, date: str, value: Dict[str, Any], final: bool):
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO weather_cache (lat, lon, date, value, fetched_at, final) VALUES (?, ?, ?, ?, ?, ?)",
+                (*cache_key(lat, lon, date), json.dumps(value), time.time(), int(final)),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, final = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(final), 0) FROM weather_cache"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "final_entries": final,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+weather_cache = WeatherCache()
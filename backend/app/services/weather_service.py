@@ -1,6 +1,11 @@
-import httpx
+import asyncio
 import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from app.services.client_pool import client_pool
+from app.services.weather_cache import cache_key, weather_cache
+
+# Timezone the archive API reports days in (see the "timezone" request parameter)
+LOCAL_TZ = datetime.timezone(datetime.timedelta(hours=7))
 
 class WeatherService:
     def __init__(self):
@@ -22,49 +27,133 @@ class WeatherService:
             "banjarnegara": {"lat": -7.3975, "lon": 109.6986},
             "indonesia": {"lat": -6.2088, "lon": 106.8456} # Default to Jakarta
         }
+        # cache_key(lat, lon, date) -> archive request in flight that covers it
+        self._inflight: Dict[Tuple[float, float, str], asyncio.Task] = {}
 
     async def get_historical_weather(self, location: str, date_str: str) -> Optional[Dict[str, Any]]:
         """
         Fetch historical weather for a location on a specific date.
-        date_str format: YYYY-MM-DD
+        date_str format: YYYY-MM-DD (anything else returns None)
         """
+        try:
+            datetime.date.fromisoformat(date_str)
+        except (TypeError, ValueError):
+            return None
         coords = self._get_coordinates(location)
         if not coords:
             return None
 
+        lat, lon = coords["lat"], coords["lon"]
+        daily = await asyncio.to_thread(weather_cache.get, lat, lon, date_str)
+        if daily is None:
+            # Concurrent lookups for the same place and day (or a prefetch covering it) share one request
+            task = self._inflight.get(cache_key(lat, lon, date_str))
+            if task is None:
+                task = self._fetch(lat, lon, date_str, date_str)
+            days = await asyncio.shield(task)
+            daily = days.get(date_str)
+        if daily is None:
+            return None
+
+        return {
+            "date": date_str,
+            "location": location,
+            **daily,
+            "unit_temp": "°C",
+            "unit_precip": "mm",
+            "unit_wind": "km/h"
+        }
+
+    async def prefetch(self, location: str, start_date: str, end_date: str) -> int:
+        """
+        Warm the cache for every day in [start_date, end_date] at `location` with a
+        single archive request. Returns the number of days fetched (0 if all are
+        cached or already being fetched).
+        """
+        coords = self._get_coordinates(location)
+        lat, lon = coords["lat"], coords["lon"]
+        start = datetime.date.fromisoformat(start_date)
+        end = datetime.date.fromisoformat(end_date)
+        dates = [(start + datetime.timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        cached = await asyncio.to_thread(
+            lambda: {date_str for date_str in dates if weather_cache.get(lat, lon, date_str) is not None}
+        )
+        # Checked after the cache lookup, with no await before _fetch registers its days, so
+        # concurrent prefetches (e.g. of two names for the same place) never request a day twice
+        missing = [
+            date_str for date_str in dates
+            if date_str not in cached and cache_key(lat, lon, date_str) not in self._inflight
+        ]
+        if not missing:
+            return 0
+        days = await asyncio.shield(self._fetch(lat, lon, missing[0], missing[-1]))
+        return len(days)
+
+    def _fetch(self, lat: float, lon: float, start_date: str, end_date: str) -> asyncio.Task:
+        start = datetime.date.fromisoformat(start_date)
+        keys = [
+            cache_key(lat, lon, (start + datetime.timedelta(days=i)).isoformat())
+            for i in range((datetime.date.fromisoformat(end_date) - start).days + 1)
+        ]
+        task = asyncio.get_running_loop().create_task(self._request(lat, lon, start_date, end_date))
+        for key in keys:
+            self._inflight.setdefault(key, task)
+
+        def done(_):
+            for key in keys:
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+        task.add_done_callback(done)
+        return task
+
+    async def _request(self, lat: float, lon: float, start_date: str, end_date: str) -> Dict[str, Dict[str, Any]]:
+        """One archive API call for a date range; caches and returns {date: daily values}."""
         try:
             # Open-Meteo Historical Weather API
             url = "https://archive-api.open-meteo.com/v1/archive"
             params = {
-                "latitude": coords["lat"],
-                "longitude": coords["lon"],
-                "start_date": date_str,
-                "end_date": date_str,
+                "latitude": lat,
+                "longitude": lon,
+                "start_date": start_date,
+                "end_date": end_date,
                 "daily": "temperature_2m_max,precipitation_sum,wind_speed_10m_max",
                 "timezone": "Asia/Bangkok"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
-                data = response.json()
-
-            if "daily" in data:
-                daily = data["daily"]
-                return {
-                    "date": date_str,
-                    "location": location,
-                    "max_temp": daily["temperature_2m_max"][0],
-                    "precipitation": daily["precipitation_sum"][0],
-                    "wind_speed": daily["wind_speed_10m_max"][0],
-                    "unit_temp": "°C",
-                    "unit_precip": "mm",
-                    "unit_wind": "km/h"
-                }
+            response = await client_pool.http_client().get(url, params=params)
+            data = response.json()
         except Exception as e:
             print(f"Weather API Error: {e}")
-            return None
-        
-        return None
+            return {}
+
+        if "daily" not in data:
+            return {}
+        daily = data["daily"]
+        today = datetime.datetime.now(LOCAL_TZ).date().isoformat()
+        days = {}
+        for i, date_str in enumerate(daily.get("time", [])):
+            days[date_str] = {
+                "max_temp": daily["temperature_2m_max"][i],
+                "precipitation": daily["precipitation_sum"][i],
+                "wind_speed": daily["wind_speed_10m_max"][i],
+            }
+
+        def store():
+            for date_str, values in days.items():
+                # Past days are final once the archive has filled them in; today's values still change
+                final = date_str < today and None not in values.values()
+                weather_cache.put(lat, lon, date_str, values, final)
+        await asyncio.to_thread(store)
+        return days
+
+    def coordinates(self, location: str) -> Tuple[float, float]:
+        """(lat, lon) a location name resolves to; lookups with equal coordinates share cache entries"""
+        coords = self._get_coordinates(location)
+        return coords["lat"], coords["lon"]
+
+    def locations(self):
+        """Known location names"""
+        return list(self.location_map)
 
     def _get_coordinates(self, location: str):
         location_lower = location.lower()
@@ -78,3 +167,6 @@ class WeatherService:
                 return coords
         
         return self.location_map["indonesia"] # Default fallback
+
+
+weather_service = WeatherService()
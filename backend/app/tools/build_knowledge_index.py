@@ -0,0 +1,43 @@
+"""
+Build the knowledge-base retrieval index ahead of time.
+
+The API indexes a document when it is uploaded, and indexes any document
+whose index file is missing the first time the knowledge base is used.
+Run this after copying documents or an old `knowledge_base.txt` in by
+hand, to keep that cost off the first analysis request. `--force`
+rebuilds every document's index (e.g. after changing
+KNOWLEDGE_CHUNK_CHARS or the tokenizer).
+
+Run from the backend directory:
+    python -m app.tools.build_knowledge_index [--force]
+"""
+import argparse
+import os
+import time
+
+from app.services.knowledge_index import knowledge_index
+from app.services.knowledge_store import knowledge_store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="rebuild existing document indexes")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.force:
+        for document in knowledge_store.documents():
+            path = knowledge_index.index_path(document["id"])
+            if os.path.exists(path):
+                os.remove(path)
+            knowledge_index.remove(document)
+            with open(knowledge_store.text_path(document["id"]), "r", encoding="utf-8") as f:
+                knowledge_index.add(document, knowledge_index.prepare(document, f.read()))
+    stats = knowledge_store.stats()
+    index_stats = knowledge_index.stats()
+    print(f"Indexed {stats['documents']} documents ({stats['chars']} chars) into {index_stats['chunks']} chunks "
+          f"({index_stats['terms']} terms) in {time.perf_counter() - start:.2f}s -> {knowledge_store.root}")
+
+
+if __name__ == "__main__":
+    main()
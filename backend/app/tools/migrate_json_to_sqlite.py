@@ -0,0 +1,48 @@
+"""
+Import the JSON news dataset (snapshot + journal) into the SQLite storage engine.
+
+Run from the backend directory:
+    python -m app.tools.migrate_json_to_sqlite [--db PATH] [--force]
+
+Then start the API with NEWS_STORAGE=sqlite.
+"""
+import argparse
+import os
+import sys
+
+from app.core.config import NEWS_DATA_PATH, NEWS_DB_PATH, NEWS_JOURNAL_PATH, NEWS_STATE_PATH
+from app.services.news_sqlite_storage import SqliteStorage
+from app.services.news_storage import JournalStorage
+
+
+def migrate(snapshot_path: str, journal_path: str, state_path: str, db_path: str, force: bool = False) -> int:
+    if os.path.exists(db_path):
+        if not force:
+            raise SystemExit(f"{db_path} already exists; pass --force to replace it")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    records, next_id = JournalStorage(snapshot_path, journal_path, state_path).load()
+    storage = SqliteStorage(db_path)
+    storage.insert_many(records.values())
+    storage.compact([], next_id)
+    return len(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", default=NEWS_DATA_PATH, help="snapshot to import (default: %(default)s)")
+    parser.add_argument("--journal", default=NEWS_JOURNAL_PATH, help="write journal to replay on top")
+    parser.add_argument("--state", default=NEWS_STATE_PATH, help="id counter state file")
+    parser.add_argument("--db", default=NEWS_DB_PATH, help="SQLite database to create (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="replace an existing database")
+    args = parser.parse_args(argv)
+
+    imported = migrate(args.json, args.journal, args.state, args.db, args.force)
+    print(f"Imported {imported} news records into {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
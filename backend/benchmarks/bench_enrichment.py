@@ -0,0 +1,122 @@
+"""
+POST /news latency for each weather enrichment mode.
+
+The LLM is replaced by a stand-in that answers after --llm-ms, and the
+weather archive API by a mock transport that answers after --weather-ms.
+Every article is weather-related and has its own event date, so each upload
+needs one weather lookup (no weather cache hits). --miss-rate is the share
+of articles where the LLM detects a different province than the local
+guess, which makes "speculative" fall back to a second, serial lookup.
+
+Run from the backend directory:
+    python -m benchmarks.bench_enrichment --requests 50
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="tvri-bench-")
+os.environ["TVRI_DATA_DIR"] = SCRATCH_DIR
+os.environ["LLM_RATE_LIMITS"] = "openai=0"  # measure the pipeline, not the rate limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+shutil.copy(os.path.join(BASE_DIR, "data", "dummy_dataset.json"), SCRATCH_DIR)
+
+import httpx  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import endpoints  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.client_pool import client_pool  # noqa: E402
+
+PROVINCES = ["Jawa Barat", "Jawa Tengah", "Jawa Timur", "Aceh", "Bali", "Sumatera Utara"]
+
+
+class StubCompletions:
+    def __init__(self, seconds, miss_rate):
+        self.seconds = seconds
+        self.miss_rate = miss_rate
+        self.rng = random.Random(0)
+
+    async def create(self, messages, **kwargs):
+        await asyncio.sleep(self.seconds)
+        article = messages[-1]["content"]
+        province = next((p for p in PROVINCES if p in article), None)
+        if province is None:
+            # Connection test from the AI health monitor
+            message = types.SimpleNamespace(content="ok")
+            return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+        if self.rng.random() < self.miss_rate:
+            province = PROVINCES[(PROVINCES.index(province) + 1) % len(PROVINCES)]
+        day, month = article.split("(")[1].split(")")[0].split("/")
+        analysis = {"generated_title": "Bench", "detected_province": province, "topics": ["Bencana Alam"],
+                    "event_date": f"2025-{month.zfill(2)}-{day.zfill(2)}", "impact": "Negatif", "sentiment_score": 20}
+        message = types.SimpleNamespace(content=json.dumps(analysis))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+
+class StubClient:
+    def __init__(self, completions):
+        self.chat = types.SimpleNamespace(completions=completions)
+
+    async def close(self):
+        pass
+
+
+def weather_transport(seconds):
+    async def handler(request):
+        await asyncio.sleep(seconds)
+        day = request.url.params["start_date"]
+        return httpx.Response(200, json={"daily": {
+            "time": [day], "temperature_2m_max": [29.5], "precipitation_sum": [72.0], "wind_speed_10m_max": [12.0],
+        }})
+    return httpx.MockTransport(handler)
+
+
+def run(client, mode, requests, offset):
+    latencies = []
+    start_day = datetime.date(2025, 1, 1) + datetime.timedelta(days=offset)
+    for i in range(requests):
+        day = start_day + datetime.timedelta(days=i)
+        province = PROVINCES[i % len(PROVINCES)]
+        content = f"Banjir melanda {province} pada Senin ({day.day}/{day.month}), hujan deras sejak pagi. [{mode} {i}]"
+        start = time.perf_counter()
+        client.post("/api/v1/news", json={"content": content, "enrichment": mode}).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[max(math.ceil(len(latencies) * 0.95) - 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--llm-ms", type=float, default=800)
+    parser.add_argument("--weather-ms", type=float, default=300)
+    parser.add_argument("--miss-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    endpoints.ai_service.save_config("openai", "bench-key", "bench-model")
+    stub = StubClient(StubCompletions(args.llm_ms / 1000, args.miss_rate))
+
+    print(f"{'mode':<12} {'p50 ms':>8} {'p95 ms':>8}")
+    with TestClient(app) as client:
+        client_pool._llm_clients[("openai", "bench-key", None)] = stub
+        client_pool._http_client = httpx.AsyncClient(transport=weather_transport(args.weather_ms / 1000))
+        # Distinct date ranges per mode, so no mode benefits from another's weather cache entries
+        for n, mode in enumerate(("serial", "speculative", "background")):
+            p50, p95 = run(client, mode, args.requests, offset=n * args.requests)
+            print(f"{mode:<12} {p50:>8.1f} {p95:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
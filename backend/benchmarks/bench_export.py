@@ -0,0 +1,60 @@
+"""
+Throughput and peak memory of GET /news/export at different archive sizes,
+against building one `GET /news?limit=<everything>` response.
+
+Measures the export body generator the endpoint streams (NDJSON, CSV,
+gzip-compressed NDJSON) with tracemalloc, so the numbers cover the encoding
+path only, not the records the repository already holds in memory.
+
+Run from the backend directory:
+    python -m benchmarks.bench_export --sizes 10000 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.bench_read_endpoints import make_dataset, seed_dataset
+from app.api import endpoints
+from app.services.news_export import chunked, csv_rows, gzipped, ndjson_rows
+from app.services.news_query import NewsFilter
+from app.services.news_repository import news_repository
+
+
+def measure(produce):
+    """(seconds, bytes produced, peak traced bytes); timed without tracemalloc, which slows allocation"""
+    start = time.perf_counter()
+    size = produce()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    produce()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def drain(chunks) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    variants = {
+        "/news?limit=all": lambda size: len(endpoints.get_news(limit=size, offset=0).body),
+        "export ndjson": lambda _: drain(chunked(ndjson_rows(news_repository.iter_query(NewsFilter())))),
+        "export csv": lambda _: drain(chunked(csv_rows(news_repository.iter_query(NewsFilter())))),
+        "export ndjson gzip": lambda _: drain(gzipped(chunked(ndjson_rows(news_repository.iter_query(NewsFilter()))))),
+    }
+    print(f"{'records':>8}  {'variant':<20} {'rows/s':>10} {'MB out':>8} {'peak MB':>8}")
+    for size in args.sizes:
+        seed_dataset(make_dataset(size))
+        news_repository.count()  # load outside the measurement
+        for name, produce in variants.items():
+            elapsed, out, peak = measure(lambda: produce(size))
+            print(f"{size:>8}  {name:<20} {size / elapsed:>10.0f} {out / 1e6:>8.1f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
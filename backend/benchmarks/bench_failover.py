@@ -0,0 +1,100 @@
+"""
+Analysis latency while the primary LLM provider misbehaves: the primary
+alone (bounded only by the SDK timeout, then the offline analyzer), the
+provider chain failing over to a second provider, and the chain with
+hedging at the primary's p95.
+
+Providers are stubs that sleep for a sampled latency, so the numbers show
+the scheduling, not any real API. Scenarios:
+- tail: 5% of primary calls take 20x longer than usual
+- outage: the primary hangs on every call
+- errors: the primary fails fast on every call
+
+Run from the backend directory:
+    python -m benchmarks.bench_failover --requests 400 --concurrency 8
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import statistics
+import time
+
+from app.services.provider_chain import ProviderCall, ProviderChain
+
+PRIMARY_MS = 50
+FALLBACK_MS = 80
+SDK_TIMEOUT_MS = 3000
+CHAIN_TIMEOUT_MS = 500
+
+SCENARIOS = {
+    "tail": lambda rng: PRIMARY_MS * (20 if rng.random() < 0.05 else 1) * rng.uniform(0.8, 1.3),
+    "outage": lambda rng: None,
+    "errors": lambda rng: 0,
+}
+
+
+def stub(latency_ms):
+    async def call():
+        if latency_ms is None:
+            await asyncio.Event().wait()  # hangs
+        if latency_ms == 0:
+            raise RuntimeError("503 Service Unavailable")
+        await asyncio.sleep(latency_ms / 1000)
+        return {"summary": "ok"}
+    return call
+
+
+async def run(scenario: str, mode: str, requests: int, concurrency: int, seed: int):
+    rng = random.Random(seed)
+    # The primary alone stands for the previous behavior: no circuit breaker
+    breaker_failures = requests + 1 if mode == "primary only" else 5
+    chain = ProviderChain(hedging=mode == "chain+hedge", breaker_failures=breaker_failures, breaker_cooldown=1.0)
+    semaphore = asyncio.Semaphore(concurrency)
+    timings, calls = [], 0
+
+    async def analyze():
+        nonlocal calls
+        primary = stub(SCENARIOS[scenario](rng))
+        fallback = stub(FALLBACK_MS * rng.uniform(0.8, 1.3))
+        if mode == "primary only":
+            links = [ProviderCall("primary", "m", primary, SDK_TIMEOUT_MS / 1000)]
+        else:
+            links = [ProviderCall("primary", "m", primary, CHAIN_TIMEOUT_MS / 1000),
+                     ProviderCall("fallback", "m", fallback, CHAIN_TIMEOUT_MS / 1000)]
+        async with semaphore:
+            start = time.perf_counter()
+            await chain.run(links)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(analyze() for _ in range(requests)))
+    for provider in chain.stats()["providers"]:
+        calls += provider["calls"]
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p99": timings[min(int(0.99 * len(timings)), len(timings) - 1)],
+        "max": timings[-1],
+        "calls": calls / requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<8} {'mode':<14} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'calls/req':>10}")
+    for scenario in SCENARIOS:
+        for mode in ("primary only", "chain", "chain+hedge"):
+            with contextlib.redirect_stdout(io.StringIO()):  # per-call timeout/error logs
+                result = asyncio.run(run(scenario, mode, args.requests, args.concurrency, args.seed))
+            print(f"{scenario:<8} {mode:<14} {result['p50']:>8.0f} {result['p99']:>8.0f} "
+                  f"{result['max']:>8.0f} {result['calls']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
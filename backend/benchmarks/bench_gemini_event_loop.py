@@ -0,0 +1,99 @@
+"""
+Load test: GET /news latency while Gemini analyses are in flight.
+
+Replaces the Gemini model with a stand-in whose generate_content() blocks
+its thread for --gemini-seconds, like the real SDK does during a request.
+It then fires --inflight POST /news uploads and measures GET /news latency
+at the same time. "before" runs generate_content directly on the event loop
+(the old behaviour); "after" uses the bounded Gemini thread pool.
+
+Run from the backend directory:
+    python -m benchmarks.bench_gemini_event_loop --inflight 20
+"""
+import argparse
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="tvri-bench-")
+os.environ["TVRI_DATA_DIR"] = SCRATCH_DIR
+os.environ["LLM_RATE_LIMITS"] = "gemini=0"  # measure the event loop, not the rate limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+shutil.copy(os.path.join(BASE_DIR, "data", "dummy_dataset.json"), SCRATCH_DIR)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import endpoints  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.ai_service import AIService  # noqa: E402
+from app.services.client_pool import client_pool  # noqa: E402
+
+
+class BlockingModel:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def generate_content(self, prompt, **kwargs):
+        time.sleep(self.seconds)
+
+        class Response:
+            text = '{"generated_title": "Bench", "topics": ["Pangan"], "sentiment_score": 50}'
+        return Response()
+
+
+async def legacy_generate(self, api_key, model, prompt):
+    return model.generate_content(prompt)
+
+
+def run(client, inflight, gemini_seconds):
+    latencies = []
+    stop = threading.Event()
+
+    def poll():
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get("/api/v1/news?limit=20").raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.02)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    with ThreadPoolExecutor(max_workers=inflight) as pool:
+        uploads = [pool.submit(client.post, "/api/v1/news",
+                               json={"content": f"Artikel uji beban {i}", "bypass_cache": True})
+                   for i in range(inflight)]
+        for upload in uploads:
+            upload.result().raise_for_status()
+    stop.set()
+    poller.join()
+    latencies.sort()
+    return statistics.median(latencies), latencies[max(math.ceil(len(latencies) * 0.95) - 1, 0)], latencies[-1], len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--inflight", type=int, default=20)
+    parser.add_argument("--gemini-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    endpoints.ai_service.save_config("gemini", "bench-key", "gemini-bench")
+    threaded_generate = AIService._generate_gemini
+
+    print(f"{'mode':<7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'samples':>8}")
+    with TestClient(app) as client:
+        client_pool._gemini_models[("bench-key", "gemini-bench")] = BlockingModel(args.gemini_seconds)
+        for mode, generate in (("before", legacy_generate), ("after", threaded_generate)):
+            AIService._generate_gemini = generate
+            p50, p95, worst, samples = run(client, args.inflight, args.gemini_seconds)
+            print(f"{mode:<7} {p50:>8.1f} {p95:>8.1f} {worst:>8.1f} {samples:>8}")
+
+
+if __name__ == "__main__":
+    main()
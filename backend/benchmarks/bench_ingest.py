@@ -0,0 +1,50 @@
+"""
+Write throughput of the news repository as the archive grows.
+
+Seeds a scratch snapshot with N records, then times a burst of inserts and
+deletes through NewsRepository. With the append-only journal the per-write
+cost should stay flat across archive sizes (compaction is amortized).
+
+Run from the backend directory:
+    python -m benchmarks.bench_ingest --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="tvri-bench-")
+os.environ["TVRI_DATA_DIR"] = SCRATCH_DIR
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.news_repository import NewsRepository  # noqa: E402
+from benchmarks.bench_read_endpoints import make_dataset, seed_dataset  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--writes", type=int, default=500)
+    args = parser.parse_args()
+
+    template = make_dataset(1)[0]
+    print(f"{'records':>8} {'inserts/s':>10} {'deletes/s':>10}")
+    for size in args.sizes:
+        seed_dataset(make_dataset(size))
+        repository = NewsRepository()
+        repository.count()  # load outside the timed section
+
+        start = time.perf_counter()
+        ids = [repository.insert(dict(template))["id"] for _ in range(args.writes)]
+        insert_rate = args.writes / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for news_id in ids:
+            repository.delete(news_id)
+        delete_rate = args.writes / (time.perf_counter() - start)
+        print(f"{size:>8} {insert_rate:>10.1f} {delete_rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
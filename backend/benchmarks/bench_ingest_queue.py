@@ -0,0 +1,69 @@
+"""
+POST /news response time with `ingest=sync` vs `ingest=queued`, and how
+long the queue takes to drain behind the queued responses.
+
+The analysis is a stub that sleeps for --analysis-ms (standing in for the
+LLM round-trip and weather lookup), so the numbers show the request path
+and the queue, not any real API.
+
+Run from the backend directory:
+    python -m benchmarks.bench_ingest_queue --articles 200 --analysis-ms 500
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="tvri-bench-")
+os.environ["TVRI_DATA_DIR"] = SCRATCH_DIR
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.config import BASE_DIR  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.ai_service import ai_service  # noqa: E402
+from app.services.analysis_queue import analysis_queue  # noqa: E402
+
+
+def stub_analysis(delay: float):
+    async def analyze_news(text, **_):
+        await asyncio.sleep(delay)
+        return {"generated_title": "Judul", "detected_province": "Bali", "topics": ["Pangan"],
+                "sentiment_score": 60, "virality_score": "Medium", "impact": "Netral", "summary": text[:80]}
+    return analyze_news
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--analysis-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    shutil.copy(os.path.join(BASE_DIR, "data", "dummy_dataset.json"), SCRATCH_DIR)
+    ai_service.analyze_news = stub_analysis(args.analysis_ms / 1000)
+
+    with TestClient(app) as client:
+        print(f"{'ingest':<8} {'p50 ms':>8} {'max ms':>8} {'all analyzed after s':>22}")
+        for mode in ("sync", "queued"):
+            timings = []
+            start = time.perf_counter()
+            for i in range(args.articles):
+                began = time.perf_counter()
+                client.post("/api/v1/news", json={"content": f"Berita {mode} nomor {i}", "ingest": mode})
+                timings.append((time.perf_counter() - began) * 1000)
+            while mode == "queued":
+                stats = analysis_queue.stats()
+                if not stats["depth"] and not stats["running"]:
+                    break
+                time.sleep(0.01)
+            drained = time.perf_counter() - start
+            print(f"{mode:<8} {statistics.median(timings):>8.1f} {max(timings):>8.1f} {drained:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Knowledge-base context size per analysis prompt: first 15k characters of
+the knowledge base (previous behaviour) vs BM25-selected chunks.
+
+Uses the articles in data/dummy_dataset.json as queries and reports the
+context size in characters / estimated tokens, plus the time spent
+selecting chunks. Prompt tokens dominate LLM latency and cost, so the
+token column is the figure to compare.
+
+Run from the backend directory:
+    python -m benchmarks.bench_knowledge_prompt
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from app.core.config import BASE_DIR, KNOWLEDGE_BASE_PATH
+from app.services.knowledge_index import KnowledgeIndex, estimate_tokens
+
+LEGACY_MAX_CHARS = 15000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--knowledge-base", default=KNOWLEDGE_BASE_PATH)
+    parser.add_argument("--articles", default=os.path.join(BASE_DIR, "data", "dummy_dataset.json"))
+    args = parser.parse_args()
+
+    with open(args.articles, "r", encoding="utf-8") as f:
+        articles = [item["content"] for item in json.load(f)]
+    with open(args.knowledge_base, "r", encoding="utf-8") as f:
+        legacy_context = f.read(LEGACY_MAX_CHARS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(args.knowledge_base, "r", encoding="utf-8") as f:
+            text = f.read()
+        index = KnowledgeIndex(tmp)
+        start = time.perf_counter()
+        document = {"id": "bench"}
+        index.add(document, index.prepare(document, text))
+        build_ms = (time.perf_counter() - start) * 1000
+
+        contexts = []
+        timings = []
+        for article in articles:
+            start = time.perf_counter()
+            contexts.append(index.select(article))
+            timings.append((time.perf_counter() - start) * 1000)
+
+    stats = index.stats()
+    print(f"knowledge base: {len(text)} chars, {stats['chunks']} chunks, index build {build_ms:.1f} ms")
+    print(f"{'context':>10} {'chars':>8} {'tokens':>8}")
+    print(f"{'first-15k':>10} {len(legacy_context):>8} {estimate_tokens(legacy_context):>8}")
+    sizes = [len(context) for context in contexts]
+    tokens = [estimate_tokens(context) for context in contexts]
+    print(f"{'bm25':>10} {statistics.mean(sizes):>8.0f} {statistics.mean(tokens):>8.0f}  (mean of {len(articles)} articles)")
+    print(f"selection: p50 {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
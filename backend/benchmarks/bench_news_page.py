@@ -0,0 +1,70 @@
+"""
+Size and latency of one GET /news page: full records vs a `fields=`
+projection, and the previous encoder path (jsonable_encoder + json.dumps)
+vs orjson.
+
+Run from the backend directory:
+    python -m benchmarks.bench_news_page --size 10000 --limit 100
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="tvri-bench-")
+os.environ["TVRI_DATA_DIR"] = SCRATCH_DIR
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from benchmarks.bench_read_endpoints import make_dataset, seed_dataset  # noqa: E402
+from app.main import app  # noqa: E402
+
+DASHBOARD_FIELDS = "id,title,province,published_at,analysis.topics,analysis.sentiment_score"
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--content-chars", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    records = make_dataset(args.size)
+    for record in records:
+        record["content"] = ("Isi berita daerah yang panjang. " * (args.content_chars // 32 + 1))[:args.content_chars]
+    seed_dataset(records)
+
+    with TestClient(app) as client:
+        print(f"{'request':<44} {'p50 ms':>8} {'bytes':>10}")
+        for label, params in [
+            ("full records, offset", {"limit": args.limit}),
+            ("full records, cursor", {"limit": args.limit, "cursor": ""}),
+            ("fields=dashboard, cursor", {"limit": args.limit, "cursor": "", "fields": DASHBOARD_FIELDS}),
+        ]:
+            ms, response = timed(lambda: client.get("/api/v1/news", params=params), args.repeat)
+            print(f"{label:<44} {ms:>8.2f} {len(response.content):>10}")
+
+        body = {"data": records[:args.limit], "total": len(records), "filtered": len(records)}
+        ms_old, _ = timed(lambda: JSONResponse(jsonable_encoder(body)).body, args.repeat)
+        ms_new, _ = timed(lambda: ORJSONResponse(body).body, args.repeat)
+        print(f"{'encode page: jsonable_encoder + json':<44} {ms_old:>8.2f}")
+        print(f"{'encode page: orjson':<44} {ms_new:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Requests/sec for the hot read endpoints, before and after the shared news repository.
+
+"before" forces a full re-parse of the dataset on every request (the old
+per-handler get_dummy_data() behaviour); "after" serves from the in-memory
+repository cache.
+
+Run from the backend directory:
+    python -m benchmarks.bench_read_endpoints --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="tvri-bench-")
+os.environ["TVRI_DATA_DIR"] = SCRATCH_DIR
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.config import NEWS_DATA_PATH, NEWS_JOURNAL_PATH, NEWS_STATE_PATH  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.news_repository import news_repository  # noqa: E402
+
+PROVINCES = ["Jawa Barat", "Jawa Tengah", "Jawa Timur", "DKI Jakarta", "Bali", "Aceh", "Papua", "Sulawesi Selatan"]
+ISLANDS = ["Jawa", "Jawa", "Jawa", "Jawa", "Bali-Nusa Tenggara", "Sumatera", "Papua", "Sulawesi"]
+TOPICS = ["Pangan", "Energi", "Bencana Alam", "Teknologi", "Politik", "Ekonomi", "Kesehatan", "Pendidikan"]
+ENDPOINTS = ["/api/v1/news", "/api/v1/dashboard/stats", "/api/v1/analytics/timeline"]
+
+
+def make_dataset(size: int):
+    rng = random.Random(size)
+    now = datetime.now()
+    records = []
+    for i in range(size, 0, -1):
+        p = rng.randrange(len(PROVINCES))
+        sentiment = rng.randint(0, 100)
+        records.append({
+            "id": i,
+            "title": f"Berita sintetis {i}",
+            "content": "Lorem ipsum berita daerah " * 20,
+            "province": PROVINCES[p],
+            "island": ISLANDS[p],
+            "published_at": (now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))).isoformat(),
+            "analysis": {
+                "summary": "Ringkasan berita sintetis.",
+                "topics": rng.sample(TOPICS, 2),
+                "entities": [PROVINCES[p]],
+                "detected_island": ISLANDS[p],
+                "impact": "Negatif: Risiko." if sentiment < 40 else "Netral",
+                "sentiment_score": sentiment,
+                "virality_score": rng.choice(["High", "Medium", "Low"]),
+            },
+        })
+    return records
+
+
+def seed_dataset(records):
+    """Replace the JSON archive with `records`: a fresh snapshot, no journal or saved state."""
+    for path in (NEWS_JOURNAL_PATH, NEWS_STATE_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+    with open(NEWS_DATA_PATH, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False)
+    news_repository.invalidate()
+
+
+def measure(client, path, cold, budget_s=2.0, max_requests=200):
+    done = 0
+    start = time.perf_counter()
+    while done < max_requests:
+        if cold:
+            news_repository.invalidate()
+        response = client.get(path)
+        response.raise_for_status()
+        done += 1
+        if time.perf_counter() - start > budget_s and done >= 3:
+            break
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds per measurement")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    print(f"{'records':>8}  {'endpoint':<28} {'before req/s':>13} {'after req/s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        seed_dataset(make_dataset(size))
+        for path in ENDPOINTS:
+            before = measure(client, path, cold=True, budget_s=args.budget)
+            client.get(path)  # warm the cache
+            after = measure(client, path, cold=False, budget_s=args.budget)
+            print(f"{size:>8}  {path:<28} {before:>13.1f} {after:>12.1f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Latency of GET /news/{id}/related scoring at different archive sizes.
+
+Times RelatedNewsIndex.related() (the whole scoring + top-k step of the
+endpoint) for random reference articles.
+
+Run from the backend directory:
+    python -m benchmarks.bench_related --sizes 1000 10000 100000
+"""
+import argparse
+import math
+import random
+import statistics
+import time
+
+from benchmarks.bench_read_endpoints import make_dataset
+from app.services.related_index import RelatedNewsIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in args.sizes:
+        records = make_dataset(size)
+        rng = random.Random(size)
+        # Give each record a person (shared by ~10 records) and an organisation (~50 records).
+        for record in records:
+            record["analysis"]["entities"] = [
+                f"Tokoh {rng.randrange(size // 10 + 1)}",
+                f"Lembaga {rng.randrange(size // 50 + 1)}",
+            ]
+        index = RelatedNewsIndex()
+        index.rebuild(reversed(records))
+
+        timings = []
+        for news_id in rng.sample(range(1, size + 1), min(args.queries, size)):
+            start = time.perf_counter()
+            index.related(news_id, args.limit)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[max(math.ceil(len(timings) * 0.95) - 1, 0)]
+        print(f"{size:>8} {statistics.median(timings):>8.3f} {p95:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
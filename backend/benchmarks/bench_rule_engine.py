@@ -0,0 +1,176 @@
+"""
+Throughput of the offline analyzer (AIService._simulate_analysis) on long texts.
+
+Compares three implementations on the same articles:
+  legacy   - the hard-coded `in text_lower` checks the rule engine replaced
+  regex    - just the keyword scan, as one precompiled alternation regex
+  engine   - app.services.rule_engine (rules from data/analysis_rules.json)
+and checks that the engine's output matches the legacy analyzer's.
+
+Run from the backend directory:
+    python -m benchmarks.bench_rule_engine --chars 2000 20000 100000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+from typing import Any, Dict
+
+from app.services.rule_engine import RuleEngine, rule_engine
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def legacy_analyze(text: str) -> Dict[str, Any]:
+    # Rule-based simulation for Premium Features
+    text_lower = text.lower()
+
+    # 1. Topic Detection
+    topics = []
+    if "padi" in text_lower or "beras" in text_lower or "panen" in text_lower:
+        topics.append("Pangan")
+    if "banjir" in text_lower or "gempa" in text_lower or "longsor" in text_lower:
+        topics.append("Bencana Alam")
+    if "teknologi" in text_lower or "digital" in text_lower:
+        topics.append("Teknologi")
+    if not topics:
+        topics.append("Umum")
+
+    # 2. Entity Extraction & Province Detection
+    entities = []
+    detected_province = "Indonesia" # Default
+
+    provinces = ["Jawa Barat", "Jawa Tengah", "Jawa Timur", "DKI Jakarta", "Banten", "Yogyakarta", "Aceh", "Sumatera Utara", "Bali", "Papua", "Sulawesi Selatan", "Banjarnegara"]
+    for prov in provinces:
+        if prov.lower() in text_lower:
+            detected_province = prov
+            entities.append(prov)
+            break
+
+    if "jokowi" in text_lower: entities.append("Presiden Jokowi")
+    if "prabowo" in text_lower: entities.append("Presiden Prabowo")
+
+    # 3. Event Date Extraction (Simple pattern matching)
+    import re
+    event_date = ""
+    # Try to extract dates like "21/11", "21 November", etc.
+    date_patterns = [
+        r'(\d{1,2})/(\d{1,2})',  # DD/MM
+        r'(\d{1,2})\s+(November|Desember|Januari|Februari|Maret|April|Mei|Juni|Juli|Agustus|September|Oktober)',  # DD Month
+    ]
+    for pattern in date_patterns:
+        match = re.search(pattern, text)
+        if match:
+            # Construct a date (assume current year 2025)
+            if '/' in match.group():
+                day, month = match.groups()
+                event_date = f"2025-{month.zfill(2)}-{day.zfill(2)}"
+            break
+
+    # 4. Title Generation (Simple Extraction for simulation)
+    sentences = text.split('.')
+    generated_title = sentences[0][:80] + "..." if len(sentences[0]) > 80 else sentences[0]
+    if "banjir" in text_lower:
+        generated_title = f"ALERT: Banjir Melanda {detected_province}, Warga Dievakuasi"
+    elif "panen" in text_lower:
+        generated_title = f"Kabar Baik: Panen Raya di {detected_province} Meningkat Signifikan"
+
+    # 5. Premium Insights
+    sentiment_score = 50
+    if "meninggal" in text_lower or "korban" in text_lower or "rusak" in text_lower:
+        sentiment_score = 20
+    elif "sukses" in text_lower or "meningkat" in text_lower or "bantuan" in text_lower:
+        sentiment_score = 85
+
+    virality_score = "Medium"
+    if "korban" in text_lower or "presiden" in text_lower:
+        virality_score = "High"
+
+    strategic_recs = []
+    if sentiment_score < 40:
+        strategic_recs.append("Segera kirim bantuan logistik dan tim medis.")
+        strategic_recs.append("Koordinasi dengan BNPB untuk mitigasi lanjutan.")
+    else:
+        strategic_recs.append("Pertahankan momentum dengan dukungan kebijakan.")
+        strategic_recs.append("Publikasikan keberhasilan ini sebagai success story nasional.")
+
+    impact = "Netral"
+    if sentiment_score < 40:
+        impact = "Negatif: Risiko stabilitas daerah."
+    elif sentiment_score > 70:
+        impact = "Positif: Mendukung ketahanan nasional."
+
+    return {
+        "generated_title": generated_title,
+        "detected_province": detected_province,
+        "event_date": event_date,
+        "summary": text[:200] + "...",
+        "topics": topics,
+        "entities": entities,
+        "impact": impact,
+        "sentiment_score": sentiment_score,
+        "virality_score": virality_score,
+        "strategic_recommendations": strategic_recs,
+        "rpjmn_alignment": [{"target": "Ketahanan Nasional", "relevance": "High"}]
+    }
+
+
+class RegexScan:
+    """The rule keywords found by one finditer over a single alternation regex (scan only, no scoring)."""
+
+    def __init__(self, engine: RuleEngine):
+        keywords = set(engine.entities) | set(engine.weather) | {lower for _, lower in engine.provinces}
+        for words in engine.topics.values():
+            keywords.update(words)
+        for words, _ in engine.sentiment + engine.virality + engine.titles:
+            keywords.update(words)
+        # Lookahead so overlapping keywords ("korban" / "bantuan") are all reported
+        alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))")
+
+    def analyze(self, text: str):
+        return set(self._pattern.findall(text.lower()))
+
+
+def make_articles(count: int, chars: int, seed: int = 0):
+    """Articles of ~`chars` characters built from sentences of the sample dataset."""
+    with open(os.path.join(BASE_DIR, "data", "dummy_dataset.json"), "r", encoding="utf-8") as f:
+        sentences = [s.strip() + "." for item in json.load(f) for s in item["content"].split(".") if s.strip()]
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        parts, size = [f"Berita {i} tanggal {rng.randint(1, 28)}/{rng.randint(1, 12)}."], 0
+        while size < chars:
+            parts.append(rng.choice(sentences))
+            size += len(parts[-1]) + 1
+        articles.append(" ".join(parts))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, nargs="+", default=[2000, 20000, 100000])
+    parser.add_argument("--articles", type=int, default=200)
+    args = parser.parse_args()
+
+    implementations = [("legacy", legacy_analyze), ("regex", RegexScan(rule_engine).analyze),
+                       ("engine", rule_engine.analyze)]
+
+    print(f"{'chars':>8} " + " ".join(f"{name + ' art/s':>14}" for name, _ in implementations))
+    for chars in args.chars:
+        articles = make_articles(args.articles, chars, seed=chars)
+        expected = [legacy_analyze(text) for text in articles]
+        rates = []
+        for name, analyze in implementations:
+            start = time.perf_counter()
+            results = [analyze(text) for text in articles]
+            rates.append(len(articles) / (time.perf_counter() - start))
+            if name == "engine":
+                assert results == expected, "rule engine output differs from the legacy analyzer"
+        print(f"{chars:>8} " + " ".join(f"{rate:>14.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Latency of GET /news?q= full-text search at different archive sizes.
+
+Records are built from sentences of the sample dataset. Times index
+construction, then NewsSearchIndex.search() for single words, several
+words and a quoted phrase, against a linear substring scan of title +
+content + summary (what searching client-side over the whole archive
+amounts to).
+
+Run from the backend directory:
+    python -m benchmarks.bench_search --sizes 1000 10000 50000
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import time
+
+from benchmarks.bench_read_endpoints import make_dataset
+from app.services.news_search import NewsSearchIndex, searchable_fields
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = {
+    "word": ["banjir", "petani", "listrik", "investasi"],
+    "words": ["banjir longsor warga", "harga beras petani", "transportasi publik jakarta"],
+    "phrase": ['"jawa barat"', '"harga beras"', '"curah hujan"'],
+}
+
+
+def percentiles(timings):
+    timings.sort()
+    return statistics.median(timings), timings[max(math.ceil(len(timings) * 0.95) - 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(os.path.join(BASE_DIR, "data", "dummy_dataset.json"), "r", encoding="utf-8") as f:
+        sentences = [s.strip() + "." for item in json.load(f) for s in item["content"].split(".") if s.strip()]
+
+    print(f"{'records':>8} {'build s':>8} {'query':>7} {'p50 ms':>8} {'p95 ms':>8} {'scan p50 ms':>12}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        records = make_dataset(size)
+        for record in records:
+            record["content"] = " ".join(rng.sample(sentences, 8))
+
+        index = NewsSearchIndex()
+        start = time.perf_counter()
+        index.rebuild(reversed(records))
+        build = time.perf_counter() - start
+
+        lowered = [" ".join(searchable_fields(record)).lower() for record in records]
+        for kind, queries in QUERIES.items():
+            timings = []
+            scans = []
+            for i in range(args.queries):
+                query = queries[i % len(queries)]
+                start = time.perf_counter()
+                index.search(query, top=20)
+                timings.append((time.perf_counter() - start) * 1000)
+                if i < 5:
+                    words = query.strip('"').lower().split()
+                    start = time.perf_counter()
+                    [text for text in lowered if any(word in text for word in words)]
+                    scans.append((time.perf_counter() - start) * 1000)
+            p50, p95 = percentiles(timings)
+            print(f"{size:>8} {build:>8.2f} {kind:>7} {p50:>8.3f} {p95:>8.3f} {statistics.median(scans):>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
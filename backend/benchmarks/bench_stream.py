@@ -0,0 +1,66 @@
+"""
+Cost of keeping N dashboards current: every client re-polling
+GET /news + /dashboard/stats + /analytics/timeline, against one write
+fanned out to N `GET /stream` clients.
+
+Both are measured in-process (endpoint functions and the broadcaster),
+without HTTP, so the numbers are backend CPU per refresh / per write.
+
+Run from the backend directory:
+    python -m benchmarks.bench_stream --size 10000 --clients 10 100 1000
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.bench_read_endpoints import make_dataset, seed_dataset
+from app.api import analytics, endpoints
+from app.services.news_repository import news_repository
+from app.services.news_stream import NewsStream
+
+
+def poll_once():
+    endpoints.get_news(limit=100, offset=0)
+    endpoints.get_dashboard_stats()
+    analytics.get_timeline_analytics(days=30)
+
+
+async def fanout_ms(stream: NewsStream, clients: int, writes: int, record) -> float:
+    subscribers = [stream.subscribe() for _ in range(clients)]
+    start = time.perf_counter()
+    for i in range(writes):
+        stream.add({**record, "id": 10_000_000 + i})
+        await asyncio.sleep(0)  # run the fan-out
+        for client in subscribers:
+            await client.next_frame()
+    elapsed = time.perf_counter() - start
+    for client in subscribers:
+        stream.unsubscribe(client)
+    return elapsed / writes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+
+    records = make_dataset(args.size)
+    seed_dataset(records)
+    news_repository.count()
+
+    start = time.perf_counter()
+    for _ in range(20):
+        poll_once()
+    poll_ms = (time.perf_counter() - start) / 20 * 1000
+
+    print(f"{'clients':>8} {'poll round ms':>14} {'stream ms/write':>16}")
+    stream = NewsStream(client_queue_size=args.writes + 1, max_clients=max(args.clients))
+    for clients in args.clients:
+        per_write = asyncio.run(fanout_ms(stream, clients, args.writes, records[0]))
+        print(f"{clients:>8} {poll_ms * clients:>14.1f} {per_write:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { Settings, RefreshCw, TrendingUp, Activity, Globe, ShieldCheck, Sun, Moon, PlusCircle, Trash2 } from 'lucide-react';
 import { TopicDistributionChart, ImpactAnalysisChart } from '@/components/DashboardCharts';
 import { NewsHealthRadar } from '@/components/PremiumCharts';
@@ -10,6 +10,7 @@ import AdvancedSearch, { SearchFilters } from '@/components/AdvancedSearch';
 import NewsUploadForm from '@/components/NewsUploadForm';
 import SettingsModal from '@/components/SettingsModal';
 import RelatedNews from '@/components/RelatedNews';
+import { subscribeNewsStream, NewsStreamEvent, StatsDelta } from '@/lib/newsStream';
 
 interface Analysis {
   summary: string;
@@ -37,9 +38,10 @@ interface Analysis {
 interface NewsItem {
   id: number;
   title: string;
-  content: string;
+  content?: string; // not included in stream events
   province: string;
   published_at: string;
+  status?: string;
   analysis: Analysis;
 }
 
@@ -131,11 +133,75 @@ export default function Home() {
     fetchData();
   }, []);
 
+  // Live updates: apply stream events instead of re-polling
+  const hasFilters = useRef(false);
+  hasFilters.current = Object.keys(searchFilters).length > 0;
+
+  useEffect(() => {
+    const applyStatsDelta = (delta: StatsDelta) => {
+      setStats(prev => {
+        if (!prev) return prev;
+        // Topics outside the top list are only picked up on the next full refresh
+        const counts = new Map(prev.top_topics.map(t => [t.name, t.count]));
+        for (const [name, change] of Object.entries(delta.topics)) {
+          if (counts.has(name) || change > 0) counts.set(name, (counts.get(name) || 0) + change);
+        }
+        const top_topics = Array.from(counts, ([name, count]) => ({ name, count }))
+          .filter(t => t.count > 0)
+          .sort((a, b) => b.count - a.count)
+          .slice(0, prev.top_topics.length || 5);
+        return {
+          total_news: prev.total_news + delta.total_news,
+          risk_alerts: prev.risk_alerts + delta.risk_alerts,
+          top_topics,
+        };
+      });
+    };
+
+    return subscribeNewsStream((event: NewsStreamEvent) => {
+      if (event.type === 'resync') {
+        fetchData();
+        return;
+      }
+      applyStatsDelta(event.delta);
+      if (event.type === 'news.deleted') {
+        setAllNews(prev => prev.filter(n => n.id !== event.id));
+        setNews(prev => prev.filter(n => n.id !== event.id));
+        setSelectedNews(prev => (prev?.id === event.id ? null : prev));
+        return;
+      }
+      const record = event.record as unknown as NewsItem;
+      const upsert = (list: NewsItem[]) => {
+        const index = list.findIndex(n => n.id === record.id);
+        if (index === -1) return event.type === 'news.created' ? [record, ...list] : list;
+        return list.map(n => (n.id === record.id ? { ...n, ...record } : n));
+      };
+      setAllNews(upsert);
+      // A filtered list only gets updates to the items it already shows
+      setNews(prev => (hasFilters.current ? prev.map(n => (n.id === record.id ? { ...n, ...record } : n)) : upsert(prev)));
+    });
+  }, []);
+
+  const openNews = async (item: NewsItem) => {
+    setSelectedNews(item);
+    if (item.content !== undefined) return;
+    try {
+      const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/v1/news/${item.id}`);
+      if (res.ok) {
+        const full: NewsItem = await res.json();
+        setSelectedNews(prev => (prev?.id === full.id ? full : prev));
+      }
+    } catch (error) {
+      console.error('Error fetching news:', error);
+    }
+  };
+
   const handleSearch = async (filters: SearchFilters) => {
     setSearchFilters(filters);
 
     // Build query params
     const params = new URLSearchParams();
+    if (filters.query?.trim()) params.append('q', filters.query.trim());
     if (filters.startDate) params.append('start_date', filters.startDate);
     if (filters.endDate) params.append('end_date', filters.endDate);
     if (filters.provinces?.length) params.append('provinces', filters.provinces.join(','));
@@ -203,7 +269,7 @@ export default function Home() {
       if (res.ok) {
         setSelectedNews(null);
         setIsDeleteConfirm(false);
-        fetchData(); // Refresh the news list
+        // The list and stats are updated by the news.deleted stream event
       } else {
         alert('Gagal menghapus berita');
       }
@@ -408,11 +474,11 @@ export default function Home() {
                     {item.title}
                   </h3>
                   <p className={`${text.secondary} text-sm mb-4 line-clamp-3 leading-relaxed`}>
-                    {item.analysis.summary}
+                    {item.analysis.summary || (item.status === 'pending' ? 'Analisis AI sedang diproses...' : '')}
                   </p>
 
                   <div className="flex flex-wrap gap-2 mb-4">
-                    {item.analysis.topics.map(topic => (
+                    {item.analysis.topics?.map(topic => (
                       <span key={topic} className={`text-[10px] ${text.secondary} ${isDark ? 'bg-slate-800 border-slate-700' : 'bg-slate-100 border-slate-300'} px-2 py-1 rounded-md border`}>#{topic}</span>
                     ))}
                   </div>
@@ -443,7 +509,7 @@ export default function Home() {
                 <div className={`${isDark ? 'bg-slate-950/30 border-slate-800/50' : 'bg-slate-50 border-slate-200'} p-4 border-t flex justify-between items-center`}>
                   <span className={`text-xs ${text.tertiary}`}>AI Confidence: 98%</span>
                   <button
-                    onClick={() => setSelectedNews(item)}
+                    onClick={() => openNews(item)}
                     className="text-xs font-bold text-blue-400 hover:text-blue-300 transition-colors"
                   >
                     VIEW ANALYSIS →
@@ -483,11 +549,11 @@ export default function Home() {
                 <div className="lg:col-span-2 space-y-6">
                   <div className="prose prose-invert max-w-none">
                     <p className={`${text.secondary} leading-relaxed text-lg`}>
-                      {isReadMore || selectedNews.content.length <= 500
-                        ? selectedNews.content
-                        : `${selectedNews.content.substring(0, 500)}...`}
+                      {isReadMore || (selectedNews.content ?? '').length <= 500
+                        ? selectedNews.content ?? ''
+                        : `${(selectedNews.content ?? '').substring(0, 500)}...`}
                     </p>
-                    {selectedNews.content.length > 500 && (
+                    {(selectedNews.content ?? '').length > 500 && (
                       <button
                         onClick={() => setIsReadMore(!isReadMore)}
                         className="mt-3 text-blue-400 hover:text-blue-300 font-medium text-sm"
@@ -617,7 +683,7 @@ export default function Home() {
                     onNewsClick={(id) => {
                       const news = allNews.find(n => n.id === id);
                       if (news) {
-                        setSelectedNews(news);
+                        openNews(news);
                         setIsReadMore(false);
                       }
                     }}
@@ -677,8 +743,7 @@ export default function Home() {
               </div>
               <NewsUploadForm
                 onUploadSuccess={() => {
-                  setIsUploadOpen(false);
-                  fetchData();
+                  setIsUploadOpen(false); // the new item arrives as a news.created stream event
                 }}
                 theme={theme}
               />
@@ -10,6 +10,7 @@ interface AdvancedSearchProps {
 }
 
 export interface SearchFilters {
+    query?: string;
     startDate?: string;
     endDate?: string;
     provinces?: string[];
@@ -65,6 +66,7 @@ export default function AdvancedSearch({ theme = 'dark', onSearch, onClear }: Ad
     };
 
     const activeFiltersCount =
+        (filters.query?.trim() ? 1 : 0) +
         (filters.provinces?.length || 0) +
         (filters.topics?.length || 0) +
         (filters.startDate ? 1 : 0) +
@@ -110,6 +112,25 @@ export default function AdvancedSearch({ theme = 'dark', onSearch, onClear }: Ad
                     </div>
 
                     <div className="space-y-6">
+                        {/* Text Query */}
+                        <div>
+                            <label className={`block text-sm font-bold mb-3 ${isDark ? 'text-slate-300' : 'text-slate-700'} flex items-center gap-2`}>
+                                <Search size={16} />
+                                Keywords
+                            </label>
+                            <input
+                                type="text"
+                                value={filters.query || ''}
+                                onChange={(e) => setFilters({ ...filters, query: e.target.value })}
+                                onKeyDown={(e) => { if (e.key === 'Enter') handleApply(); }}
+                                placeholder='banjir "jawa barat"'
+                                className={`w-full px-3 py-2 rounded-lg border ${isDark ? 'bg-slate-800 border-slate-700 text-white' : 'bg-white border-slate-300 text-slate-900'}`}
+                            />
+                            <p className={`text-xs mt-1 ${isDark ? 'text-slate-500' : 'text-slate-500'}`}>
+                                Searches titles, content and summaries. Use quotes for an exact phrase.
+                            </p>
+                        </div>
+
                         {/* Date Range */}
                         <div>
                             <label className={`block text-sm font-bold mb-3 ${isDark ? 'text-slate-300' : 'text-slate-700'} flex items-center gap-2`}>
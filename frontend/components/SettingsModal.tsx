@@ -170,14 +170,31 @@ export default function SettingsModal({ isOpen, onClose }: SettingsModalProps) {
                                                     method: 'POST',
                                                     body: formData,
                                                 });
-                                                const data = await res.json();
+                                                let data = await res.json();
 
-                                                if (res.ok) {
+                                                if (!res.ok) {
+                                                    setStatus('error');
+                                                    setMessage(data.detail || 'Upload gagal');
+                                                    return;
+                                                }
+
+                                                // Extraction runs in the background; poll the job until it finishes
+                                                while (data.status !== 'done' && data.status !== 'failed') {
+                                                    setMessage(data.pages_total
+                                                        ? `Mengekstrak PDF... ${data.pages_done}/${data.pages_total} halaman`
+                                                        : 'Memproses PDF...');
+                                                    await new Promise((resolve) => setTimeout(resolve, 1000));
+                                                    const jobRes = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/v1/knowledge/jobs/${data.job_id}`);
+                                                    data = await jobRes.json();
+                                                    if (!jobRes.ok) break;
+                                                }
+
+                                                if (data.status === 'done') {
                                                     setStatus('success');
                                                     setMessage(`Upload sukses! ${data.chars_extracted} karakter diekstrak.`);
                                                 } else {
                                                     setStatus('error');
-                                                    setMessage(data.detail || 'Upload gagal');
+                                                    setMessage(data.error || data.detail || 'Upload gagal');
                                                 }
                                             } catch (err) {
                                                 setStatus('error');
@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { TrendingUp, TrendingDown, Minus } from 'lucide-react';
+import { subscribeNewsStream, applyTimelineDelta } from '@/lib/newsStream';
 
 interface TimelineChartProps {
     theme?: 'dark' | 'light';
@@ -19,6 +20,17 @@ export default function TimelineChart({ theme = 'dark', compact = false }: Timel
         fetchTimeline();
     }, []);
 
+    // Live updates: apply the day-bucket deltas of each write; the trend is recomputed on the next fetch
+    useEffect(() => {
+        return subscribeNewsStream(event => {
+            if (event.type === 'resync') {
+                fetchTimeline();
+                return;
+            }
+            setData((prev: any) => (prev ? { ...prev, timeline: applyTimelineDelta(prev.timeline, event.delta.timeline) } : prev));
+        });
+    }, []);
+
     const fetchTimeline = async () => {
         try {
             const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/v1/analytics/timeline?days=30`);
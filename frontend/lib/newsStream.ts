@@ -0,0 +1,75 @@
+// One EventSource per tab on GET /api/v1/stream, shared by every component that subscribes.
+
+export interface TimelineBucketDelta {
+  date: string;
+  total: number;
+  topics: Record<string, number>;
+}
+
+export interface StatsDelta {
+  total_news: number;
+  risk_alerts: number;
+  topics: Record<string, number>;
+  provinces: Record<string, number>;
+  timeline: TimelineBucketDelta[];
+}
+
+// Records are sent without their content (fetch /news/{id} for it)
+export interface StreamRecord {
+  id: number;
+  [key: string]: unknown;
+}
+
+export type NewsStreamEvent =
+  | { type: 'news.created' | 'news.updated'; record: StreamRecord; delta: StatsDelta }
+  | { type: 'news.deleted'; id: number; delta: StatsDelta }
+  | { type: 'resync' };
+
+type Listener = (event: NewsStreamEvent) => void;
+
+const EVENT_TYPES = ['news.created', 'news.updated', 'news.deleted', 'resync'] as const;
+
+const listeners = new Set<Listener>();
+let source: EventSource | null = null;
+
+function open() {
+  source = new EventSource(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/v1/stream`);
+  for (const type of EVENT_TYPES) {
+    source.addEventListener(type, (e) => {
+      const event = { type, ...JSON.parse((e as MessageEvent).data) } as NewsStreamEvent;
+      listeners.forEach(listener => listener(event));
+    });
+  }
+  // EventSource reconnects by itself and resumes from the last event id
+}
+
+export function subscribeNewsStream(listener: Listener): () => void {
+  listeners.add(listener);
+  if (!source) open();
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0 && source) {
+      source.close();
+      source = null;
+    }
+  };
+}
+
+export function applyTimelineDelta<T extends TimelineBucketDelta>(timeline: T[], delta: TimelineBucketDelta[]): T[] {
+  // Only buckets already shown are adjusted, except today's, which is added when missing
+  const today = new Date().toISOString().slice(0, 10);
+  let updated = timeline;
+  for (const change of delta) {
+    const index = updated.findIndex(bucket => bucket.date === change.date);
+    if (index === -1 && change.date !== today) continue;
+    const bucket = index === -1 ? { date: change.date, total: 0, topics: {} } as T : updated[index];
+    const topics = { ...bucket.topics };
+    for (const [topic, count] of Object.entries(change.topics)) {
+      topics[topic] = (topics[topic] || 0) + count;
+      if (topics[topic] <= 0) delete topics[topic];
+    }
+    const next = { ...bucket, total: bucket.total + change.total, topics };
+    updated = index === -1 ? [...updated, next] : updated.map((b, i) => (i === index ? next : b));
+  }
+  return updated.filter(bucket => bucket.total > 0);
+}